@@ -0,0 +1,69 @@
+# TASK:
+# - check speed of playout vs playout_batch
+#
+# PROCESS;
+# - sample EPISODES(1e5) with the dummy policies
+#   - playout, one episode at a time
+#   - playout_batch, BATCH(1e4) episodes in lockstep
+# - check the mean reward and total time used
+#
+# RESULTS:
+# - playout finishes at ~0.8s
+# - playout_batch finishes at ~0.15s
+# - mean reward is ~ -0.27 for both
+#
+# INTERPRETATION:
+# - the lockstep engine spends its time in a few numpy calls per step
+#   shared by all active games, the cost per episode gets smaller with
+#   larger batches until memory allocation of the padded arrays dominates
+#
+# RUN:
+# %%
+import sys
+
+sys.path.append("../")
+
+import numpy as np
+
+from time import time
+
+from src.lib.metrics import Metrics
+from src.easy_21.game import playout, playout_batch
+
+#
+# hyperparameters
+#
+
+EPISODES = int(1e5)
+BATCH = int(1e4)
+
+metrics = Metrics("playout")
+
+#
+# process
+#
+
+start = time()
+
+rewards = [playout()[0][-1][-1] for _ in range(EPISODES)]
+
+metrics.record("time", time() - start)
+metrics.record("reward", np.mean(rewards))
+
+start = time()
+
+rng = np.random.default_rng()
+rewards = np.concatenate(
+    [
+        playout_batch(BATCH, rng=rng)[0]["rewards"].sum(axis=1)
+        for _ in range(EPISODES // BATCH)
+    ]
+)
+
+metrics.record("time", time() - start)
+metrics.record("reward", np.mean(rewards))
+
+labels = ["playout", "playout_batch"]
+
+metrics.plot_history("time", x=labels)
+metrics.plot_history("reward", x=labels)
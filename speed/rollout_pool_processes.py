@@ -0,0 +1,64 @@
+# TASK:
+# - check the throughput of RolloutPool with the number of processes
+#
+# PROCESS;
+# - sample EPISODES(1e6) with the e_greedy_policy_snapshot of a player
+#   - playout_batch in the main process
+#   - RolloutPool.playout_batch with 1, 2, 4, ... processes up to cpu_count
+# - check the total time used
+#
+# RESULTS:
+# - with a single core, RolloutPool(1) takes about the same time as
+#   playout_batch, pickling the padded arrays back costs little
+#
+# INTERPRETATION:
+# - every chunk is sampled independently in lockstep, with only its
+#   size, seed and a policy table of ~200 bytes sent to the worker,
+#   so throughput is expected to scale near-linearly with the cores
+#
+# RUN:
+# %%
+import os
+import sys
+
+sys.path.append("../")
+
+import numpy as np
+
+from time import time
+
+from src.lib.metrics import Metrics
+from src.agent.model_free_agent import ModelFreeAgent
+from src.easy_21.game import playout_batch, PLAYER_INFO
+from src.easy_21.rollout_pool import RolloutPool
+
+#
+# hyperparameters
+#
+
+EPISODES = int(1e6)
+PROCESSES = [2**n for n in range(int(np.log2(os.cpu_count())) + 1)]
+
+PLAYER = ModelFreeAgent("player", PLAYER_INFO, "table")
+POLICY = PLAYER.e_greedy_policy_snapshot()
+
+metrics = Metrics("rollout_pool")
+
+#
+# process
+#
+
+if __name__ == "__main__":
+    start = time()
+    playout_batch(EPISODES, player_policy=POLICY)
+    metrics.record("time", time() - start)
+
+    for processes in PROCESSES:
+        with RolloutPool(processes, seed=0) as pool:
+            start = time()
+            pool.playout_batch(EPISODES, player_policy=POLICY)
+            metrics.record("time", time() - start)
+
+    labels = ["playout_batch", *[f"pool {processes}" for processes in PROCESSES]]
+
+    metrics.plot_history("time", x=labels)
@@ -3,6 +3,7 @@
 #   - value_approximatorlinear)
 #   - value_network[(1])
 #   - value_network([4,2,1])
+#   - value_network_numpy([4,2,1])
 #
 # PROCESS;
 # - sample EPISODES(1e4) experiences
@@ -13,6 +14,9 @@
 # - native_linear finish sampling in ~0.35s, training ~2s
 # - micrograd_value_network([1]) finish sampling in ~0.7s, training ~7s
 # - micrograd_value_network([4,2,1]), finish sampling in ~0.7s, training ~7s
+# - numpy_value_network([4,2,1]) vs micrograd_value_network([4,2,1]), measured
+#   with EPISODES(1e3), EPOCH(10) on a single Intel Xeon @ 2.10GHz core
+#   (Python 3.13): training ~0.07s vs ~4.1s, i.e. ~60x faster
 #
 # EXTRA:
 # - accuracy performance is similar between native linear and micrograd
@@ -23,6 +27,8 @@
 #   because of it uses specific gradient instead of a general algorithm
 #   to track and back-progagte
 # - for micrograd, a smaller network structure isn't necessary faster
+# - the numpy network learns each minibatch in a few matrix products,
+#   without building a graph of scalar values per sample
 #
 # RUN:
 # %%
@@ -36,8 +42,8 @@ from random import shuffle
 
 from src.agent.model_free_agent import ModelFreeAgent
 
-from game.easy_21.game import playout, PLAYER_INFO
-from game.easy_21.feature_function import numeric_feature
+from src.easy_21.game import playout, PLAYER_INFO
+from src.easy_21.feature_function import numeric_feature
 
 #
 # hyperparameters and agent config
@@ -63,12 +69,14 @@ configs = [
     ("network", numeric_feature, [1]),
     ("network", numeric_feature, [4, 2, 1]),
     ("network_gpu", numeric_feature, [4, 2, 1]),
+    ("network_numpy", numeric_feature, [4, 2, 1]),
 ]
 labels = [
     "native_linear",
     "micrograd_linear",
     "micrograd_network",
     "tinygrad_network",
+    "numpy_network",
 ]
 
 for config in configs:
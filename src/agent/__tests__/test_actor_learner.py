@@ -0,0 +1,84 @@
+import numpy as np
+
+from queue import Queue
+
+from src.agent.actor_learner import ActorLearner
+from src.agent.model_free_agent import ModelFreeAgent
+from src.easy_21.game import PLAYER_INFO
+
+
+def init_agent():
+    return ModelFreeAgent("player", PLAYER_INFO, "table")
+
+
+def crashing_policy(state_keys):
+    raise RuntimeError("crash")
+
+
+class TestActorLearner:
+    def test_learn_episodes_from_actors(self):
+        player = init_agent()
+        actor_learner = ActorLearner(player, actors=2, batch_size=50, seed=0)
+
+        # batches of 50 in mini batches of 20, the last one of 10
+        stats = actor_learner.learn(500, step_size=0.1, mini_batch_size=20)
+
+        assert stats["learnt_episodes"] >= 500
+        assert stats["learnt_episodes"] == 50 * stats["learnt_batches"]
+        assert actor_learner.policy_version == stats["learnt_batches"]
+        assert player.action_value_store.total_count() == stats["learnt_steps"]
+        assert player.action_value_store.version > 0
+
+    def test_learn_again_with_the_same_learner(self):
+        player = init_agent()
+        actor_learner = ActorLearner(player, actors=1, batch_size=50, seed=0)
+
+        actor_learner.learn(100)
+        stats = actor_learner.learn(100)
+
+        assert stats["learnt_episodes"] >= 200
+
+    def test_drop_batches_over_policy_lag(self):
+        player = init_agent()
+        actor_learner = ActorLearner(
+            player, actors=2, batch_size=20, queue_size=8, max_policy_lag=0, seed=0
+        )
+
+        stats = actor_learner.learn(200)
+
+        assert stats["learnt_episodes"] >= 200
+        assert stats["dropped_batches"] > 0
+
+    def test_raise_if_all_actors_crashed(self):
+        player = init_agent()
+        # with no with_rng(), the actors crash on the first batch
+        player.e_greedy_policy_snapshot = lambda exploration_rate: crashing_policy
+        actor_learner = ActorLearner(player, actors=1, seed=0)
+
+        try:
+            actor_learner.learn(100)
+            assert False
+        except RuntimeError as error:
+            assert "actor" in str(error)
+
+    def test_reject_value_map(self):
+        player = ModelFreeAgent("player", PLAYER_INFO)
+        try:
+            ActorLearner(player)
+            assert False
+        except ValueError:
+            pass
+
+    def test_publish_latest_policy(self):
+        player = init_agent()
+        actor_learner = ActorLearner(player, seed=0)
+        policy_queue = Queue(1)
+
+        actor_learner.publish_policy([policy_queue])
+        actor_learner.policy_version += 1
+        actor_learner.publish_policy([policy_queue])
+
+        (version, policy) = policy_queue.get_nowait()
+        assert version == 1
+        assert policy.exploration_rate == 0.5
+        assert np.array_equal(policy.greedy_actions.shape, (10 * 21,))
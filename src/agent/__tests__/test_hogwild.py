@@ -0,0 +1,26 @@
+from src.agent.hogwild import hogwild_learning
+from src.agent.model_free_agent import ModelFreeAgent
+from src.easy_21.game import PLAYER_INFO
+from src.lib.value_table import ValueTable
+
+
+def test_hogwild_learning():
+    for lock_stripes in [0, 8]:
+        player = ModelFreeAgent("player", PLAYER_INFO)
+
+        history = hogwild_learning(
+            player,
+            workers=2,
+            episodes=400,
+            lock_stripes=lock_stripes,
+            record_interval=0.1,
+            seed=0,
+        )
+
+        assert len(history) > 0
+        assert [seconds for (seconds, _) in history] == sorted(
+            [seconds for (seconds, _) in history]
+        )
+        assert type(player.action_value_store) is ValueTable
+        # monte carlo learns every step of the episodes
+        assert player.action_value_store.total_count() >= 400
@@ -1,7 +1,19 @@
+import numpy as np
+
 from unittest import mock
 from copy import deepcopy
 
 from src.agent.model_free_agent import ModelFreeAgent
+from src.lib.eligibility_trace import EligibilityTrace
+from src.lib.experience_buffer import ExperienceBuffer
+from src.lib.key_encoder import KeyEncoder
+from src.lib.policy import greedy_policy
+from src.evaluation.td_lambda_backward import backward_td_lambda_evaluation_offline
+from src.evaluation.td_lambda_forward import (
+    td_lambda_forward_evaluation,
+    td_lambda_forward_evaluation_batch,
+    td_lambda_forward_evaluation_multi,
+)
 
 
 class CopyMock(mock.MagicMock):
@@ -27,6 +39,50 @@ def test_init():
     assert test.action_eligibility_trace
 
 
+def test_init_table_store():
+    test = ModelFreeAgent("test", [ACTIONS, None, [(0, 0), (0, 1), (1, 1)]], "table")
+
+    assert test.action_value_store.name == "test_action_values"
+    assert test.action_value_store.size == 2 * 2 * 3
+    assert test.action_value_store.keys() == []
+
+
+def test_init_table_store_requires_all_states():
+    try:
+        ModelFreeAgent("test", [ACTIONS, None, None], "table")
+        assert False
+    except ValueError as error:
+        assert "ALL_STATES" in str(error)
+
+    test = ModelFreeAgent("test", [ACTIONS, None, None], ("table", [(0, 0, 0)]))
+    assert test.action_value_store.size == 1
+
+
+def test_init_action_eligibility_trace_by_store():
+    for (config, trace_type) in [
+        ("map", "EligibilityTrace"),
+        ("table", "ArrayEligibilityTrace"),
+        ("approximator", "WeightEligibilityTrace"),
+    ]:
+        test = ModelFreeAgent("test", [ACTIONS, None, [(0, 0)]], config)
+        assert type(test.action_eligibility_trace).__name__ == trace_type
+
+
+def test_set_target_value_stores_from_table_store():
+    test = ModelFreeAgent("test", [ACTIONS, None, [(0, 0), (0, 1)]], "table")
+    test.action_value_store.learn((0, 0, 1), 1)
+    test.action_value_store.learn((0, 1, 2), -1)
+
+    test.set_target_value_stores()
+
+    assert test.target_policy_action_store.get((0, 0)) == 1
+    assert test.target_policy_action_store.get((0, 1)) == 0
+    assert test.target_state_value_store.data == {
+        (0, 0): {"count": 1, "value": 1.0, "mse": 0.0},
+        (0, 1): {"count": 0, "value": 0.0, "mse": 0.0},
+    }
+
+
 def test_e_greedy_policy_return_action_index():
     test = ModelFreeAgent("test", AGENT_INFO)
     state_key = (1, 1)
@@ -48,6 +104,61 @@ def test_e_greedy_policy_return_action_index():
     assert sampled_actions[2] / N - 0.1 < 1e-1
 
 
+def test_load_optimal_state_values_json_or_binary(tmp_path):
+    test = ModelFreeAgent("test", AGENT_INFO)
+    test.target_state_value_store.set((1, 2), 0.5)
+    test.default_file_path_for_optimal_state_values = str(tmp_path / "optimal.json")
+
+    test.save_target_state_values_as_optimal()
+    test.target_state_value_store.set((1, 2), 1)
+    test.save_target_state_values_as_optimal(str(tmp_path / "optimal.npy"))
+
+    test.load_optimal_state_values()
+    assert test.optimal_state_value_store.get((1, 2)) == 0.5
+
+    test.load_optimal_state_values(binary=True)
+    assert test.optimal_state_value_store.get((1, 2)) == 1
+
+    test.load_optimal_state_values(str(tmp_path / "optimal.json"))
+    assert test.optimal_state_value_store.get((1, 2)) == 0.5
+
+
+def test_e_greedy_policy_snapshot():
+    states = [(0, 0), (1, 0), (1, 1)]
+    key_encoder = KeyEncoder(ACTIONS, states)
+    test = ModelFreeAgent("test", [ACTIONS, None, states, key_encoder], "table")
+    test.action_value_store.set((0, 0, 2), 1)
+    test.action_value_store.set((1, 1, 1), 1)
+
+    policy = test.e_greedy_policy_snapshot(exploration_rate=0)
+    action_indices = policy(np.array(states))
+    assert action_indices.tolist() == [2, 0, 1]
+    for (state_key, action_index) in zip(states, action_indices):
+        assert action_index == test.e_greedy_policy(state_key, exploration_rate=0)
+
+    policy = test.e_greedy_policy_snapshot(exploration_rate=1)
+    action_indices = policy(np.repeat(np.array(states), 100, axis=0))
+    assert sorted(set(action_indices.tolist())) == [0, 1, 2]
+
+
+def test_e_greedy_policy_cache_greedy_action_until_updated():
+    for config in ["map", "table"]:
+        test = ModelFreeAgent("test", [ACTIONS, None, [(1, 1)]], config)
+        test.action_value_store.set((1, 1, 1), 1)
+
+        assert test.e_greedy_policy((1, 1), exploration_rate=0) == 1
+        assert test.greedy_action_cache.actions == {(1, 1): 1}
+
+        version = test.action_value_store.version
+        test.action_value_store.learn((1, 1, 2), 2)
+        assert test.action_value_store.version > version
+
+        assert test.e_greedy_policy((1, 1), exploration_rate=0) == 2
+
+        test.action_value_store = test.init_action_value_store(config)
+        assert test.e_greedy_policy((1, 1), exploration_rate=0) == 0
+
+
 class TestMonteCarloLearning:
     def test_learn_each_step_with_correct_total_return(self):
         test = ModelFreeAgent("test", AGENT_INFO)
@@ -99,6 +210,44 @@ class TestMonteCarloLearning:
         ]
         assert [args for (args, kwargs) in mock_learn.call_args_list] == expected
 
+    def test_learn_batch_same_as_each_episode(self):
+        test = ModelFreeAgent("test", AGENT_INFO)
+        test_batch = ModelFreeAgent("test_batch", AGENT_INFO)
+
+        episodes = [
+            [[(0, 0), 0, 0], [(0, 0), 1, 1], [(1, 0), 0, 1]],
+            [[(1, 1), 2, -1]],
+            [[(0, 0), 1, 0], [(1, 0), 0, 1]],
+        ]
+        episode_batch = {
+            "state_keys": np.array(
+                [
+                    [[0, 0], [0, 0], [1, 0]],
+                    [[1, 1], [0, 0], [0, 0]],
+                    [[0, 0], [1, 0], [0, 0]],
+                ]
+            ),
+            "action_indices": np.array([[0, 1, 0], [2, -1, -1], [1, 0, -1]]),
+            "rewards": np.array([[0, 1, 1], [-1, 0, 0], [0, 1, 0]]),
+            "lengths": np.array([3, 1, 2]),
+        }
+        discount = 0.5
+
+        for episode in episodes:
+            test.monte_carlo_learning_offline(episode, discount)
+
+        sample_keys, sample_returns = test_batch.monte_carlo_learning_offline_batch(
+            episode_batch, discount, evaluation_only=True
+        )
+        assert np.array_equal(
+            sample_keys,
+            [[0, 0, 0], [0, 0, 1], [1, 0, 0], [1, 1, 2], [0, 0, 1], [1, 0, 0]],
+        )
+        assert np.allclose(sample_returns, [0.75, 1.5, 1, -1, 0.5, 1])
+
+        test_batch.monte_carlo_learning_offline_batch(episode_batch, discount)
+        assert test_batch.action_value_store.data == test.action_value_store.data
+
 
 class TestTemporalDifferenceLearning:
     def test_learn_each_step_with_correct_return(self):
@@ -272,6 +421,286 @@ class TestForwardTemporalDifferenceLambdaLearning:
 
         assert [args for (args, kwargs) in mock_learn.call_args_list] == expected
 
+    def test_proxy_equivalence(self):
+        test = ModelFreeAgent("test", AGENT_INFO)
+        test.action_value_store.set((0, 0, 1), 1)
+        test.action_value_store.set((1, 0, 0), 0.5)
+        test.action_value_store.set((1, 0, 2), 2)
+
+        episode = [
+            [(0, 0), 0, 0],
+            [(0, 0), 1, 1],
+            [(1, 0), 0, 1],
+        ]
+
+        for (lambda_value, off_policy) in [(0, False), (0, True), (1, False)]:
+            proxy_evaluations = test.forward_td_lambda_learning_offline(
+                episode,
+                discount=0.5,
+                lambda_value=lambda_value,
+                off_policy=off_policy,
+                evaluation_only=True,
+            )
+            evaluations = test.forward_td_lambda_learning_offline(
+                episode,
+                discount=0.5,
+                lambda_value=lambda_value,
+                off_policy=off_policy,
+                proxy=False,
+                evaluation_only=True,
+            )
+            assert evaluations == proxy_evaluations
+
+    def test_evaluate_batch_same_as_each_episode(self):
+        test = ModelFreeAgent("test", AGENT_INFO)
+        test.action_value_store.set((0, 0, 1), 1)
+        test.action_value_store.set((1, 0, 0), 0.5)
+        test.action_value_store.set((1, 0, 2), 2)
+
+        episodes = [
+            [[(0, 0), 0, 0], [(0, 0), 1, 1], [(1, 0), 0, 1]],
+            [[(1, 1), 2, -1]],
+            [[(0, 0), 1, 0], [(1, 0), 0, 1]],
+        ]
+        episode_batch = {
+            "state_keys": np.array(
+                [
+                    [[0, 0], [0, 0], [1, 0]],
+                    [[1, 1], [0, 0], [0, 0]],
+                    [[0, 0], [1, 0], [0, 0]],
+                ]
+            ),
+            "action_indices": np.array([[0, 1, 0], [2, -1, -1], [1, 0, -1]]),
+            "rewards": np.array([[0, 1, 1], [-1, 0, 0], [0, 1, 0]]),
+            "lengths": np.array([3, 1, 2]),
+        }
+
+        for off_policy in [False, True]:
+            evaluations = [
+                evaluation
+                for episode in episodes
+                for evaluation in td_lambda_forward_evaluation(
+                    episode,
+                    ACTIONS,
+                    test.action_value_store,
+                    discount=0.5,
+                    lambda_value=0.5,
+                    off_policy=off_policy,
+                )
+            ]
+            sample_keys, sample_returns = td_lambda_forward_evaluation_batch(
+                episode_batch,
+                ACTIONS,
+                test.action_value_store,
+                discount=0.5,
+                lambda_value=0.5,
+                off_policy=off_policy,
+            )
+
+            assert [tuple(key) for key in sample_keys.tolist()] == [
+                key for (key, _) in evaluations
+            ]
+            assert np.allclose(sample_returns, [value for (_, value) in evaluations])
+
+    def test_learn_episode_batch(self):
+        test = ModelFreeAgent("test", [ACTIONS, None, [(0, 0), (1, 0)]], "table")
+
+        episode_batch = {
+            "state_keys": np.array([[[0, 0], [1, 0]], [[1, 0], [0, 0]]]),
+            "action_indices": np.array([[0, 1], [2, -1]]),
+            "rewards": np.array([[0, 1], [-1, 0]]),
+            "lengths": np.array([2, 1]),
+        }
+
+        test.forward_td_lambda_learning_offline_batch(
+            episode_batch, lambda_value=0.5, mini_batch_size=2, step_size=None
+        )
+
+        assert test.action_value_store.get((0, 0, 0)) == 0.5
+        assert test.action_value_store.get((1, 0, 1)) == 1
+        assert test.action_value_store.get((1, 0, 2)) == -1
+
+    def test_learn_episode_batch_with_last_partial_mini_batch(self):
+        test = ModelFreeAgent("test", [ACTIONS, None, [(0, 0), (1, 0)]], "table")
+
+        episode_batch = {
+            "state_keys": np.array(
+                [[[0, 0], [1, 0]], [[1, 0], [0, 0]], [[0, 0], [0, 0]]]
+            ),
+            "action_indices": np.array([[0, 1], [2, -1], [1, -1]]),
+            "rewards": np.array([[0, 1], [-1, 0], [1, 0]]),
+            "lengths": np.array([2, 1, 1]),
+        }
+
+        test.forward_td_lambda_learning_offline_batch(
+            episode_batch, mini_batch_size=2, step_size=None
+        )
+
+        assert test.action_value_store.total_count() == 4
+        assert test.action_value_store.get((0, 0, 1)) == 1
+
+    def test_learn_batch_with_all_mini_batch_evaluations(self):
+        test = ModelFreeAgent("test", AGENT_INFO)
+
+        mock_batch_learn = CopyMock()
+        test.action_value_store.batch_learn = mock_batch_learn
+
+        episodes = [
+            [[(0, 0), 0, 1]],
+            [[(1, 0), 1, -1]],
+            [[(0, 1), 2, 0]],
+        ]
+
+        test.forward_td_lambda_learning_offline_batch(
+            episodes, mini_batch_size=2, step_size=0.1
+        )
+
+        assert mock_batch_learn.call_args_list == [
+            mock.call([[(0, 0, 0), 1], [(1, 0, 1), -1]], step_size=0.1),
+            mock.call([[(0, 1, 2), 0]], step_size=0.1),
+        ]
+
+    def test_learn_experience_buffer_same_as_episodes(self):
+        episodes = [
+            [[(0, 0), 0, 0], [(1, 0), 1, 1]],
+            [[(1, 0), 1, -1]],
+            [[(0, 1), 2, 0], [(0, 0), 1, 0], [(1, 1), 0, 1]],
+            [[(0, 1), 2, 1]],
+        ]
+        STATES = [(0, 0), (1, 0), (0, 1), (1, 1)]
+        buffer = ExperienceBuffer(20)
+        buffer.extend(episodes)
+        buffer.shuffle(np.random.default_rng(0))
+
+        stores = []
+        for experiences in [[episodes[i] for i in buffer.order], buffer]:
+            test = ModelFreeAgent("test", [ACTIONS, None, STATES], "table")
+            test.forward_td_lambda_learning_offline_batch(
+                experiences, lambda_value=0.5, mini_batch_size=2
+            )
+            stores.append(test.action_value_store)
+
+        (expected, value_table) = stores
+        assert value_table.keys() == expected.keys()
+        assert np.allclose(value_table.arrays["value"], expected.arrays["value"])
+
+    def test_learn_encoded_experience_buffer_same_as_state_keys(self):
+        episodes = [
+            [[(0, 0), 0, 0], [(1, 0), 1, 1]],
+            [[(1, 0), 1, -1]],
+            [[(0, 1), 2, 0], [(0, 0), 1, 0], [(1, 1), 0, 1]],
+            [[(0, 1), 2, 1]],
+        ]
+        STATES = [(0, 0), (1, 0), (0, 1), (1, 1)]
+        key_encoder = KeyEncoder(ACTIONS, STATES)
+
+        buffers = [ExperienceBuffer(20), ExperienceBuffer(20, state_shape=())]
+        buffers[0].extend(episodes)
+        buffers[1].extend(
+            [key_encoder.encode_episode(episode) for episode in episodes]
+        )
+
+        for off_policy in [False, True]:
+            stores = []
+            for buffer in buffers:
+                test = ModelFreeAgent(
+                    "test", [ACTIONS, None, STATES, key_encoder], "table"
+                )
+                test.forward_td_lambda_learning_offline_batch(
+                    buffer, lambda_value=0.5, off_policy=off_policy, mini_batch_size=2
+                )
+                test.monte_carlo_learning_offline_batch(buffer.episode_batch())
+                stores.append(test.action_value_store)
+
+            (expected, value_table) = stores
+            assert value_table.keys() == expected.keys()
+            for value_key in ["count", "value", "mse"]:
+                assert np.allclose(
+                    value_table.arrays[value_key], expected.arrays[value_key]
+                )
+
+    def test_evaluate_multi_same_as_each_lambda_value(self):
+        test = ModelFreeAgent("test", AGENT_INFO)
+
+        episodes = [
+            [[(0, 0), 0, 0], [(0, 0), 1, 1], [(0, 0), 1, 0], [(1, 0), 0, 1]],
+            [[(1, 0), 1, -1]],
+            [[(1, 0), 0, 0], [(0, 0), 1, 1]],
+        ]
+        buffer = ExperienceBuffer(20)
+        buffer.extend(episodes)
+        episode_batch = buffer.episode_batch()
+        lambda_values = (0, 0.3, 1)
+
+        stores = test.init_action_value_stores("map", len(lambda_values))
+        for (i, store) in enumerate(stores):
+            store.set((0, 0, 1), i)
+            store.set((1, 0, 0), 0.5 * i)
+
+        for off_policy in [False, True]:
+            (sample_keys, lambda_returns) = td_lambda_forward_evaluation_multi(
+                episode_batch, ACTIONS, stores, 0.5, lambda_values, off_policy
+            )
+
+            assert lambda_returns.shape == (len(lambda_values), 7)
+
+            for (i, lambda_value) in enumerate(lambda_values):
+                evaluations = [
+                    evaluation
+                    for episode in episodes
+                    for evaluation in td_lambda_forward_evaluation(
+                        episode, ACTIONS, stores[i], 0.5, lambda_value, off_policy
+                    )
+                ]
+                assert [tuple(key) for key in sample_keys.tolist()] == [
+                    key for (key, _) in evaluations
+                ]
+                np.testing.assert_allclose(
+                    lambda_returns[i], [value for (_, value) in evaluations]
+                )
+
+    def test_evaluate_multi_with_a_shared_store(self):
+        test = ModelFreeAgent("test", AGENT_INFO)
+        test.action_value_store.set((0, 0, 1), 1)
+
+        episode_batch = {
+            "state_keys": np.array([[[0, 0], [0, 0]], [[1, 0], [0, 0]]]),
+            "action_indices": np.array([[0, 1], [2, -1]]),
+            "rewards": np.array([[0, 2], [-1, 0]]),
+            "lengths": np.array([2, 1]),
+        }
+
+        (_, lambda_returns) = td_lambda_forward_evaluation_multi(
+            episode_batch, ACTIONS, test.action_value_store, lambda_values=(0, 1)
+        )
+
+        assert np.array_equal(lambda_returns, [[1, 2, -1], [2, 2, -1]])
+
+    def test_learn_multi_into_each_store(self):
+        test = ModelFreeAgent("test", AGENT_INFO)
+
+        episodes = [
+            [[(0, 0), 0, 0], [(1, 0), 1, 1]],
+            [[(1, 0), 1, -1]],
+        ]
+
+        stores = test.init_action_value_stores("map", 2)
+
+        assert [store.name for store in stores] == [
+            "test_action_values_0",
+            "test_action_values_1",
+        ]
+
+        stores[0].set((1, 0, 1), 2)
+        stores[1].set((1, 0, 1), 2)
+
+        test.forward_td_lambda_learning_offline_multi(episodes, stores, [0, 1])
+
+        assert stores[0].get((0, 0, 0)) == 2
+        assert stores[1].get((0, 0, 0)) == 1
+        assert stores[0].get((1, 0, 1)) == 0
+        assert stores[1].get((1, 0, 1)) == 0
+
 
 class TestBackwardTemporalDifferenceLambdaLearning:
     def test_learn_each_step_with_correct_return(self):
@@ -428,3 +857,153 @@ class TestBackwardTemporalDifferenceLambdaLearning:
             },
             (1, 0, 0): {"count": 1, "value": 2.0, "mse": 0.0},
         }
+
+    def test_table_store_same_as_map_store(self):
+        episode = [
+            [(0, 0), 0, 0],
+            [(0, 0), 1, 1],
+            [(0, 0), 1, 0],
+            [(1, 0), 0, 1],
+        ]
+        N = len(episode)
+
+        stores = []
+        for config in ["map", "table"]:
+            test = ModelFreeAgent("test", [ACTIONS, None, [(0, 0), (1, 0)]], config)
+            for i in range(N):
+                test.backward_td_lambda_learning_online(
+                    episode[: i + 1],
+                    discount=0.5,
+                    lambda_value=0.5,
+                    final=i == N - 1,
+                )
+            stores.append(test.action_value_store)
+
+        (value_map, value_table) = stores
+        assert sorted(value_map.keys()) == value_table.keys()
+        for key in value_map.keys():
+            for value_key in ["count", "value", "mse"]:
+                assert np.isclose(
+                    value_map.get(key, value_key=value_key),
+                    value_table.get(key, value_key=value_key),
+                )
+
+    def test_encoded_episode_same_as_state_keys(self):
+        episode = [
+            [(0, 0), 0, 0],
+            [(0, 0), 1, 1],
+            [(0, 0), 1, 0],
+            [(1, 0), 0, 1],
+        ]
+        N = len(episode)
+        states = [(0, 0), (1, 0)]
+        key_encoder = KeyEncoder(ACTIONS, states)
+
+        stores = []
+        for sequence in [episode, key_encoder.encode_episode(episode)]:
+            test = ModelFreeAgent("test", [ACTIONS, None, states, key_encoder], "table")
+            for i in range(N):
+                test.backward_td_lambda_learning_online(
+                    sequence[: i + 1],
+                    discount=0.5,
+                    lambda_value=0.5,
+                    final=i == N - 1,
+                    off_policy=True,
+                )
+            test.forward_td_lambda_learning_offline(
+                sequence, discount=0.5, lambda_value=0.5, off_policy=True
+            )
+            stores.append(test.action_value_store)
+
+        (value_table, encoded_value_table) = stores
+        assert value_table.keys() == encoded_value_table.keys()
+        for value_key in ["count", "value", "mse"]:
+            assert np.allclose(
+                value_table.arrays[value_key], encoded_value_table.arrays[value_key]
+            )
+
+
+class TestBackwardTemporalDifferenceLambdaLearningOffline:
+    EPISODE = [
+        [(0, 0), 0, 0],
+        [(0, 0), 1, 1],
+        [(0, 0), 1, 0],
+        [(1, 0), 0, 1],
+    ]
+
+    def init_agent(self):
+        test = ModelFreeAgent("test", AGENT_INFO)
+        test.action_value_store.set((0, 0, 1), 1)
+        test.action_value_store.set((1, 0, 0), 0.5)
+        test.action_value_store.set((0, 0, 2), 2)
+        return test
+
+    def test_same_as_forward_view(self):
+        test = self.init_agent()
+
+        for lambda_value in [0, 0.3, 1]:
+            evaluations = backward_td_lambda_evaluation_offline(
+                self.EPISODE, ACTIONS, test.action_value_store, 0.5, lambda_value
+            )
+            expected = td_lambda_forward_evaluation(
+                self.EPISODE, ACTIONS, test.action_value_store, 0.5, lambda_value
+            )
+            for ([key, value], [expected_key, expected_value]) in zip(
+                evaluations, expected
+            ):
+                assert key == expected_key
+                assert abs(value - expected_value) < 1e-12
+
+    def test_accumulate_td_errors_by_eligibility(self):
+        for off_policy in [False, True]:
+            self.check_accumulated_td_errors(off_policy)
+
+    def check_accumulated_td_errors(self, off_policy):
+        test = self.init_agent()
+        store = test.action_value_store
+        (discount, lambda_value) = (0.5, 0.8)
+
+        evaluations = backward_td_lambda_evaluation_offline(
+            self.EPISODE, ACTIONS, store, discount, lambda_value, off_policy
+        )
+
+        trace = EligibilityTrace(threshold=0)
+        accumulated_td_errors = {}
+        for (t, [state_key, action_index, reward]) in enumerate(self.EPISODE):
+            key = (*state_key, action_index)
+            trace.update(key, discount=discount, lambda_value=lambda_value)
+
+            td_target = reward
+            if t + 1 < len(self.EPISODE):
+                [next_state_key, next_action_index, _] = self.EPISODE[t + 1]
+                td_target += discount * (
+                    greedy_policy(next_state_key, ACTIONS, store)[1]
+                    if off_policy
+                    else store.get((*next_state_key, next_action_index))
+                )
+            td_error = td_target - store.get(key)
+
+            for trace_key in trace.keys():
+                accumulated_td_errors[trace_key] = (
+                    accumulated_td_errors.get(trace_key, 0)
+                    + trace.get(trace_key) * td_error
+                )
+
+        for (key, accumulated_td_error) in accumulated_td_errors.items():
+            sum_td_errors = sum(
+                [value - store.get(key) for [k, value] in evaluations if k == key]
+            )
+            assert abs(sum_td_errors - accumulated_td_error) < 1e-12
+
+    def test_learn_once_at_the_end_of_episode(self):
+        test = self.init_agent()
+
+        mock_batch_learn = CopyMock(wraps=test.action_value_store.batch_learn)
+        test.action_value_store.batch_learn = mock_batch_learn
+
+        test.backward_td_lambda_learning_offline(
+            self.EPISODE, discount=0.5, lambda_value=0.5
+        )
+
+        assert mock_batch_learn.call_count == 1
+        assert test.action_value_store.count((0, 0, 1)) == 2
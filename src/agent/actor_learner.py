@@ -0,0 +1,187 @@
+import numpy as np
+
+from multiprocessing import get_context
+from queue import Empty, Full
+
+from src.easy_21.game import playout_batch
+from src.lib.value_map import ValueMap
+
+
+def actor(seed_sequence, policy_queue, episode_queue, stop_event, batch_size):
+    """
+    sample player episodes with playout_batch() in batches of batch_size
+    with the latest policy snapshot from policy_queue, and put them into
+    episode_queue with the version of the policy, blocking while it is full
+    """
+    rng = np.random.default_rng(seed_sequence)
+
+    (version, policy) = policy_queue.get()
+
+    while not stop_event.is_set():
+        # act with the latest snapshot published
+        try:
+            while True:
+                (version, policy) = policy_queue.get_nowait()
+        except Empty:
+            pass
+
+        (player_batch, _) = playout_batch(
+            batch_size, player_policy=policy.with_rng(rng), rng=rng
+        )
+
+        while not stop_event.is_set():
+            try:
+                episode_queue.put((version, player_batch), timeout=0.1)
+                break
+            except Full:
+                continue
+
+
+class ActorLearner:
+    """ActorLearner
+
+    Actor processes sample episodes with playout_batch(), acting by
+    a snapshot of the e_greedy_policy of the agent, while the learner
+    in this process learns them with forward_td_lambda_learning_offline_batch()
+
+    - episodes come through a bounded queue of queue_size batches,
+      actors block when it is full, as backpressure of the learner
+    - a new policy snapshot is published every refresh_every batches learnt
+    - batches sampled by a policy more than max_policy_lag versions
+      behind the latest are dropped
+
+    Each actor has an independent rng stream spawned from seed
+
+    The agent needs a KeyEncoder for the policy snapshots, and a store
+    learning a numeric step_size, e.g. "table", not a ValueMap
+    """
+
+    def __init__(
+        self,
+        agent,
+        actors=2,
+        batch_size=100,
+        queue_size=4,
+        max_policy_lag=2,
+        refresh_every=1,
+        exploration_rate=0.5,
+        seed=None,
+    ):
+        if isinstance(agent.action_value_store, ValueMap):
+            raise ValueError(
+                "a ValueMap learns a step_size function of count, "
+                'use a "table" action value store'
+            )
+
+        self.agent = agent
+        self.actors = actors
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.max_policy_lag = max_policy_lag
+        self.refresh_every = refresh_every
+        self.exploration_rate = exploration_rate
+        self.seed_sequence = np.random.SeedSequence(seed)
+
+        self.policy_version = 0
+        self.stats = {
+            "learnt_episodes": 0,
+            "learnt_steps": 0,
+            "learnt_batches": 0,
+            "dropped_batches": 0,
+        }
+
+    #
+    # utility functions
+    #
+    def publish_policy(self, policy_queues):
+        policy = self.agent.e_greedy_policy_snapshot(self.exploration_rate)
+
+        for policy_queue in policy_queues:
+            # replace the snapshot not yet taken by the actor
+            try:
+                policy_queue.get_nowait()
+            except Empty:
+                pass
+            try:
+                policy_queue.put_nowait((self.policy_version, policy))
+            except Full:
+                pass
+
+    #
+    # learning functions
+    #
+    def learn(self, episodes, **kwargs):
+        """
+        learn at least episodes episodes sampled by the actors,
+        kwargs are passed to forward_td_lambda_learning_offline_batch()
+
+        Returns:
+          stats -- learnt_episodes, learnt_steps, learnt_batches
+            and dropped_batches
+        """
+        # spawned, as the queues run feeder threads in this process
+        context = get_context("spawn")
+        episode_queue = context.Queue(self.queue_size)
+        policy_queues = [context.Queue(1) for _ in range(self.actors)]
+        stop_event = context.Event()
+
+        self.publish_policy(policy_queues)
+
+        processes = [
+            context.Process(
+                target=actor,
+                args=(
+                    seed_sequence,
+                    policy_queue,
+                    episode_queue,
+                    stop_event,
+                    self.batch_size,
+                ),
+                daemon=True,
+            )
+            for (seed_sequence, policy_queue) in zip(
+                self.seed_sequence.spawn(self.actors), policy_queues
+            )
+        ]
+        for process in processes:
+            process.start()
+
+        target = self.stats["learnt_episodes"] + episodes
+        try:
+            while self.stats["learnt_episodes"] < target:
+                try:
+                    (version, player_batch) = episode_queue.get(timeout=1)
+                except Empty:
+                    # actors only stop by stop_event, none alive is a crash
+                    if not any(process.is_alive() for process in processes):
+                        raise RuntimeError("all actor processes exited")
+                    continue
+
+                if self.policy_version - version > self.max_policy_lag:
+                    self.stats["dropped_batches"] += 1
+                    continue
+
+                self.agent.forward_td_lambda_learning_offline_batch(
+                    player_batch, **kwargs
+                )
+                self.stats["learnt_episodes"] += len(player_batch["lengths"])
+                self.stats["learnt_steps"] += int(player_batch["lengths"].sum())
+                self.stats["learnt_batches"] += 1
+
+                if self.stats["learnt_batches"] % self.refresh_every == 0:
+                    self.policy_version += 1
+                    self.publish_policy(policy_queues)
+        finally:
+            stop_event.set()
+            # unblock the actors waiting on a full queue
+            try:
+                while True:
+                    episode_queue.get(timeout=0.1)
+            except Empty:
+                pass
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+
+        return self.stats
@@ -0,0 +1,97 @@
+import random
+import numpy as np
+
+from time import sleep, time
+
+from src.agent.model_free_agent import ModelFreeAgent
+from src.easy_21.game import playout, PLAYER_INFO
+from src.lib.shared_value_table import SharedValueTable
+
+
+def hogwild_worker(action_value_store, episodes, seed, exploration_rate):
+    """
+    monte carlo control of a player learning the shared action_value_store
+    """
+    # playout samples from the random module
+    random.seed(seed)
+
+    player = ModelFreeAgent("player", PLAYER_INFO)
+    player.action_value_store = action_value_store
+
+    for _ in range(episodes):
+        playout(
+            player_policy=lambda state_key: player.e_greedy_policy(
+                state_key, exploration_rate=exploration_rate
+            ),
+            player_offline_learning=player.monte_carlo_learning_offline,
+        )
+
+    action_value_store.close()
+
+
+def hogwild_learning(
+    player,
+    workers=2,
+    episodes=int(1e5),
+    lock_stripes=0,
+    exploration_rate=0.5,
+    record_interval=0.5,
+    seed=None,
+):
+    """
+    monte carlo control of episodes split into workers processes
+    learning one SharedValueTable, lock-free or with lock_stripes locks
+
+    the accuracy of the player to its optimal_state_value_store
+    is recorded every record_interval seconds while the workers learn
+
+    the player is left with a ValueTable copy of the shared table
+
+    Returns:
+      history -- (seconds, accuracy) from the start of the workers
+    """
+    action_value_store = SharedValueTable(
+        f"{player.name}_action_values",
+        player.get_state_action_keys(),
+        lock_stripes=lock_stripes,
+    )
+    player.action_value_store = action_value_store
+
+    seeds = [
+        int(seed_sequence.generate_state(1)[0])
+        for seed_sequence in np.random.SeedSequence(seed).spawn(workers)
+    ]
+    context = action_value_store.context
+    processes = [
+        context.Process(
+            target=hogwild_worker,
+            args=(action_value_store, size, worker_seed, exploration_rate),
+        )
+        for (size, worker_seed) in zip(
+            [len(chunk) for chunk in np.array_split(np.arange(episodes), workers)],
+            seeds,
+        )
+    ]
+
+    history = []
+    start = time()
+    for process in processes:
+        process.start()
+
+    try:
+        while any([process.is_alive() for process in processes]):
+            sleep(record_interval)
+            history.append(
+                (time() - start, player.target_state_value_store_accuracy_to_optimal())
+            )
+        history.append(
+            (time() - start, player.target_state_value_store_accuracy_to_optimal())
+        )
+    finally:
+        for process in processes:
+            process.join()
+
+        player.action_value_store = action_value_store.to_value_table()
+        action_value_store.unlink()
+
+    return history
@@ -1,22 +1,48 @@
+import os
+import numpy as np
+
 from src.lib.value_map import ValueMap
+from src.lib.value_table import ValueTable
 from src.lib.value_approximator import ValueApproximator
 from src.lib.value_network import ValueNetwork
 from src.lib.value_network_gpu import ValueNetworkGPU
-
-from src.lib.eligibility_trace import EligibilityTrace
-from src.lib.policy import e_greedy_policy, greedy_policy
-
-from src.evaluation.mc import monte_carlo_evaluation
+from src.lib.value_network_numpy import ValueNetworkNumpy
+
+from src.lib.eligibility_trace import (
+    EligibilityTrace,
+    ArrayEligibilityTrace,
+    WeightEligibilityTrace,
+)
+from src.lib.experience_buffer import ExperienceBuffer
+from src.lib.policy import (
+    GreedyActionCache,
+    e_greedy_policy,
+    greedy_policy,
+    greedy_table_policy,
+)
+
+from src.evaluation.mc import monte_carlo_evaluation, monte_carlo_evaluation_batch
 from src.evaluation.td import temporal_difference_evaluation
-from src.evaluation.td_lambda_forward import td_lambda_forward_evaluation
-from src.evaluation.td_lambda_backward import backward_td_lambda_learning_online
+from src.evaluation.td_lambda_forward import (
+    td_lambda_forward_evaluation,
+    td_lambda_forward_evaluation_batch,
+    td_lambda_forward_evaluation_multi,
+)
+from src.evaluation.td_lambda_backward import (
+    backward_td_lambda_learning_online,
+    backward_td_lambda_evaluation_offline,
+)
 from src.evaluation.sarsa import sarsa_evaluation
 
 
 STORE_TYPES = {
     "map": ValueMap,
+    # dense ValueMap for the known finite ALL_STATES x ACTIONS
+    "table": ValueTable,
     "approximator": ValueApproximator,
     "network": ValueNetwork,
+    # ValueNetwork on a numpy MLP learning minibatches in matrices
+    "network_numpy": ValueNetworkNumpy,
     # NOTE: ValueNetworkGPU based on tinygrad is not performantive
     "network_gpu": ValueNetworkGPU,
 }
@@ -59,13 +85,23 @@ class ModelFreeAgent:
         self.name = name
 
         # known env information
-        self.ACTIONS, self.STATE_LABELS, self.ALL_STATES, *_ = (*env_info, None, None)
+        (self.ACTIONS, self.STATE_LABELS, self.ALL_STATES, *_) = (
+            *env_info,
+            None,
+            None,
+        )
+        # KeyEncoder of state ids, for playouts with encoded episodes
+        # learnt by a "table" action_value_store indexed by the ids
+        self.key_encoder = env_info[3] if len(env_info) > 3 else None
 
         # action value store
         self.action_value_store = self.init_action_value_store(
             action_value_store_config
         )
 
+        # greedy actions of action_value_store for e_greedy_policy
+        self.greedy_action_cache = GreedyActionCache(self.ACTIONS)
+
         # target value store
         self.target_state_value_store = ValueMap(f"{name}_target_state_values")
         self.target_policy_action_store = ValueMap(f"{name}_target_policy_actions")
@@ -76,7 +112,7 @@ class ModelFreeAgent:
         self.true_action_value_store = ValueMap(f"{name}_true_action_values")
 
         # for backward_td_lambda_learning_online
-        self.action_eligibility_trace = EligibilityTrace()
+        self.action_eligibility_trace = self.init_action_eligibility_trace()
 
         # I/O default pathes
         self.default_file_path_for_optimal_state_values = (
@@ -86,17 +122,49 @@ class ModelFreeAgent:
     #
     # constructor functions
     #
-    def init_action_value_store(self, config):
-        name = f"{self.name}_action_values"
+    def init_action_value_store(self, config, name=None):
+        name = f"{self.name}_action_values" if name is None else name
 
         if type(config) is str:
             store_type = config
-            return STORE_TYPES[store_type](name)
+            store_config = []
+        else:
+            (store_type, *_config) = config
+            store_config = [c for c in _config if c is not None]
+
+        if store_type == "table" and len(store_config) == 0:
+            if self.ALL_STATES is None:
+                raise ValueError(
+                    '"table" requires ALL_STATES in env_info, or the keys in config'
+                )
+            store_config = [self.get_state_action_keys()]
 
-        (store_type, *_config) = config
-        store_config = (c for c in _config if c is not None)
         return STORE_TYPES[store_type](name, *store_config)
 
+    def init_action_eligibility_trace(self, **kwargs):
+        """
+        the eligibility trace matching the type of action_value_store
+        - ArrayEligibilityTrace of key ids for ValueTable
+        - WeightEligibilityTrace over weights for ValueApproximator,
+          with kwargs of step_size and true_online
+        - EligibilityTrace of keys otherwise
+        """
+        if isinstance(self.action_value_store, ValueTable):
+            return ArrayEligibilityTrace(self.action_value_store, **kwargs)
+        if isinstance(self.action_value_store, ValueApproximator):
+            return WeightEligibilityTrace(**kwargs)
+        return EligibilityTrace(**kwargs)
+
+    def init_action_value_stores(self, config, size):
+        """
+        a stack of action value stores of the same config,
+        e.g. one for each lambda_value in a sweep
+        """
+        return [
+            self.init_action_value_store(config, f"{self.name}_action_values_{i}")
+            for i in range(size)
+        ]
+
     #
     # Control Policy Functions
     #
@@ -106,9 +174,22 @@ class ModelFreeAgent:
             self.ACTIONS,
             self.action_value_store,
             exploration_rate=exploration_rate,
+            greedy_action_cache=self.greedy_action_cache,
         )
         return action_index
 
+    def e_greedy_policy_snapshot(self, exploration_rate=0.5):
+        """
+        e_greedy_policy of the current action_value_store as
+        a GreedyTablePolicy of state_keys arrays, e.g. for RolloutPool
+        """
+        if self.key_encoder is None:
+            raise ValueError("a KeyEncoder in env_info is required for the states")
+
+        return greedy_table_policy(
+            self.key_encoder, self.action_value_store, exploration_rate
+        )
+
     #
     # Learning Functions (Incremental Update)
     #
@@ -125,6 +206,21 @@ class ModelFreeAgent:
 
         self.action_value_store.batch_learn(evaluations)
 
+    def monte_carlo_learning_offline_batch(
+        self,
+        episode_batch,
+        discount=1,
+        evaluation_only=False,
+    ):
+        sample_keys, sample_returns = monte_carlo_evaluation_batch(
+            episode_batch, discount=discount
+        )
+
+        if evaluation_only:
+            return sample_keys, sample_returns
+
+        self.action_value_store.batch_learn_arrays(sample_keys, sample_returns)
+
     def temporal_difference_learning_offline(
         self,
         episode,
@@ -193,7 +289,28 @@ class ModelFreeAgent:
         proxy=True,
         step_size=0.01,
     ):
-        MINI_BATCH = len(episodes) // mini_batch_size
+        """
+        episodes can be a list of episodes,
+        padded episodes from playout_batch(),
+        or an ExperienceBuffer replayed in its shuffled order
+
+        all episodes are learnt, the last mini batch with the remainder
+        of len(episodes) % mini_batch_size episodes
+        """
+        if isinstance(episodes, ExperienceBuffer):
+            episodes = episodes.episode_batch()
+
+        if isinstance(episodes, dict):
+            return self.forward_td_lambda_learning_offline_episode_batch(
+                episodes,
+                discount=discount,
+                lambda_value=lambda_value,
+                off_policy=off_policy,
+                mini_batch_size=mini_batch_size,
+                step_size=step_size,
+            )
+
+        MINI_BATCH = -(-len(episodes) // mini_batch_size)
 
         for n in range(MINI_BATCH):
             # least square error over a batch of episodes
@@ -218,7 +335,87 @@ class ModelFreeAgent:
                 )
                 mini_batch_evaluations.extend(evaluations)
 
-            self.action_value_store.batch_learn(evaluations, step_size=step_size)
+            self.action_value_store.batch_learn(
+                mini_batch_evaluations, step_size=step_size
+            )
+
+    def forward_td_lambda_learning_offline_episode_batch(
+        self,
+        episode_batch,
+        discount=1,
+        lambda_value=0,
+        off_policy=False,
+        mini_batch_size=20,
+        step_size=0.01,
+    ):
+        N = len(episode_batch["lengths"])
+        MINI_BATCH = -(-N // mini_batch_size)
+
+        for n in range(MINI_BATCH):
+            mini_batch = {
+                key: array[n * mini_batch_size : (n + 1) * mini_batch_size]
+                for (key, array) in episode_batch.items()
+            }
+
+            sample_keys, sample_returns = td_lambda_forward_evaluation_batch(
+                mini_batch,
+                self.ACTIONS,
+                self.action_value_store,
+                discount,
+                lambda_value,
+                off_policy,
+            )
+
+            self.action_value_store.batch_learn_arrays(
+                sample_keys, sample_returns, step_size=step_size
+            )
+
+    def forward_td_lambda_learning_offline_multi(
+        self,
+        episodes,
+        action_value_stores,
+        lambda_values,
+        discount=1,
+        off_policy=False,
+        evaluation_only=False,
+    ):
+        """
+        learn the lambda_returns of a batch of episodes for a vector of
+        lambda_values, each row into its own store of init_action_value_stores()
+
+        the episodes are sampled and evaluated once for all lambda_values,
+        episodes can be a list of episodes, padded episodes from
+        playout_batch(), or an ExperienceBuffer
+        """
+        if isinstance(episodes, list):
+            # padded through a buffer of all their steps
+            steps = [step for episode in episodes for step in episode]
+            buffer = ExperienceBuffer(
+                max(len(steps), 1),
+                state_shape=np.shape(steps[0][0]) if len(steps) > 0 else (),
+            )
+            buffer.extend(episodes)
+            episodes = buffer
+
+        if isinstance(episodes, ExperienceBuffer):
+            episodes = episodes.episode_batch()
+
+        sample_keys, lambda_returns = td_lambda_forward_evaluation_multi(
+            episodes,
+            self.ACTIONS,
+            action_value_stores,
+            discount,
+            lambda_values,
+            off_policy,
+        )
+
+        if evaluation_only:
+            return sample_keys, lambda_returns
+
+        for (action_value_store, sample_returns) in zip(
+            action_value_stores, lambda_returns
+        ):
+            action_value_store.batch_learn_arrays(sample_keys, sample_returns)
 
     def temporal_difference_learning_online(
         self,
@@ -256,6 +453,32 @@ class ModelFreeAgent:
             off_policy,
         )
 
+    def backward_td_lambda_learning_offline(
+        self,
+        episode,
+        discount=1,
+        lambda_value=0,
+        off_policy=False,
+        evaluation_only=False,
+    ):
+        """
+        backward TD(lambda) with the td_errors accumulated over the episode
+        and learnt in one batch_learn, e.g. for player_offline_learning
+        """
+        evaluations = backward_td_lambda_evaluation_offline(
+            episode,
+            self.ACTIONS,
+            self.action_value_store,
+            discount,
+            lambda_value,
+            off_policy,
+        )
+
+        if evaluation_only:
+            return evaluations
+
+        self.action_value_store.batch_learn(evaluations)
+
     #
     # Helper Functions - Target Value Store
     #
@@ -267,16 +490,26 @@ class ModelFreeAgent:
         state_keys = list(set([key[:-1] for key in state_action_keys]))
         return state_keys
 
+    def get_state_action_keys(self):
+        return [
+            (*state_key, action_index)
+            for state_key in self.get_state_keys()
+            for action_index in range(len(self.ACTIONS))
+        ]
+
     def set_target_value_stores(self):
         for state_key in self.get_state_keys():
             target_action_index, _ = greedy_policy(
                 state_key, self.ACTIONS, self.action_value_store
             )
             self.target_policy_action_store.set(state_key, target_action_index)
-            target_action_all_data = self.action_value_store.data[
-                (*state_key, target_action_index)
-            ]
-            self.target_state_value_store.data[state_key] = target_action_all_data
+            target_action_key = (*state_key, target_action_index)
+            self.target_state_value_store.data[state_key] = {
+                value_key: self.action_value_store.get(
+                    target_action_key, value_key=value_key
+                )
+                for value_key in ["count", "value", "mse"]
+            }
 
     def plot_2d_target_value_stores(
         self,
@@ -350,7 +583,14 @@ class ModelFreeAgent:
             self.default_file_path_for_optimal_state_values if path is None else path
         )
 
-    def load_optimal_state_values(self, path=None):
-        self.optimal_state_value_store.load(
-            self.default_file_path_for_optimal_state_values if path is None else path
-        )
+    def load_optimal_state_values(self, path=None, binary=False):
+        """
+        by default, from the JSON of the default path,
+        or from its binary .npy with binary=True
+        """
+        if path is None:
+            path = self.default_file_path_for_optimal_state_values
+            if binary:
+                path = f"{os.path.splitext(path)[0]}.npy"
+
+        self.optimal_state_value_store.load(path)
@@ -0,0 +1,60 @@
+import numpy as np
+
+from src.lib.value_approximator import ValueApproximator
+from src.easy_21.feature_function import (
+    PLAYER_STATE_ACTIONS,
+    overlapped_binary_feature,
+    overlapped_binary_active,
+    full_binary_feature,
+    full_binary_active,
+    table_lookup,
+    table_lookup_active,
+    feature_cache,
+)
+
+
+def test_active_indices_same_as_binary_features():
+    for (binary_feature, active_feature) in [
+        (overlapped_binary_feature, overlapped_binary_active),
+        (full_binary_feature, full_binary_active),
+        (table_lookup, table_lookup_active),
+    ]:
+        for state_action in PLAYER_STATE_ACTIONS:
+            features = binary_feature(state_action)
+            assert len(features) == active_feature.feature_size
+            assert np.array_equal(
+                np.flatnonzero(features), sorted(active_feature(state_action))
+            )
+
+
+def test_active_indices_of_keys_out_of_range():
+    # e.g. dealer 0 of "blind" observability, or a dealer sum over 10
+    state_actions = [(0, 5, 1), (11, 5, 0), (3, 0, 1), (12, 22, 0)]
+
+    for (binary_feature, active_feature) in [
+        (overlapped_binary_feature, overlapped_binary_active),
+        (full_binary_feature, full_binary_active),
+        (table_lookup, table_lookup_active),
+    ]:
+        dense = ValueApproximator("dense", input_parser=binary_feature)
+        sparse = ValueApproximator("sparse", input_parser=active_feature)
+        dense.weights = np.linspace(-1, 1, active_feature.feature_size)
+        sparse.weights = np.copy(dense.weights)
+
+        for state_action in state_actions:
+            assert np.array_equal(
+                np.flatnonzero(binary_feature(state_action)),
+                sorted(active_feature(state_action)),
+            )
+            assert np.isclose(sparse.get(state_action), dense.get(state_action))
+
+            dense.learn(state_action, 1, step_size=0.1)
+            sparse.learn(state_action, 1, step_size=0.1)
+        assert np.allclose(sparse.weights, dense.weights)
+
+
+def test_feature_cache():
+    cache = feature_cache(table_lookup)
+    assert cache is feature_cache(table_lookup)
+    assert cache.matrix.shape == (len(PLAYER_STATE_ACTIONS), 420)
+    assert np.array_equal(cache((3, 4, 1)), table_lookup((3, 4, 1)))
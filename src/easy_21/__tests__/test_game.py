@@ -1,5 +1,22 @@
+import numpy as np
+
 from unittest import mock
-from src.easy_21.game import sample, compare, hit, step, init, playout
+from src.easy_21.game import (
+    sample,
+    sample_batch,
+    compare,
+    hit,
+    step,
+    init,
+    playout,
+    playout_batch,
+    unbatch,
+    batch_policy,
+    dummy_player_stick_policy,
+    dummy_dealer_stick_policy,
+    PLAYER_KEY_ENCODER,
+    DEALER_KEY_ENCODER,
+)
 from copy import deepcopy
 
 
@@ -59,6 +76,26 @@ class TestSample:
         assert (probabilities["-"] - 1 / 3) < 0.005
 
 
+class TestSampleBatch:
+    def test_distribution(self):
+        """
+        sample_batch() should follow the same distribution as sample()
+        """
+        N = 100000
+        rng = np.random.default_rng(0)
+
+        samples = sample_batch(rng, N, adding_only=True)
+        values, counts = np.unique(samples, return_counts=True)
+
+        assert np.array_equal(values, np.arange(1, 11))
+        assert np.all(np.abs(counts / N - 0.1) < 0.005)
+
+        samples = sample_batch(rng, N)
+
+        assert abs(np.mean(samples > 0) - 2 / 3) < 0.005
+        assert abs(np.mean(samples < 0) - 1 / 3) < 0.005
+
+
 class TestCompare:
     def test_compare_output_reward(self):
         """
@@ -198,6 +235,37 @@ class TestPlayout:
         assert player_sequence == [[(10, 10), 0, 0], [(10, 20), 1, 0]]
         assert dealer_sequence == [[(10, 20), 0, 0], [(20, 20), 1, 0]]
 
+    @mock.patch("src.easy_21.game.sample", return_value=10)
+    def test_key_encoder_sequences(self, mock_sample):
+        player_sequence, dealer_sequence = playout(
+            player_policy=PLAYER_KEY_ENCODER.state_policy(dummy_player_stick_policy),
+            dealer_policy=DEALER_KEY_ENCODER.state_policy(dummy_dealer_stick_policy),
+            player_key_encoder=PLAYER_KEY_ENCODER,
+            dealer_key_encoder=DEALER_KEY_ENCODER,
+        )
+        for step in player_sequence:
+            assert type(step[0]) is int
+        assert PLAYER_KEY_ENCODER.decode_episode(player_sequence) == [
+            [(10, 10), 0, 0],
+            [(10, 20), 1, 0],
+        ]
+        assert DEALER_KEY_ENCODER.decode_episode(dealer_sequence) == [
+            [(10, 20), 0, 0],
+            [(20, 20), 1, 0],
+        ]
+
+    def test_key_encoder_rejects_blind_observability(self):
+        policy = PLAYER_KEY_ENCODER.state_policy(dummy_player_stick_policy)
+        try:
+            playout(
+                player_policy=policy,
+                observability_level="blind",
+                player_key_encoder=PLAYER_KEY_ENCODER,
+            )
+            assert False
+        except ValueError as error:
+            assert "blind" in str(error)
+
     @mock.patch("src.easy_21.game.sample", return_value=10)
     def test_player_offline_learning_sequence(self, mock_sample):
         mock_learning = mock.Mock()
@@ -273,3 +341,65 @@ class TestPlayout:
         assert dealer_learning.call_args_list == [
             mock.call([[(10, 0), 0, 0], [(20, 0), 1, 0]]),
         ]
+
+
+def mock_sample_batch(rng, size, adding_only=False):
+    return np.full(size, 10)
+
+
+class TestPlayoutBatch:
+    @mock.patch("src.easy_21.game.sample", return_value=10)
+    @mock.patch("src.easy_21.game.sample_batch", side_effect=mock_sample_batch)
+    def test_same_sequences_as_playout(self, mock_sample_batch, mock_sample):
+        for observability_level in ["full", "only_initial", "blind"]:
+            player_batch, dealer_batch = playout_batch(
+                3, observability_level=observability_level
+            )
+            player_sequence, dealer_sequence = playout(
+                observability_level=observability_level
+            )
+            assert unbatch(player_batch) == [player_sequence] * 3
+            assert unbatch(dealer_batch) == [dealer_sequence] * 3
+
+    @mock.patch("src.easy_21.game.sample_batch", side_effect=mock_sample_batch)
+    def test_padded_arrays(self, mock_sample_batch):
+        player_batch, dealer_batch = playout_batch(2)
+
+        assert np.array_equal(player_batch["lengths"], [2, 2])
+        assert player_batch["state_keys"].shape == (2, 2, 2)
+        assert np.array_equal(player_batch["action_indices"], [[0, 1], [0, 1]])
+        assert np.array_equal(player_batch["rewards"], [[0, 0], [0, 0]])
+
+    def test_masks_finished_games(self):
+        rng = np.random.default_rng(0)
+        player_batch, dealer_batch = playout_batch(1000, rng=rng)
+
+        for batch in [player_batch, dealer_batch]:
+            lengths = batch["lengths"]
+            padded = np.arange(batch["action_indices"].shape[1]) >= lengths[:, None]
+
+            assert np.all(batch["action_indices"][padded] == -1)
+            assert np.all(batch["state_keys"][padded] == 0)
+            assert np.all(batch["rewards"][padded] == 0)
+
+        player_busted = dealer_batch["lengths"] == 0
+        final_rewards = player_batch["rewards"].sum(axis=1)
+
+        assert np.all(final_rewards[player_busted] == -1)
+        assert np.all(np.isin(final_rewards, [-1, 0, 1]))
+        assert np.array_equal(
+            dealer_batch["rewards"].sum(axis=1)[~player_busted],
+            -final_rewards[~player_busted],
+        )
+
+    def test_batch_policy(self):
+        rng = np.random.default_rng(0)
+        player_batch, _ = playout_batch(
+            1000,
+            player_policy=batch_policy(dummy_player_stick_policy),
+            rng=rng,
+        )
+
+        for sequence in unbatch(player_batch):
+            for [(_, player), action_index, _] in sequence:
+                assert action_index == dummy_player_stick_policy((0, player))
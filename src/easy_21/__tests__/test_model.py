@@ -0,0 +1,184 @@
+import numpy as np
+
+from src.agent.model_free_agent import ModelFreeAgent
+from src.easy_21.game import (
+    ACTIONS,
+    DEALER_INFO,
+    DEALER_KEY_ENCODER,
+    PLAYER_STATES,
+    playout,
+    playout_batch,
+    dummy_player_stick_policy,
+    dummy_dealer_stick_policy,
+)
+from src.easy_21.model import (
+    CARD_DISTRIBUTION,
+    POLICY_CACHE_SIZE,
+    dealer_outcome_table,
+    dealer_outcome_distribution,
+    dealer_stick_rewards,
+    sample_dealer_phase,
+    expected_dealer_phase,
+    player_transitions,
+    solve_player_optimal,
+)
+from src.lib.dynamic_programming import build_model, policy_evaluation
+
+
+def test_card_distribution():
+    probabilities = [probability for (_, probability) in CARD_DISTRIBUTION]
+    adding = [probability for (change, probability) in CARD_DISTRIBUTION if change > 0]
+
+    assert abs(sum(probabilities) - 1) < 1e-12
+    assert abs(sum(adding) - 2 / 3) < 1e-12
+
+
+class TestDealerStickRewards:
+    def test_dealer_sticks_at_once(self):
+        rewards = dealer_stick_rewards(18)
+
+        assert rewards[17 - 1] == 1
+        assert rewards[18 - 1] == 0
+        assert rewards[21 - 1] == -1
+
+    def test_rewards_in_range(self):
+        for player in range(1, 22):
+            rewards = dealer_stick_rewards(player)
+            assert np.all(rewards <= 1) and np.all(rewards >= -1)
+
+
+class TestPlayerTransitions:
+    def test_probabilities_sum_to_one(self):
+        transitions = player_transitions()
+
+        for state_key in PLAYER_STATES:
+            for action_index in range(len(ACTIONS)):
+                outcomes = transitions(state_key, action_index)
+                probabilities = [probability for (probability, _, _) in outcomes]
+                assert abs(sum(probabilities) - 1) < 1e-12
+
+
+class TestSolvePlayerOptimal:
+    def test_methods_agree(self):
+        action_values, state_values = solve_player_optimal()
+        _action_values, _state_values = solve_player_optimal(method="policy_iteration")
+
+        for key in state_values.keys():
+            assert abs(state_values.get(key) - _state_values.get(key)) < 1e-9
+
+        for key in action_values.keys():
+            assert abs(action_values.get(key) - _action_values.get(key)) < 1e-9
+
+    def test_state_values_are_max_action_values(self):
+        action_values, state_values = solve_player_optimal()
+
+        assert len(state_values.keys()) == len(PLAYER_STATES)
+
+        for state_key in PLAYER_STATES:
+            assert state_values.get(state_key) == max(
+                action_values.get((*state_key, action_index))
+                for action_index in range(len(ACTIONS))
+            )
+
+    def test_model_matches_sampling(self):
+        """
+        the exact value of the dummy player policy should match
+        the mean reward of sampled games, starting from
+        dealer and player both in [1, 10] uniformly
+        """
+        P, R = build_model(PLAYER_STATES, ACTIONS, player_transitions())
+        policy = np.array([dummy_player_stick_policy(s) for s in PLAYER_STATES])
+        _, state_values = policy_evaluation(P, R, policy)
+
+        initial = [
+            state_values[s]
+            for s, (_, player) in enumerate(PLAYER_STATES)
+            if player <= 10
+        ]
+
+        player_batch, _ = playout_batch(int(1e5), rng=np.random.default_rng(0))
+        sampled = player_batch["rewards"].sum(axis=1)
+
+        assert abs(np.mean(initial) - np.mean(sampled)) < 0.01
+
+
+class TestDealerOutcomeTable:
+    def test_distributions_sum_to_one(self):
+        for player in range(0, 22):
+            table = dealer_outcome_table(dummy_dealer_stick_policy, player)
+            assert table.shape == (21, 22)
+            assert np.allclose(table.sum(axis=1), 1)
+
+    def test_memoized(self):
+        table = dealer_outcome_table(dummy_dealer_stick_policy, 18)
+        assert dealer_outcome_table(dummy_dealer_stick_policy, 18) is table
+        assert not table.flags.writeable
+
+    def test_memo_of_policies_bounded(self):
+        def dealer_stick_policy(threshold):
+            def policy(state_key):
+                stick = state_key[0] >= threshold
+                return ACTIONS.index("stick") if stick else ACTIONS.index("hit")
+
+            return policy
+
+        for threshold in range(10, 20):
+            for player in range(0, 22):
+                dealer_outcome_table(dealer_stick_policy(threshold), player)
+
+        assert dealer_outcome_table.cache_info().currsize <= POLICY_CACHE_SIZE
+
+    def test_reject_policies_not_fixed_functions_of_state_key(self):
+        dealer = ModelFreeAgent("dealer", DEALER_INFO)
+        for dealer_policy in [
+            dealer.e_greedy_policy,
+            DEALER_KEY_ENCODER.state_policy(dummy_dealer_stick_policy),
+        ]:
+            try:
+                dealer_outcome_table(dealer_policy, 18)
+                assert False
+            except ValueError:
+                pass
+
+    def test_dealer_sticks_at_once(self):
+        for dealer in range(17, 22):
+            distribution = dealer_outcome_distribution(
+                dummy_dealer_stick_policy, dealer, 10
+            )
+            assert distribution[dealer] == 1
+
+    def test_dealer_hits_to_stick_range(self):
+        distribution = dealer_outcome_distribution(dummy_dealer_stick_policy, 5, 10)
+        assert np.allclose(distribution[1:17], 0)
+        assert distribution[0] > 0
+
+
+class TestDealerPhase:
+    def test_sample_matches_distribution(self):
+        N = 100000
+        state = {"dealer": 5, "player": 18, "reward": None}
+        rewards = [
+            sample_dealer_phase(state, dummy_dealer_stick_policy, 18)["reward"]
+            for _ in range(N)
+        ]
+        expected = expected_dealer_phase(state, dummy_dealer_stick_policy, 18)
+
+        assert abs(np.mean(rewards) - expected["reward"]) < 0.01
+        assert expected["reward"] == dealer_stick_rewards(18)[5 - 1]
+
+    def test_playout_with_dealer_phase(self):
+        N = 50000
+        rewards = {}
+        for dealer_phase in [None, sample_dealer_phase, expected_dealer_phase]:
+            rewards[dealer_phase] = []
+            for _ in range(N):
+                player_sequence, dealer_sequence = playout(dealer_phase=dealer_phase)
+                rewards[dealer_phase].append(player_sequence[-1][-1])
+
+                if dealer_phase is not None:
+                    assert dealer_sequence == []
+
+        mean = np.mean(rewards[None])
+        assert abs(np.mean(rewards[sample_dealer_phase]) - mean) < 0.02
+        assert abs(np.mean(rewards[expected_dealer_phase]) - mean) < 0.02
+        assert np.var(rewards[expected_dealer_phase]) < np.var(rewards[None])
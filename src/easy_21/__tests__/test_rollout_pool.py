@@ -0,0 +1,80 @@
+import numpy as np
+
+from src.easy_21.rollout_pool import RolloutPool, rollout_worker
+from src.easy_21.game import (
+    PLAYER_KEY_ENCODER,
+    dummy_player_stick_policy_batch,
+    dummy_dealer_stick_policy_batch,
+)
+from src.lib.policy import GreedyTablePolicy
+
+
+def test_rollout_worker_reproducible():
+    seed_sequence = np.random.SeedSequence(0)
+    batches = [
+        rollout_worker(
+            50,
+            seed_sequence,
+            dummy_player_stick_policy_batch,
+            dummy_dealer_stick_policy_batch,
+            "full",
+        )
+        for _ in range(2)
+    ]
+    for key in ["state_keys", "action_indices", "rewards", "lengths"]:
+        assert np.array_equal(batches[0][0][key], batches[1][0][key])
+        assert np.array_equal(batches[0][1][key], batches[1][1][key])
+
+
+class TestRolloutPool:
+    def test_reproducible_regardless_of_processes(self):
+        batches = []
+        for processes in [1, 2]:
+            with RolloutPool(processes, seed=0, chunks=4) as pool:
+                batches.append(pool.playout_batch(101))
+
+        ((player_a, dealer_a), (player_b, dealer_b)) = batches
+        assert len(player_a["lengths"]) == 101
+        for key in ["state_keys", "action_indices", "rewards", "lengths"]:
+            assert np.array_equal(player_a[key], player_b[key])
+            assert np.array_equal(dealer_a[key], dealer_b[key])
+
+    def test_independent_streams(self):
+        with RolloutPool(2, seed=0, chunks=2) as pool:
+            (player_batch, _) = pool.playout_batch(200)
+            (next_player_batch, _) = pool.playout_batch(200)
+
+        state_keys = player_batch["state_keys"][:, 0]
+        assert not np.array_equal(state_keys[:100], state_keys[100:])
+        assert not np.array_equal(state_keys, next_player_batch["state_keys"][:, 0])
+
+    def test_greedy_table_policy_snapshot(self):
+        # stick at player >= 15, no exploration
+        greedy_actions = np.zeros(PLAYER_KEY_ENCODER.size // 2, dtype=int)
+        for (dealer, player) in PLAYER_KEY_ENCODER.state_ids:
+            if player >= 15:
+                state_id = PLAYER_KEY_ENCODER.encode_state((dealer, player))
+                greedy_actions[state_id // 2] = 1
+        policy = GreedyTablePolicy(PLAYER_KEY_ENCODER, greedy_actions)
+
+        with RolloutPool(2, seed=0) as pool:
+            (player_batch, _) = pool.playout_batch(100, player_policy=policy)
+
+        in_episode = player_batch["action_indices"] >= 0
+        players = player_batch["state_keys"][in_episode][:, 1]
+        assert np.array_equal(
+            player_batch["action_indices"][in_episode], players >= 15
+        )
+
+    def test_greedy_table_policy_rejects_blind_observability(self):
+        greedy_actions = np.zeros(PLAYER_KEY_ENCODER.size // 2, dtype=int)
+        policy = GreedyTablePolicy(PLAYER_KEY_ENCODER, greedy_actions)
+
+        with RolloutPool(1, seed=0) as pool:
+            try:
+                pool.playout_batch(
+                    10, player_policy=policy, observability_level="blind"
+                )
+                assert False
+            except ValueError as error:
+                assert "blind" in str(error)
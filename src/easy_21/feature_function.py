@@ -1,5 +1,15 @@
+from functools import lru_cache
+
+from src.lib.feature_cache import FeatureCache
+
 from .game import ACTIONS, PLAYER_STATES
 
+PLAYER_STATE_ACTIONS = [
+    (dealer, player, action_index)
+    for (dealer, player) in PLAYER_STATES
+    for action_index in range(len(ACTIONS))
+]
+
 
 def numeric_feature(state_action):
     (dealer, player, action_index) = state_action
@@ -65,3 +75,61 @@ def table_lookup(state_action):
         for (d, p) in PLAYER_STATES
     ]
     return state_table
+
+
+#
+# sparse feature functions
+# returning the active indices of the binary features above
+#
+def sparse_feature(feature_size):
+    """
+    mark a feature function as sparse with its feature_size,
+    for ValueApproximator to run in the sparse mode
+    """
+
+    def decorator(feature_function):
+        feature_function.feature_size = feature_size
+        return feature_function
+
+    return decorator
+
+
+@sparse_feature(3 + 6 + len(ACTIONS))
+def overlapped_binary_active(state_action):
+    (dealer, player, action_index) = state_action
+
+    dealer_indices = [i for i in range(3) if i * 3 + 1 <= dealer < i * 3 + 5]
+    player_indices = [3 + i for i in range(6) if i * 3 + 1 <= player < i * 3 + 7]
+
+    return [*dealer_indices, *player_indices, 3 + 6 + action_index]
+
+
+@sparse_feature(10 + 21 + len(ACTIONS))
+def full_binary_active(state_action):
+    (dealer, player, action_index) = state_action
+
+    # only the features in range, as in full_binary_feature,
+    # e.g. no dealer feature for the dealer 0 of "blind" observability
+    dealer_indices = [dealer - 1] if 1 <= dealer <= 10 else []
+    player_indices = [10 + player - 1] if 1 <= player <= 21 else []
+
+    return [*dealer_indices, *player_indices, 10 + 21 + action_index]
+
+
+@sparse_feature(len(ACTIONS) * len(PLAYER_STATES))
+def table_lookup_active(state_action):
+    (dealer, player, action_index) = state_action
+
+    if not (1 <= dealer <= 10 and 1 <= player <= 21):
+        return []
+    # the same order as table_lookup, PLAYER_STATES by dealer then player
+    return [action_index * len(PLAYER_STATES) + (dealer - 1) * 21 + player - 1]
+
+
+@lru_cache(maxsize=None)
+def feature_cache(feature_function):
+    """
+    the feature_function evaluated once over PLAYER_STATE_ACTIONS,
+    to be used as the input_parser of a value store
+    """
+    return FeatureCache(feature_function, PLAYER_STATE_ACTIONS)
@@ -1,16 +1,22 @@
 # %%
 import math
+import numpy as np
 
 from random import random
 
+from src.lib.key_encoder import KeyEncoder
+
 ACTIONS = ["hit", "stick"]
 STATE_LABELS = ["dealer", "player"]
 
 PLAYER_STATES = [(dealer, player) for dealer in range(1, 11) for player in range(1, 22)]
 DEALER_STATES = [(dealer, player) for dealer in range(1, 22) for player in range(1, 22)]
 
-PLAYER_INFO = [ACTIONS, STATE_LABELS, PLAYER_STATES]
-DEALER_INFO = [ACTIONS, STATE_LABELS, DEALER_STATES]
+PLAYER_KEY_ENCODER = KeyEncoder(ACTIONS, PLAYER_STATES)
+DEALER_KEY_ENCODER = KeyEncoder(ACTIONS, DEALER_STATES)
+
+PLAYER_INFO = [ACTIONS, STATE_LABELS, PLAYER_STATES, PLAYER_KEY_ENCODER]
+DEALER_INFO = [ACTIONS, STATE_LABELS, DEALER_STATES, DEALER_KEY_ENCODER]
 
 
 def sample(adding_only=False):
@@ -20,6 +26,13 @@ def sample(adding_only=False):
     return value if adding_only else change
 
 
+def sample_batch(rng, size, adding_only=False):
+    value = rng.integers(1, 11, size=size)
+    adding = rng.random(size) * 3 < 2
+    change = np.where(adding, value, -value)
+    return value if adding_only else change
+
+
 def compare(state):
     dealer = state["dealer"]
     player = state["player"]
@@ -77,6 +90,47 @@ def dummy_player_stick_policy(state_key):
     return ACTIONS.index("stick") if stick else ACTIONS.index("hit")
 
 
+def dummy_dealer_stick_policy_batch(state_keys):
+    stick = state_keys[:, 0] >= 17
+
+    return np.where(stick, ACTIONS.index("stick"), ACTIONS.index("hit"))
+
+
+def dummy_player_stick_policy_batch(state_keys):
+    stick = state_keys[:, 1] >= 17
+
+    return np.where(stick, ACTIONS.index("stick"), ACTIONS.index("hit"))
+
+
+def check_observability(observability_level, key_encoders):
+    """
+    blind observations of a dealer or player of 0 are out of the states
+    of a KeyEncoder, rejected up front for the parties with one
+    """
+    if observability_level == "blind" and any(
+        key_encoder is not None for key_encoder in key_encoders
+    ):
+        raise ValueError(
+            '"blind" observability is out of the states of a KeyEncoder, '
+            "use policies and sequences of state_key instead"
+        )
+
+
+def batch_policy(policy):
+    """
+    wrap a policy of state_key -> action_index
+    to be used in playout_batch, one state_key at a time
+    """
+
+    def _batch_policy(state_keys):
+        return np.array(
+            [policy(tuple(state_key)) for state_key in state_keys.tolist()],
+            dtype=int,
+        )
+
+    return _batch_policy
+
+
 # NOT DO: add final flag to the last step in the episode
 # to make experience replay working with TD online
 # this would also requires to break the sequences into sarsa
@@ -89,7 +143,17 @@ def playout(
     dealer_online_learning=lambda x, final=False: x,
     dealer_offline_learning=lambda x: x,
     observability_level="full",
+    dealer_phase=None,
+    player_key_encoder=None,
+    dealer_key_encoder=None,
 ):
+    """
+    with a KeyEncoder of a party, e.g. PLAYER_KEY_ENCODER,
+    its policy takes and its sequence carries state ids instead of state_key,
+    the observed states need to be in the states of the encoder
+    """
+    check_observability(observability_level, [player_key_encoder, dealer_key_encoder])
+
     player_sequence = []
     dealer_sequence = []
 
@@ -110,10 +174,14 @@ def playout(
             "blind": {"dealer": 0, "player": state["player"]},
         }[observability_level]
 
-        player_action_index = player_policy(in_key(player_observed))
+        player_key = in_key(player_observed)
+        if player_key_encoder is not None:
+            player_key = player_key_encoder.encode_state(player_key)
+
+        player_action_index = player_policy(player_key)
 
         immediate_reward = 0
-        time_step = [in_key(player_observed), player_action_index, immediate_reward]
+        time_step = [player_key, player_action_index, immediate_reward]
         player_sequence.append(time_step)
 
         player_stick = player_action_index == ACTIONS.index("stick")
@@ -123,6 +191,18 @@ def playout(
 
         state = step(state, player_stick)
 
+    # dealer_phase(state, dealer_policy, observed_player) resolves
+    # the dealer phase in one go, e.g. from a table of dealer outcomes
+    # returning the final state, with no dealer sequence to learn
+    if dealer_phase is not None and state["reward"] is None:
+        observed_player = {
+            "full": state["player"],
+            "only_initial": player_init,
+            "blind": 0,
+        }[observability_level]
+
+        state = dealer_phase(state, dealer_policy, observed_player)
+
     while state["reward"] is None:
         # see player part
         dealer_online_learning(dealer_sequence)
@@ -135,14 +215,14 @@ def playout(
             "blind": {"dealer": state["dealer"], "player": 0},
         }[observability_level]
 
-        dealer_action_index = dealer_policy(in_key(dealer_observed))
+        dealer_key = in_key(dealer_observed)
+        if dealer_key_encoder is not None:
+            dealer_key = dealer_key_encoder.encode_state(dealer_key)
+
+        dealer_action_index = dealer_policy(dealer_key)
 
         immediate_reward = 0
-        time_step = [
-            in_key(dealer_observed),
-            dealer_action_index,
-            immediate_reward,
-        ]
+        time_step = [dealer_key, dealer_action_index, immediate_reward]
         dealer_sequence.append(time_step)
 
         dealer_stick = dealer_action_index == ACTIONS.index("stick")
@@ -162,3 +242,203 @@ def playout(
         dealer_offline_learning(dealer_sequence)
 
     return player_sequence, dealer_sequence
+
+
+def observe_batch(party, dealer, player, player_init, observability_level):
+    if party == "player":
+        observed = {
+            "full": (dealer, player),
+            "only_initial": (dealer, player),
+            "blind": (np.zeros_like(dealer), player),
+        }[observability_level]
+    else:
+        observed = {
+            "full": (dealer, player),
+            "only_initial": (dealer, player_init),
+            "blind": (dealer, np.zeros_like(player)),
+        }[observability_level]
+
+    return np.stack(observed, axis=-1)
+
+
+def stack_steps(steps, size, rewards):
+    """
+    scatter the lockstep (game_indices, state_keys, action_indices)
+    of the games still active at each step into padded arrays
+    of shape (N, T, ...), with the final reward assigned
+    to the last step of each game
+
+    padded steps after the length of a game have
+    state_keys of 0 and action_indices of -1
+    """
+    T = len(steps)
+
+    state_keys = np.zeros((size, T, 2), dtype=np.int32)
+    action_indices = np.full((size, T), -1, dtype=np.int32)
+    step_rewards = np.zeros((size, T))
+    lengths = np.zeros(size, dtype=int)
+
+    if T > 0:
+        game_indices = np.concatenate([indices for (indices, _, _) in steps])
+        time_steps = np.concatenate(
+            [np.full(len(indices), t) for t, (indices, _, _) in enumerate(steps)]
+        )
+        flat_indices = game_indices * T + time_steps
+
+        state_keys.reshape(-1, 2)[flat_indices] = np.concatenate(
+            [observed for (_, observed, _) in steps]
+        )
+        action_indices.reshape(-1)[flat_indices] = np.concatenate(
+            [action_index for (_, _, action_index) in steps]
+        )
+        lengths = np.bincount(game_indices, minlength=size)
+
+    played = lengths > 0
+    step_rewards[played, lengths[played] - 1] = rewards[played]
+
+    return {
+        "state_keys": state_keys,
+        "action_indices": action_indices,
+        "rewards": step_rewards,
+        "lengths": lengths,
+    }
+
+
+def playout_batch(
+    size,
+    player_policy=dummy_player_stick_policy_batch,
+    dealer_policy=dummy_dealer_stick_policy_batch,
+    observability_level="full",
+    rng=None,
+):
+    """playout_batch
+
+    Play N games in lockstep, the player phase of all games
+    first, then the dealer phase of the games not busted,
+    only the games still active are stepped at each time step
+
+    Policies here take state_keys in an array of shape (n, 2)
+    and return the action_indices in an array of shape (n,),
+    use batch_policy() to wrap a policy of a single state_key,
+    or a GreedyTablePolicy of a KeyEncoder, unless observability is "blind"
+
+    Returns:
+      player_batch, dealer_batch -- episodes in padded arrays
+        state_keys (N, T, 2), action_indices (N, T), rewards (N, T)
+        and lengths (N,), use unbatch() to get the playout() sequences
+    """
+    check_observability(
+        observability_level,
+        [
+            getattr(policy, "key_encoder", None)
+            for policy in [player_policy, dealer_policy]
+        ],
+    )
+
+    rng = np.random.default_rng() if rng is None else rng
+
+    dealer = sample_batch(rng, size, adding_only=True)
+    player = sample_batch(rng, size, adding_only=True)
+    player_init = player.copy()
+    reward = np.zeros(size)
+
+    hit_index = ACTIONS.index("hit")
+
+    player_steps = []
+    # indices of the games still active
+    active = np.arange(size)
+
+    while active.size > 0:
+        player_observed = observe_batch(
+            "player",
+            dealer[active],
+            player[active],
+            player_init[active],
+            observability_level,
+        )
+        player_action_index = player_policy(player_observed)
+        player_steps.append((active, player_observed, player_action_index))
+
+        hitting = active[player_action_index == hit_index]
+        player[hitting] += sample_batch(rng, hitting.size)
+
+        busted = (player[hitting] > 21) | (player[hitting] < 1)
+        reward[hitting[busted]] = -1
+
+        active = hitting[~busted]
+
+    dealer_steps = []
+    # if player busted, dealer will have no move
+    active = np.flatnonzero(reward == 0)
+
+    while active.size > 0:
+        dealer_observed = observe_batch(
+            "dealer",
+            dealer[active],
+            player[active],
+            player_init[active],
+            observability_level,
+        )
+        dealer_action_index = dealer_policy(dealer_observed)
+        dealer_steps.append((active, dealer_observed, dealer_action_index))
+
+        dealer_hit = dealer_action_index == hit_index
+
+        sticking = active[~dealer_hit]
+        reward[sticking] = np.sign(player[sticking] - dealer[sticking])
+
+        hitting = active[dealer_hit]
+        dealer[hitting] += sample_batch(rng, hitting.size)
+
+        busted = (dealer[hitting] > 21) | (dealer[hitting] < 1)
+        reward[hitting[busted]] = 1
+
+        active = hitting[~busted]
+
+    player_batch = stack_steps(player_steps, size, reward)
+    dealer_batch = stack_steps(dealer_steps, size, -reward)
+
+    return player_batch, dealer_batch
+
+
+def concatenate_batches(episode_batches):
+    """
+    concatenate padded episodes from playout_batch()
+    padding all of them to the longest T
+    """
+    T = max([batch["rewards"].shape[1] for batch in episode_batches])
+
+    def pad(array, value):
+        width = [(0, 0), (0, T - array.shape[1])] + [(0, 0)] * (array.ndim - 2)
+        return np.pad(array, width, constant_values=value)
+
+    return {
+        "state_keys": np.concatenate(
+            [pad(batch["state_keys"], 0) for batch in episode_batches]
+        ),
+        "action_indices": np.concatenate(
+            [pad(batch["action_indices"], -1) for batch in episode_batches]
+        ),
+        "rewards": np.concatenate(
+            [pad(batch["rewards"], 0) for batch in episode_batches]
+        ),
+        "lengths": np.concatenate([batch["lengths"] for batch in episode_batches]),
+    }
+
+
+def unbatch(episode_batch):
+    """
+    convert padded episodes from playout_batch()
+    to the list of sequences as from playout()
+    """
+    state_keys = episode_batch["state_keys"].tolist()
+    action_indices = episode_batch["action_indices"].tolist()
+    rewards = episode_batch["rewards"].tolist()
+
+    return [
+        [
+            [tuple(state_keys[n][t]), action_indices[n][t], rewards[n][t]]
+            for t in range(length)
+        ]
+        for n, length in enumerate(episode_batch["lengths"].tolist())
+    ]
@@ -0,0 +1,207 @@
+import numpy as np
+
+from functools import lru_cache
+from inspect import ismethod
+from random import random
+
+from src.lib.value_map import ValueMap
+from src.lib.dynamic_programming import (
+    build_model,
+    value_iteration,
+    policy_iteration,
+)
+
+from .game import ACTIONS, PLAYER_STATES, compare, dummy_dealer_stick_policy
+
+# the known distribution of sample(),
+# value in [1, 10] uniformly, adding with 2/3 chance
+CARD_DISTRIBUTION = [
+    *[(value, 1 / 10 * 2 / 3) for value in range(1, 11)],
+    *[(-value, 1 / 10 * 1 / 3) for value in range(1, 11)],
+]
+
+# the memoized tables of the observed player sums in [0, 21]
+# of a few dealer policies, keyed on the policy, the older ones evicted
+# instead of keeping every policy created alive
+POLICY_CACHE_SIZE = 4 * 22
+
+
+@lru_cache(maxsize=POLICY_CACHE_SIZE)
+def dealer_outcome_table(dealer_policy, player):
+    """
+    the distribution of the final dealer outcome, for a fixed
+    deterministic dealer_policy seeing the player sum as player
+
+    memoized by (dealer_policy, player), as an array of shape (21, 22)
+    - rows indexed by the dealer sum - 1, for dealer sum in [1, 21]
+    - column 0 for going bust, column n for sticking at n
+
+    it solves the absorbing chain of the dealer phase
+    O(dealer) = one-hot(dealer) if dealer sticks
+    O(dealer) = sum_card p(card) O(dealer + card) if dealer hits
+
+    As memoized by the policy, dealer_policy needs to be a fixed
+    deterministic function of the (dealer, player) tuple, e.g.
+    dummy_dealer_stick_policy. Bound methods, e.g. e_greedy_policy
+    of an agent, whose draws and learnt values would stay in the memo,
+    and policies of a KeyEncoder, acting on state ids, are rejected
+    """
+    if ismethod(dealer_policy) or hasattr(dealer_policy, "key_encoder"):
+        raise ValueError(
+            "dealer_policy needs to be a deterministic function of state_key"
+        )
+
+    A = np.eye(21)
+    b = np.zeros((21, 22))
+
+    for dealer in range(1, 22):
+        i = dealer - 1
+
+        if dealer_policy((dealer, player)) == ACTIONS.index("stick"):
+            b[i, dealer] = 1
+            continue
+
+        for (change, probability) in CARD_DISTRIBUTION:
+            updated = dealer + change
+            if updated > 21 or updated < 1:
+                b[i, 0] += probability
+            else:
+                A[i, updated - 1] -= probability
+
+    table = np.linalg.solve(A, b)
+    table.flags.writeable = False
+
+    return table
+
+
+@lru_cache(maxsize=POLICY_CACHE_SIZE)
+def dealer_outcome_cumulative(dealer_policy, player):
+    cumulative = np.cumsum(dealer_outcome_table(dealer_policy, player), axis=1)
+    cumulative /= cumulative[:, -1:]
+    cumulative.flags.writeable = False
+
+    return cumulative
+
+
+def dealer_outcome_distribution(dealer_policy, dealer, player):
+    """
+    the distribution of the final dealer outcome from the dealer card,
+    index 0 for going bust, index n for sticking at n
+    """
+    return dealer_outcome_table(dealer_policy, player)[dealer - 1]
+
+
+@lru_cache(maxsize=22)
+def outcome_rewards(player):
+    """
+    the player rewards of the dealer outcomes, as indexed in dealer_outcome_table
+    going bust gives the player a reward of 1
+    """
+    rewards = np.array(
+        [1, *[compare({"dealer": dealer, "player": player}) for dealer in range(1, 22)]]
+    )
+    rewards.flags.writeable = False
+
+    return rewards
+
+
+def dealer_stick_rewards(player, dealer_policy=dummy_dealer_stick_policy):
+    """
+    the expected reward of the player sticking at player sum
+    when the dealer has the sum in [1, 21], as an array indexed by dealer - 1
+    """
+    return dealer_outcome_table(dealer_policy, player) @ outcome_rewards(player)
+
+
+def sample_dealer_phase(state, dealer_policy, observed_player):
+    """
+    resolve the dealer phase of playout() by one sample
+    from the memoized dealer_outcome_table
+    """
+    cumulative = dealer_outcome_cumulative(dealer_policy, observed_player)
+    outcome = int(
+        np.searchsorted(cumulative[state["dealer"] - 1], random(), side="right")
+    )
+
+    if outcome == 0:
+        return {**state, "reward": 1}
+
+    updated = {**state, "dealer": outcome}
+    return {**updated, "reward": compare(updated)}
+
+
+def expected_dealer_phase(state, dealer_policy, observed_player):
+    """
+    resolve the dealer phase of playout() by the exact expected reward
+    from the memoized dealer_outcome_table, removing the sampling variance
+    """
+    distribution = dealer_outcome_distribution(
+        dealer_policy, state["dealer"], observed_player
+    )
+    reward = distribution @ outcome_rewards(state["player"])
+
+    return {**state, "reward": float(reward)}
+
+
+def player_transitions(dealer_policy=dummy_dealer_stick_policy):
+    """
+    the model of the player MDP on PLAYER_STATES
+    given the dealer_policy, for build_model()
+    """
+    stick_rewards = {
+        player: dealer_stick_rewards(player, dealer_policy) for player in range(1, 22)
+    }
+
+    def transitions(state_key, action_index):
+        (dealer, player) = state_key
+
+        if action_index == ACTIONS.index("stick"):
+            return [(1, None, stick_rewards[player][dealer - 1])]
+
+        outcomes = []
+        for (change, probability) in CARD_DISTRIBUTION:
+            updated = player + change
+            if updated > 21 or updated < 1:
+                outcomes.append((probability, None, -1))
+            else:
+                outcomes.append((probability, (dealer, updated), 0))
+
+        return outcomes
+
+    return transitions
+
+
+def solve_player_optimal(
+    dealer_policy=dummy_dealer_stick_policy,
+    method="value_iteration",
+    name="player",
+):
+    """solve_player_optimal
+
+    Model-based planning of the exact optimal values
+    of the player, with the known card distribution and dealer_policy
+
+    Returns:
+      action_value_store -- ValueMap of Q*(dealer, player, action_index)
+      state_value_store -- ValueMap of V*(dealer, player)
+    """
+    P, R = build_model(PLAYER_STATES, ACTIONS, player_transitions(dealer_policy))
+
+    solve = {
+        "value_iteration": value_iteration,
+        "policy_iteration": policy_iteration,
+    }[method]
+    action_values, state_values = solve(P, R)
+
+    action_value_store = ValueMap(f"{name}_optimal_action_values")
+    state_value_store = ValueMap(f"{name}_optimal_state_values")
+
+    for s, state_key in enumerate(PLAYER_STATES):
+        state_value_store.set(state_key, float(state_values[s]))
+        for action_index in range(len(ACTIONS)):
+            action_value_store.set(
+                (*state_key, action_index),
+                float(action_values[s, action_index]),
+            )
+
+    return action_value_store, state_value_store
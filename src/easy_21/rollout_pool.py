@@ -0,0 +1,112 @@
+import os
+import numpy as np
+
+from multiprocessing import Pool
+
+from .game import (
+    playout_batch,
+    check_observability,
+    concatenate_batches,
+    dummy_player_stick_policy_batch,
+    dummy_dealer_stick_policy_batch,
+)
+
+
+def rollout_worker(
+    size, seed_sequence, player_policy, dealer_policy, observability_level
+):
+    """
+    playout_batch of size episodes with the rng of seed_sequence
+    shared by the policies with exploration
+    """
+    rng = np.random.default_rng(seed_sequence)
+
+    (player_policy, dealer_policy) = [
+        policy.with_rng(rng) if hasattr(policy, "with_rng") else policy
+        for policy in [player_policy, dealer_policy]
+    ]
+
+    return playout_batch(
+        size,
+        player_policy=player_policy,
+        dealer_policy=dealer_policy,
+        observability_level=observability_level,
+        rng=rng,
+    )
+
+
+class RolloutPool:
+    """RolloutPool
+
+    A pool of worker processes to sample episodes with playout_batch()
+
+    Every chunk of episodes is sampled with an independent rng stream
+    spawned from the SeedSequence of seed, so the episodes are reproducible
+    from the seed and the number of chunks, regardless of the processes
+
+    Policies are pickled to the workers as a snapshot, e.g.
+    a GreedyTablePolicy of the action_value_store from greedy_table_policy(),
+    or a module-level function of state_keys arrays
+
+    Workers return the padded arrays of playout_batch(), concatenated
+    in the order of chunks
+    """
+
+    def __init__(self, processes=None, seed=None, chunks=None):
+        self.processes = os.cpu_count() if processes is None else processes
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.pool = Pool(self.processes)
+        self.chunks = self.processes if chunks is None else chunks
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def playout_batch(
+        self,
+        size,
+        player_policy=dummy_player_stick_policy_batch,
+        dealer_policy=dummy_dealer_stick_policy_batch,
+        observability_level="full",
+    ):
+        """
+        the same as playout_batch(), with size episodes split into chunks
+        """
+        # before sending the policies to the workers
+        check_observability(
+            observability_level,
+            [
+                getattr(policy, "key_encoder", None)
+                for policy in [player_policy, dealer_policy]
+            ],
+        )
+
+        chunk_sizes = [
+            len(chunk) for chunk in np.array_split(np.arange(size), self.chunks)
+        ]
+        seed_sequences = self.seed_sequence.spawn(self.chunks)
+
+        batches = self.pool.starmap(
+            rollout_worker,
+            [
+                (
+                    chunk_size,
+                    seed_sequence,
+                    player_policy,
+                    dealer_policy,
+                    observability_level,
+                )
+                for (chunk_size, seed_sequence) in zip(chunk_sizes, seed_sequences)
+            ],
+        )
+
+        player_batch = concatenate_batches([player for (player, _) in batches])
+        dealer_batch = concatenate_batches([dealer for (_, dealer) in batches])
+
+        return player_batch, dealer_batch
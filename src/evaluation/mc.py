@@ -1,3 +1,8 @@
+import numpy as np
+
+from src.lib.key_encoder import action_key, action_keys
+
+
 def monte_carlo_evaluation(episode, discount=1):
     """monte_carlo_evaluation
 
@@ -25,22 +30,57 @@ def monte_carlo_evaluation(episode, discount=1):
     """
     T = len(episode)
 
-    evaluations = []
+    evaluations = [None] * T
 
-    for t in range(T):
+    # accumulate the discounted total future return G_t backwards
+    # G_t = immediate_reward_t + discount * G_{t+1}
+    sample_return = 0
+    for t in reversed(range(T)):
         [state_key, action_index, immediate_reward] = episode[t]
-        sample_key = (*state_key, action_index)
+        sample_key = action_key(state_key, action_index)
 
-        # the undiscounted immediate_reward
-        discount_t_n = 1
-        sample_return = immediate_reward
-        # for the next [1, T-1-t+1) steps
-        # calculate the discounted total future return G_t
-        for n in range(1, T - t):
-            reward_t_n = episode[t + n][2]
-            discount_t_n *= discount
-            sample_return += discount_t_n * reward_t_n
+        sample_return = immediate_reward + discount * sample_return
 
-        evaluations.append([sample_key, sample_return])
+        evaluations[t] = [sample_key, sample_return]
 
     return evaluations
+
+
+def monte_carlo_evaluation_batch(episode_batch, discount=1):
+    """monte_carlo_evaluation_batch
+
+    monte_carlo_evaluation of padded episodes from playout_batch()
+    accumulating the returns of all episodes backwards together
+
+    Arguments:
+      episode_batch {dict} -- state_keys (N, T, k), action_indices (N, T),
+        rewards (N, T), lengths (N,)
+
+    Keyword Arguments:
+      discount {number} -- discount factor for future rewards (default: {1})
+
+    Returns:
+      sample_keys -- (state_key, action_index) of all steps in shape (M, k + 1),
+        or state-action ids in shape (M,) for state ids
+      sample_returns -- G_t of all steps in shape (M,)
+    """
+    rewards = episode_batch["rewards"]
+    (N, T) = rewards.shape
+
+    returns = np.zeros((N, T))
+
+    # padded steps have no reward, so returns are not affected
+    sample_return = np.zeros(N)
+    for t in reversed(range(T)):
+        sample_return = rewards[:, t] + discount * sample_return
+        returns[:, t] = sample_return
+
+    in_episode = np.arange(T) < episode_batch["lengths"][:, None]
+
+    sample_keys = action_keys(
+        episode_batch["state_keys"][in_episode],
+        episode_batch["action_indices"][in_episode],
+    )
+    sample_returns = returns[in_episode]
+
+    return sample_keys, sample_returns
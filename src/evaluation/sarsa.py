@@ -1,3 +1,4 @@
+from src.lib.key_encoder import action_key
 from src.lib.policy import greedy_policy
 
 
@@ -29,22 +30,22 @@ def sarsa_evaluation(
     if len(sequence) > 1:
         [state_key, action_index, reward] = sequence[-2]
         [new_state_key, new_action_index, _] = sequence[-1]
-        action_key = (*state_key, action_index)
-        new_action_key = (*new_state_key, new_action_index)
+        state_action_key = action_key(state_key, action_index)
+        new_state_action_key = action_key(new_state_key, new_action_index)
         possible_remaining_value = (
             greedy_policy(new_state_key, ACTIONS, action_value_store)[1]
             if off_policy
-            else action_value_store.get(new_action_key)
+            else action_value_store.get(new_state_action_key)
         )
         td_return = reward + discount * possible_remaining_value
 
-        evaluations.append([action_key, td_return])
+        evaluations.append([state_action_key, td_return])
     # if the step is final, an extra learning is done
     # with the final reward, no td_return here
     if final:
         [state_key, action_index, reward] = sequence[-1]
-        action_key = (*state_key, action_index)
+        state_action_key = action_key(state_key, action_index)
         td_return = reward
-        evaluations.append([action_key, td_return])
+        evaluations.append([state_action_key, td_return])
 
     return evaluations
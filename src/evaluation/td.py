@@ -1,3 +1,4 @@
+from src.lib.key_encoder import action_key
 from src.lib.policy import greedy_policy
 
 
@@ -14,7 +15,7 @@ def temporal_difference_evaluation(
 
     for t in range(T):
         [state_key, action_index, immediate_reward] = episode[t]
-        state_action_key = (*state_key, action_index)
+        state_action_key = action_key(state_key, action_index)
 
         total_reward = immediate_reward
         td_return = total_reward
@@ -25,7 +26,9 @@ def temporal_difference_evaluation(
             possible_remaining_value = (
                 greedy_policy(state_key_next, ACTIONS, action_value_store)[1]
                 if off_policy
-                else action_value_store.get((*state_key_next, action_index_next))
+                else action_value_store.get(
+                    action_key(state_key_next, action_index_next)
+                )
             )
             td_return += discount * possible_remaining_value
 
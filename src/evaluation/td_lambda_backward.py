@@ -1,9 +1,9 @@
+from src.lib.key_encoder import action_key
 from src.lib.policy import greedy_policy
 
 # OPTIONAL: TD(lambda) is not very necessary as performance not predictable
 # TODO: make backward_td_lambda(0) equivalent to td_learning
 # TODO: make step_size more testable
-# TODO: support offline, accumulate the td_target in eligibility_trace
 def backward_td_lambda_learning_online(
     sequence,
     action_eligibility_trace,
@@ -39,13 +39,17 @@ def backward_td_lambda_learning_online(
     in other situations.
     """
 
+    # a new episode starts with no eligibility
+    if len(sequence) == 1:
+        action_eligibility_trace.reset()
+
     # unless final step, it needs 2 steps to form SARSA
     # to have the estimated return of the remaining trajectory
     if len(sequence) > 1:
         [state_key, action_index, immediate_reward] = sequence[-2]
-        state_action_key = (*state_key, action_index)
+        state_action_key = action_key(state_key, action_index)
         [new_state_key, new_action_index, _] = sequence[-1]
-        new_state_action_key = (*new_state_key, new_action_index)
+        new_state_action_key = action_key(new_state_key, new_action_index)
 
         action_eligibility_trace.update(
             state_action_key, discount=discount, lambda_value=lambda_value
@@ -65,7 +69,7 @@ def backward_td_lambda_learning_online(
     # eligibility_trace is updated relative to the td_target for learning
     if final:
         [state_key, action_index, reward] = sequence[-1]
-        state_action_key = (*state_key, action_index)
+        state_action_key = action_key(state_key, action_index)
 
         action_eligibility_trace.update(
             state_action_key, discount=discount, lambda_value=lambda_value
@@ -76,3 +80,58 @@ def backward_td_lambda_learning_online(
             action_eligibility_trace,
             td_target,
         )
+
+
+def backward_td_lambda_evaluation_offline(
+    episode,
+    ACTIONS,
+    action_value_store,
+    discount=1,
+    lambda_value=0,
+    off_policy=False,
+):
+    """backward_td_lambda_evaluation_offline
+
+    Offline backward TD(lambda), the td_errors of all steps are accumulated
+    with the values fixed during the episode and learnt at the end together
+
+    The eligibility of a visit at step i decays as (discount * lambda_value)^(t-i)
+    so the td_errors it accumulates over the episode are
+    D_i = sum_{t>=i} (discount * lambda_value)^(t-i) * td_error_t
+    computed for all visits in one backward pass, D_i = td_error_i + decay * D_{i+1}
+
+    The accumulated td_errors of a key are the sum of D_i of its visits,
+    learnt as the samples q(s_i, a_i) + D_i of each visit in one batch_learn,
+    equivalent to the offline forward view of td_lambda_forward_evaluation
+    when on-policy; off-policy, the td_targets take the greedy values
+    as in backward_td_lambda_learning_online
+
+    Returns:
+      evaluations -- [state_action_key, q(s_i, a_i) + D_i] of each step
+    """
+    T = len(episode)
+
+    evaluations = [None] * T
+
+    decay = discount * lambda_value
+    accumulated_td_error = 0
+    possible_remaining_value = 0
+    for t in reversed(range(T)):
+        [state_key, action_index, reward] = episode[t]
+        state_action_key = action_key(state_key, action_index)
+
+        value = action_value_store.get(state_action_key)
+        td_target = reward + discount * possible_remaining_value
+        td_error = td_target - value
+
+        accumulated_td_error = td_error + decay * accumulated_td_error
+        evaluations[t] = [state_action_key, value + accumulated_td_error]
+
+        # the estimated value of this step for the td_target of the previous step
+        possible_remaining_value = (
+            greedy_policy(state_key, ACTIONS, action_value_store)[1]
+            if off_policy
+            else value
+        )
+
+    return evaluations
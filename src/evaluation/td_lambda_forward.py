@@ -1,3 +1,6 @@
+import numpy as np
+
+from src.lib.key_encoder import action_key, action_keys
 from src.lib.policy import greedy_policy
 
 
@@ -41,48 +44,200 @@ def td_lambda_forward_evaluation(
 
     T = len(episode)
 
-    evaluations = []
+    evaluations = [None] * T
+
+    # the lambda_return is accumulated backwards recursively
+    # q_t^{lambda} = reward_t + discount * (
+    #   (1 - lambda_value) * q(s_{t+1}, a_{t+1}) + lambda_value * q_{t+1}^{lambda}
+    # )
+    # with q_{T-1}^{lambda} = reward_{T-1} for the final step,
+    # so that each td_return estimation is only looked up once
+    lambda_return = 0
+    for t in reversed(range(T)):
+        [state_key, action_index, reward] = episode[t]
+        state_action_key = action_key(state_key, action_index)
+
+        if t + 1 < T:
+            [state_key_next, action_index_next, _] = episode[t + 1]
+
+            possible_remaining_value = (
+                greedy_policy(state_key_next, ACTIONS, action_value_store)[1]
+                if off_policy
+                else action_value_store.get(
+                    action_key(state_key_next, action_index_next)
+                )
+            )
+            lambda_return = reward + discount * (
+                (1 - lambda_value) * possible_remaining_value
+                + lambda_value * lambda_return
+            )
+        else:
+            lambda_return = reward
 
-    for t in range(T):
-        [state_key, action_index, _] = episode[t]
-        state_action_key = (*state_key, action_index)
+        evaluations[t] = [state_action_key, lambda_return]
 
-        total_reward = 0
-        lambda_return = 0
-        # as n starts from 0, initialise those accumulative value as **-1
-        # using accumulative value here,
-        discount_n = 1 / discount
-        lambda_value_n = 1 / lambda_value
+    return evaluations
 
-        # for the next [0, T-1-t+1) steps
-        for n in range(0, T - t):
-            discount_n *= discount
-            lambda_value_n *= lambda_value
 
-            [state_key_t_n, action_index_t_n, reward_t_n] = episode[t + n]
+def possible_remaining_values_batch(
+    episode_batch, has_next, ACTIONS, action_value_store, off_policy=False
+):
+    """
+    td_return estimation of the next step of all steps of padded episodes
+    with a next step in has_next (N, T), looked up in one query, 0 otherwise
+    """
+    state_keys = episode_batch["state_keys"]
+    action_indices = episode_batch["action_indices"]
+
+    next_state_keys = state_keys[:, 1:][has_next[:, :-1]].tolist()
+    next_action_indices = action_indices[:, 1:][has_next[:, :-1]].tolist()
+
+    possible_remaining_values = np.zeros(has_next.shape)
+    if off_policy:
+        # values of all actions of all next steps in one query, then the max
+        next_action_values = action_value_store.get_many(
+            [
+                action_key(state_key, action_index)
+                for state_key in next_state_keys
+                for action_index in range(len(ACTIONS))
+            ]
+        )
+        possible_remaining_values[has_next] = np.reshape(
+            next_action_values, (-1, len(ACTIONS))
+        ).max(axis=1)
+    else:
+        possible_remaining_values[has_next] = action_value_store.get_many(
+            [
+                action_key(state_key, action_index)
+                for (state_key, action_index) in zip(
+                    next_state_keys, next_action_indices
+                )
+            ]
+        )
 
-            total_reward += discount_n * reward_t_n
-            # initial weight assuming last step with final reward
-            # and accumulate it to the lambda_return
-            lambda_return += lambda_value_n * total_reward
+    return possible_remaining_values
 
-            # if there's a next step, means t_n not final
-            # factor in the td_return for estimation
-            if t + n + 1 < T:
-                [state_key_s_n_1, action_index_s_n_1, _] = episode[t + n + 1]
 
-                possible_remaining_value = (
-                    greedy_policy(state_key_s_n_1, ACTIONS, action_value_store)[1]
-                    if off_policy
-                    else action_value_store.get((*state_key_s_n_1, action_index_s_n_1))
-                )
-                td_return = discount_n * discount * possible_remaining_value
+def td_lambda_forward_evaluation_batch(
+    episode_batch,
+    ACTIONS,
+    action_value_store,
+    discount=1,
+    lambda_value=0,
+    off_policy=False,
+):
+    """td_lambda_forward_evaluation_batch
 
-                # for reward in case it is not final
-                # adjust the weight to (1-lambda_value)(lambda_value ** n)
-                lambda_return -= lambda_value_n * lambda_value * total_reward
-                lambda_return += (1 - lambda_value) * lambda_value_n * td_return
+    td_lambda_forward_evaluation of padded episodes from playout_batch()
+    looking up the td_return estimation of every next step once,
+    and accumulating the lambda_returns of all episodes backwards together
 
-        evaluations.append([state_action_key, lambda_return])
+    Arguments:
+      episode_batch {dict} -- state_keys (N, T, k), action_indices (N, T),
+        rewards (N, T), lengths (N,)
 
-    return evaluations
+    Returns:
+      sample_keys -- (state_key, action_index) of all steps in shape (M, k + 1),
+        or state-action ids in shape (M,) for state ids
+      sample_returns -- q_t^{lambda} of all steps in shape (M,)
+    """
+    state_keys = episode_batch["state_keys"]
+    action_indices = episode_batch["action_indices"]
+    rewards = episode_batch["rewards"]
+    (N, T) = rewards.shape
+
+    in_episode = np.arange(T) < episode_batch["lengths"][:, None]
+    # steps with a next step to estimate the remaining value
+    has_next = np.zeros((N, T), dtype=bool)
+    has_next[:, :-1] = in_episode[:, 1:]
+
+    possible_remaining_values = possible_remaining_values_batch(
+        episode_batch, has_next, ACTIONS, action_value_store, off_policy
+    )
+
+    lambda_returns = np.zeros((N, T))
+
+    # padded steps have no reward and no next step,
+    # the final step of each episode gets its final reward
+    lambda_return = np.zeros(N)
+    for t in reversed(range(T)):
+        lambda_return = rewards[:, t] + discount * np.where(
+            has_next[:, t],
+            (1 - lambda_value) * possible_remaining_values[:, t]
+            + lambda_value * lambda_return,
+            0,
+        )
+        lambda_returns[:, t] = lambda_return
+
+    sample_keys = action_keys(state_keys[in_episode], action_indices[in_episode])
+    sample_returns = lambda_returns[in_episode]
+
+    return sample_keys, sample_returns
+
+
+def td_lambda_forward_evaluation_multi(
+    episode_batch,
+    ACTIONS,
+    action_value_stores,
+    discount=1,
+    lambda_values=(0,),
+    off_policy=False,
+):
+    """td_lambda_forward_evaluation_multi
+
+    td_lambda_forward_evaluation_batch of padded episodes for a vector of
+    lambda_values, with the lambda_returns of all lambda_values
+    and all episodes accumulated backwards together
+
+    Arguments:
+      episode_batch {dict} -- state_keys (N, T, k), action_indices (N, T),
+        rewards (N, T), lengths (N,)
+      action_value_stores {list|ValueStore} -- one store per lambda_value
+        to estimate its td_return, or a store shared by all lambda_values
+
+    Returns:
+      sample_keys -- (state_key, action_index) of all steps in shape (M, k + 1),
+        or state-action ids in shape (M,) for state ids
+      lambda_returns -- q_t^{lambda} in shape (len(lambda_values), M)
+    """
+    state_keys = episode_batch["state_keys"]
+    action_indices = episode_batch["action_indices"]
+    rewards = episode_batch["rewards"]
+    (N, T) = rewards.shape
+
+    lambda_values = np.asarray(lambda_values, dtype=float)[:, None]
+    stores = (
+        action_value_stores
+        if isinstance(action_value_stores, list)
+        else [action_value_stores]
+    )
+
+    in_episode = np.arange(T) < episode_batch["lengths"][:, None]
+    has_next = np.zeros((N, T), dtype=bool)
+    has_next[:, :-1] = in_episode[:, 1:]
+
+    # (len(stores), N, T), broadcast to all lambda_values for a shared store
+    possible_remaining_values = np.stack(
+        [
+            possible_remaining_values_batch(
+                episode_batch, has_next, ACTIONS, store, off_policy
+            )
+            for store in stores
+        ]
+    )
+
+    lambda_returns = np.zeros((len(lambda_values), N, T))
+
+    lambda_return = np.zeros((len(lambda_values), N))
+    for t in reversed(range(T)):
+        lambda_return = rewards[:, t] + discount * np.where(
+            has_next[:, t],
+            (1 - lambda_values) * possible_remaining_values[:, :, t]
+            + lambda_values * lambda_return,
+            0,
+        )
+        lambda_returns[:, :, t] = lambda_return
+
+    sample_keys = action_keys(state_keys[in_episode], action_indices[in_episode])
+
+    return sample_keys, lambda_returns[:, in_episode]
@@ -0,0 +1,68 @@
+import numpy as np
+
+from src.lib.dynamic_programming import (
+    build_model,
+    policy_evaluation,
+    value_iteration,
+    policy_iteration,
+)
+
+# a chain of states [0, 1], action 0 moves right, action 1 quits
+# moving right from state 1 terminates with a reward of 1
+# quitting terminates with a reward of 0.5 at state 0, 0 at state 1
+STATES = [0, 1]
+ACTIONS = ["right", "quit"]
+
+
+def transitions(state_key, action_index):
+    if action_index == 1:
+        return [(1, None, 0.5 if state_key == 0 else 0)]
+    if state_key == 0:
+        return [(0.5, 1, 0), (0.5, None, -1)]
+    return [(1, None, 1)]
+
+
+class TestBuildModel:
+    def test_build_arrays(self):
+        P, R = build_model(STATES, ACTIONS, transitions)
+
+        assert np.allclose(P, [[[0, 0.5], [0, 0]], [[0, 0], [0, 0]]])
+        assert np.allclose(R, [[-0.5, 0.5], [1, 0]])
+
+
+class TestPolicyEvaluation:
+    def test_exact_values(self):
+        P, R = build_model(STATES, ACTIONS, transitions)
+
+        action_values, state_values = policy_evaluation(P, R, np.array([0, 0]))
+
+        assert np.allclose(state_values, [0, 1])
+        assert np.allclose(action_values, [[0, 0.5], [1, 0]])
+
+    def test_discount(self):
+        P, R = build_model(STATES, ACTIONS, transitions)
+
+        _, state_values = policy_evaluation(P, R, np.array([0, 0]), discount=0.5)
+
+        assert np.allclose(state_values, [-0.25, 1])
+
+
+class TestValueIteration:
+    def test_optimal_values(self):
+        P, R = build_model(STATES, ACTIONS, transitions)
+
+        action_values, state_values = value_iteration(P, R)
+
+        assert np.allclose(state_values, [0.5, 1])
+        assert np.allclose(action_values, [[0, 0.5], [1, 0]])
+
+
+class TestPolicyIteration:
+    def test_same_as_value_iteration(self):
+        P, R = build_model(STATES, ACTIONS, transitions)
+
+        action_values, state_values = policy_iteration(P, R)
+        _action_values, _state_values = value_iteration(P, R)
+
+        assert np.allclose(state_values, _state_values)
+        assert np.allclose(action_values, _action_values)
@@ -0,0 +1,75 @@
+import numpy as np
+
+from src.lib.eligibility_trace import EligibilityTrace, ArrayEligibilityTrace
+from src.lib.value_table import ValueTable
+
+KEYS = [(a, b) for a in range(3) for b in range(2)]
+VISITS = [(0, 0), (1, 1), (0, 0), (2, 1), (1, 0), (0, 0), (2, 1), (1, 1)]
+
+
+def eager_trace(visits, factor):
+    data = {}
+    for key in visits:
+        data = {k: v * factor for (k, v) in data.items()}
+        data[key] = data.get(key, 0) + 1
+    return data
+
+
+class TestUpdate:
+    def test_same_as_eager_decay(self):
+        for trace in [
+            EligibilityTrace(threshold=0),
+            ArrayEligibilityTrace(ValueTable("table", KEYS), threshold=0),
+        ]:
+            for key in VISITS:
+                trace.update(key, discount=0.9, lambda_value=0.5)
+
+            expected = eager_trace(VISITS, 0.45)
+            assert list(trace.keys()) == list(expected.keys())
+            for key in expected:
+                assert np.isclose(trace.get(key), expected[key])
+                assert np.isclose(trace.data[key], expected[key])
+
+    def test_renormalize_and_prune(self):
+        for trace in [
+            EligibilityTrace(threshold=0.01),
+            ArrayEligibilityTrace(ValueTable("table", KEYS), threshold=0.01),
+        ]:
+            trace.update((0, 0), lambda_value=0.5)
+            for _ in range(10):
+                trace.update((1, 1), lambda_value=0.5)
+
+            assert trace.scale >= trace.renormalize_scale
+            assert list(trace.keys()) == [(1, 1)]
+            assert trace.get((0, 0)) == 0
+            assert np.isclose(trace.get((1, 1)), 2 - 0.5**9)
+
+    def test_reset_when_decay_to_zero(self):
+        for trace in [
+            EligibilityTrace(),
+            ArrayEligibilityTrace(ValueTable("table", KEYS)),
+        ]:
+            trace.update((0, 0), lambda_value=0)
+            trace.update((1, 1), lambda_value=0)
+            assert trace.data == {(1, 1): 1}
+
+
+def test_value_table_learn_with_array_trace_same_as_each_key():
+    value_table = ValueTable("table", KEYS)
+    expected_table = ValueTable("expected_table", KEYS)
+
+    trace = ArrayEligibilityTrace(value_table)
+    for (key, sample) in zip(VISITS, [1, 0, -1, 2, 0.5, 1, 0, 1]):
+        trace.update(key, discount=0.9, lambda_value=0.5)
+        value_table.learn_with_eligibility_trace(trace, sample)
+        for trace_key in trace.keys():
+            expected_table.learn(
+                trace_key,
+                sample,
+                step_size=lambda count: trace.get(trace_key) / count,
+            )
+
+    for value_key in ["count", "value", "mse"]:
+        assert np.allclose(
+            value_table.arrays[value_key], expected_table.arrays[value_key]
+        )
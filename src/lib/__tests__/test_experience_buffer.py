@@ -0,0 +1,93 @@
+import numpy as np
+
+from src.lib.experience_buffer import ExperienceBuffer
+from src.easy_21.game import playout_batch, unbatch
+
+EPISODES = [
+    [[(1, 2), 0, 0], [(1, 7), 1, 1]],
+    [[(3, 4), 1, -1]],
+    [[(2, 2), 0, 0], [(2, 5), 0, 0], [(2, 9), 1, 0]],
+]
+
+
+class TestAdd:
+    def test_store_steps_in_columns(self):
+        buffer = ExperienceBuffer(10)
+        buffer.extend(EPISODES)
+
+        assert len(buffer) == 3
+        assert buffer.step_count == 6
+        assert buffer.columns["state_keys"][:6].tolist() == [
+            [1, 2],
+            [1, 7],
+            [3, 4],
+            [2, 2],
+            [2, 5],
+            [2, 9],
+        ]
+        assert buffer.columns["action_indices"].dtype == np.int8
+        assert [buffer.sequence(i) for i in range(3)] == EPISODES
+
+    def test_episode_views(self):
+        buffer = ExperienceBuffer(10)
+        buffer.extend(EPISODES)
+
+        episode = buffer.episode(2)
+        assert episode["rewards"].tolist() == [0, 0, 0]
+        assert np.shares_memory(episode["state_keys"], buffer.columns["state_keys"])
+
+    def test_drop_oldest_episodes_over_capacity(self):
+        buffer = ExperienceBuffer(5)
+        buffer.extend(EPISODES)
+        # the third episode doesn't fit after the first two, wraps around
+        assert buffer.sequences() == [EPISODES[2]]
+
+        buffer.add(EPISODES[0])
+        assert buffer.sequences() == [EPISODES[2], EPISODES[0]]
+        assert buffer.step_count == 5
+
+        # full, wraps around and drops the oldest
+        buffer.add(EPISODES[1])
+        assert buffer.sequences() == [EPISODES[0], EPISODES[1]]
+
+        buffer.add(EPISODES[1])
+        assert buffer.sequences() == [EPISODES[0], EPISODES[1], EPISODES[1]]
+
+    def test_episode_over_capacity(self):
+        buffer = ExperienceBuffer(2)
+        try:
+            buffer.add(EPISODES[2])
+            assert False
+        except ValueError:
+            pass
+
+    def test_state_ids(self):
+        buffer = ExperienceBuffer(10, state_shape=())
+        buffer.add([[4, 0, 0], [8, 1, 1]])
+        assert buffer.sequence(0) == [[4, 0, 0], [8, 1, 1]]
+        assert buffer.episode_batch()["state_keys"].tolist() == [[4, 8]]
+
+
+class TestReplay:
+    def test_shuffle_order(self):
+        buffer = ExperienceBuffer(10)
+        buffer.extend(EPISODES)
+        columns = {key: np.copy(column) for (key, column) in buffer.columns.items()}
+
+        buffer.shuffle(np.random.default_rng(0))
+        assert sorted(buffer.order.tolist()) == [0, 1, 2]
+        assert buffer.sequences() == [EPISODES[i] for i in buffer.order]
+        for (key, column) in buffer.columns.items():
+            assert np.array_equal(column, columns[key])
+
+    def test_episode_batch_same_as_playout_batch(self):
+        (player_batch, _) = playout_batch(100, rng=np.random.default_rng(0))
+        buffer = ExperienceBuffer(1000)
+        buffer.extend(unbatch(player_batch))
+
+        episode_batch = buffer.episode_batch()
+        for (key, array) in episode_batch.items():
+            assert np.array_equal(array, player_batch[key])
+
+        batches = list(buffer.episode_batches(30))
+        assert [len(batch["lengths"]) for batch in batches] == [30, 30, 30, 10]
@@ -0,0 +1,49 @@
+import numpy as np
+
+from src.lib.feature_cache import FeatureCache
+from src.lib.value_approximator import ValueApproximator
+
+KEYS = [(a, b) for a in range(3) for b in range(2)]
+
+
+def feature_function(key):
+    (a, b) = key
+    return [a, b, a * b]
+
+
+class TestGet:
+    def test_rows_by_id(self):
+        feature_cache = FeatureCache(feature_function, KEYS)
+        assert feature_cache.matrix.shape == (6, 3)
+        for key in KEYS:
+            features = feature_cache.row(feature_cache.id(key))
+            assert np.array_equal(features, feature_function(key))
+            assert np.array_equal(feature_cache(key), feature_function(key))
+
+    def test_read_only(self):
+        feature_cache = FeatureCache(feature_function, KEYS)
+        assert not feature_cache((1, 1)).flags.writeable
+
+    def test_fall_back_to_memo_for_unknown_keys(self):
+        feature_cache = FeatureCache(feature_function, KEYS, maxsize=2)
+        assert np.array_equal(feature_cache((5, 2)), [5, 2, 10])
+        assert np.array_equal(feature_cache([5, 2]), [5, 2, 10])
+        assert feature_cache.memo.cache_info().hits == 1
+
+    def test_many(self):
+        feature_cache = FeatureCache(feature_function, KEYS)
+        assert np.array_equal(
+            feature_cache.many([(1, 1), (2, 0)]), [[1, 1, 1], [2, 0, 0]]
+        )
+        assert np.array_equal(
+            feature_cache.many([(1, 1), (4, 1)]), [[1, 1, 1], [4, 1, 4]]
+        )
+
+
+def test_as_input_parser():
+    value_approximator = ValueApproximator(
+        "value_approximator", input_parser=FeatureCache(feature_function, KEYS)
+    )
+    value_approximator.learn((2, 1), 1)
+    values = value_approximator.get_many(KEYS)
+    assert np.allclose(values, [value_approximator.get(key) for key in KEYS])
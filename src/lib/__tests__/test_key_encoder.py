@@ -0,0 +1,56 @@
+import numpy as np
+
+from src.lib.key_encoder import KeyEncoder, action_key
+from src.lib.value_table import ValueTable
+
+ACTIONS = ["hit", "stick"]
+STATES = [(dealer, player) for dealer in range(1, 4) for player in range(2, 6)]
+
+
+class TestKeyEncoder:
+    def test_state_ids_pre_multiplied_by_actions(self):
+        key_encoder = KeyEncoder(ACTIONS, STATES)
+        assert key_encoder.size == 3 * 4 * 2
+        state_ids = [key_encoder.encode_state(state_key) for state_key in STATES]
+        assert state_ids == list(range(0, 24, 2))
+        assert [key_encoder.decode_state(i) for i in state_ids] == STATES
+
+    def test_encode_decode_state_action(self):
+        key_encoder = KeyEncoder(ACTIONS, STATES)
+        for key in key_encoder.keys():
+            i = key_encoder.encode(key)
+            assert i == key_encoder.encode_state(key[:-1]) + key[-1]
+            assert key_encoder.decode(i) == key
+
+    def test_same_ids_as_value_table(self):
+        key_encoder = KeyEncoder(ACTIONS, STATES)
+        value_table = ValueTable("value_table", key_encoder.keys())
+        for key in key_encoder.keys():
+            assert key_encoder.encode(key) == value_table.index(key)
+
+    def test_state_out_of_space(self):
+        key_encoder = KeyEncoder(ACTIONS, STATES)
+        try:
+            key_encoder.encode_state((0, 2))
+            assert False
+        except KeyError:
+            pass
+
+    def test_encode_decode_episode(self):
+        key_encoder = KeyEncoder(ACTIONS, STATES)
+        episode = [[(1, 2), 0, 0], [(3, 5), 1, -1]]
+        encoded = key_encoder.encode_episode(episode)
+        assert encoded == [[0, 0, 0], [22, 1, -1]]
+        assert key_encoder.decode_episode(encoded) == episode
+
+    def test_state_policy(self):
+        key_encoder = KeyEncoder(ACTIONS, STATES)
+        policy = key_encoder.state_policy(lambda state_key: int(state_key[1] > 3))
+        assert policy(key_encoder.encode_state((2, 3))) == 0
+        assert policy(key_encoder.encode_state((2, 4))) == 1
+
+
+def test_action_key():
+    assert action_key((1, 2), 1) == (1, 2, 1)
+    assert action_key(22, 1) == 23
+    assert action_key(np.int64(22), 1) == 23
@@ -0,0 +1,101 @@
+import pickle
+import numpy as np
+
+from unittest import mock
+
+from src.lib.shared_value_table import SharedValueTable
+from src.lib.value_table import ValueTable
+
+KEYS = [
+    (dealer, player, action)
+    for dealer in range(1, 4)
+    for player in range(1, 5)
+    for action in range(2)
+]
+
+
+def learn_key(value_table, key, samples):
+    for sample in samples:
+        value_table.learn(key, sample)
+    value_table.close()
+
+
+class TestSharedValueTable:
+    def test_same_as_value_table(self):
+        shared_value_table = SharedValueTable("value_table", KEYS)
+        value_table = ValueTable("value_table", KEYS)
+
+        evaluations = [[(1, 1, 0), 1], [(2, 3, 1), -1], [(1, 1, 0), 0]]
+        for store in [shared_value_table, value_table]:
+            store.batch_learn(evaluations)
+            store.learn((3, 4, 1), 0.5)
+
+        assert shared_value_table.keys() == value_table.keys()
+        for (value_key, array) in value_table.arrays.items():
+            assert np.array_equal(shared_value_table.arrays[value_key], array)
+        assert shared_value_table.version == value_table.version
+
+        shared_value_table.unlink()
+
+    def test_attach_to_the_same_memory(self):
+        # locks are only passed to processes started with the table
+        shared_value_table = SharedValueTable("value_table", KEYS)
+        attached = pickle.loads(pickle.dumps(shared_value_table))
+
+        attached.learn((2, 2, 0), 1)
+        assert shared_value_table.get((2, 2, 0)) == 1
+        assert shared_value_table.keys() == [(2, 2, 0)]
+        assert shared_value_table.version == 1
+
+        attached.close()
+        shared_value_table.unlink()
+
+    @mock.patch("src.lib.shared_value_table.sys.version_info", (3, 9, 7))
+    def test_attach_without_tracking_before_python_3_13(self):
+        shared_value_table = SharedValueTable("value_table", KEYS)
+
+        with mock.patch(
+            "src.lib.shared_value_table.resource_tracker.unregister"
+        ) as mock_unregister:
+            attached = pickle.loads(pickle.dumps(shared_value_table))
+
+        mock_unregister.assert_called_once_with(
+            attached.shared_memory._name, "shared_memory"
+        )
+        attached.learn((2, 2, 0), 1)
+        assert shared_value_table.get((2, 2, 0)) == 1
+
+        attached.close()
+        shared_value_table.unlink()
+
+    def test_striped_locks_keep_all_updates(self):
+        shared_value_table = SharedValueTable("value_table", KEYS, lock_stripes=4)
+        context = shared_value_table.context
+
+        processes = [
+            context.Process(
+                target=learn_key,
+                args=(shared_value_table, (1, 1, 0), [1] * 500),
+            )
+            for _ in range(2)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert shared_value_table.count((1, 1, 0)) == 1000
+        assert np.isclose(shared_value_table.get((1, 1, 0)), 1)
+
+        shared_value_table.unlink()
+
+    def test_to_value_table(self):
+        shared_value_table = SharedValueTable("value_table", KEYS)
+        shared_value_table.learn((3, 4, 1), 0.5)
+
+        value_table = shared_value_table.to_value_table()
+        shared_value_table.unlink()
+
+        assert value_table.keys() == [(3, 4, 1)]
+        assert value_table.get((3, 4, 1)) == 0.5
+        assert value_table.index((3, 4, 1)) == KEYS.index((3, 4, 1))
@@ -1,6 +1,7 @@
 import numpy as np
 
 from src.lib.value_approximator import ValueApproximator
+from src.lib.eligibility_trace import WeightEligibilityTrace
 from src.lib.value_map import ValueMap
 
 
@@ -46,6 +47,75 @@ class TestGet:
         assert type(features) is np.ndarray
         assert np.array_equal(features, [2, 4, 6])
 
+    def test_get_many_same_as_get(self):
+        value_approximator = ValueApproximator("value_approximator")
+        value_approximator.input_parser = lambda x: [x[0], x[1] * 2, 1]
+        inputs = [(1, 2), (0, 1), (3, 0)]
+        values = value_approximator.get_many(inputs)
+        assert values.shape == (3,)
+        assert np.allclose(values, [value_approximator.get(i) for i in inputs])
+
+
+class TestSparse:
+    @staticmethod
+    def dense(input):
+        (a, b) = input
+        return [1 if i in (a, 3 + b) else 0 for i in range(5)]
+
+    @staticmethod
+    def sparse(input):
+        (a, b) = input
+        return [a, 3 + b]
+
+    def test_get_and_learn_same_as_dense(self):
+        dense = ValueApproximator("dense", input_parser=self.dense)
+        sparse = ValueApproximator("sparse", input_parser=self.sparse, feature_size=5)
+
+        dense.weights = np.array([0.1, 0.2, 0.3, 0.4, 0.5])
+        sparse.weights = np.copy(dense.weights)
+
+        inputs = [(0, 1), (2, 0), (1, 1)]
+        for input in inputs:
+            assert np.isclose(sparse.get(input), dense.get(input))
+
+        for (input, target) in zip(inputs, [1, -1, 0.5]):
+            dense.learn(input, target, step_size=0.1)
+            sparse.learn(input, target, step_size=0.1)
+
+        assert np.allclose(sparse.weights, dense.weights)
+        assert np.allclose(sparse.get_many(inputs), dense.get_many(inputs))
+
+    def test_active_values_and_feature_size_of_input_parser(self):
+        def input_parser(input):
+            return ([0, 2], [input, 2 * input])
+
+        input_parser.feature_size = 4
+
+        value_approximator = ValueApproximator("sparse", input_parser=input_parser)
+        assert value_approximator.feature_size == 4
+
+        value_approximator.get(1)
+        assert value_approximator.weights.size == 4
+
+        value_approximator.weights = np.array([1.0, 1.0, 1.0, 1.0])
+        assert value_approximator.get(2) == 6
+        value_approximator.learn(1, 0, step_size=0.1)
+        assert np.allclose(value_approximator.weights, [0.7, 1, 0.4, 1])
+
+    def test_tuple_of_active_indices(self):
+        value_approximator = ValueApproximator(
+            "sparse", input_parser=lambda input: (0, 3), feature_size=4
+        )
+        assert np.array_equal(value_approximator.parse_sparse(1)[0], [0, 3])
+        assert np.array_equal(value_approximator.parse_sparse(1)[1], [1, 1])
+
+        value_approximator.input_parser = lambda input: ([0, 3], [1.0])
+        try:
+            value_approximator.parse_sparse(1)
+            assert False
+        except ValueError:
+            pass
+
 
 class Testlearn:
     def test_update_weights_to_learn_sample(self):
@@ -119,6 +189,129 @@ class Testlearn:
         )
 
 
+class TestBatchLearn:
+    def test_learn_minibatch_in_one_step(self):
+        value_approximator = ValueApproximator("value_approximator")
+        value_approximator.weights = np.array([1.0, 1.0, 1.0])
+
+        evaluations = [([1, 2, 3], 10), ([0, 1, 0], 0), ([1, 0, 0], 2)]
+        X = np.array([sample_input for (sample_input, _) in evaluations])
+        y = np.array([sample_return for (_, sample_return) in evaluations])
+        expected = 1 + 0.1 * X.T @ (y - X @ np.ones(3))
+
+        value_approximator.batch_learn(evaluations, step_size=0.1)
+        assert np.allclose(value_approximator.weights, expected)
+
+        value_approximator.weights = np.array([1.0, 1.0, 1.0])
+        value_approximator.batch_learn(evaluations, step_size=0.3, average=True)
+        assert np.allclose(value_approximator.weights, expected)
+
+    def test_sparse_same_as_dense(self):
+        dense = ValueApproximator("dense", input_parser=TestSparse.dense)
+        sparse = ValueApproximator(
+            "sparse", input_parser=TestSparse.sparse, feature_size=5
+        )
+
+        dense.weights = np.array([0.1, 0.2, 0.3, 0.4, 0.5])
+        sparse.weights = np.copy(dense.weights)
+
+        evaluations = [((0, 1), 1), ((2, 0), -1), ((0, 0), 0.5), ((0, 1), 1)]
+        dense.batch_learn(evaluations, step_size=0.1)
+        sparse.batch_learn(evaluations, step_size=0.1)
+
+        assert np.allclose(sparse.weights, dense.weights)
+
+
+class TestLearnWithWeightEligibilityTrace:
+    # features of the keys as dense vectors, rewards of an episode
+    EPISODE = [([1, 0, 1], 0), ([0, 1, 1], 1), ([1, 1, 0], 0), ([0, 0, 1], 1)]
+
+    def run(self, trace, discount, lambda_value, weights):
+        value_approximator = ValueApproximator("value_approximator")
+        value_approximator.weights = np.array(weights)
+
+        for (t, (key, reward)) in enumerate(self.EPISODE):
+            trace.update(tuple(key), discount=discount, lambda_value=lambda_value)
+            if t + 1 < len(self.EPISODE):
+                next_value = value_approximator.get(self.EPISODE[t + 1][0])
+                td_target = reward + discount * next_value
+            else:
+                td_target = reward
+            value_approximator.learn_with_eligibility_trace(trace, td_target)
+
+        return value_approximator.weights
+
+    def test_lambda_zero_same_as_learn(self):
+        weights = self.run(WeightEligibilityTrace(step_size=0.1), 0.9, 0, [0.1] * 3)
+
+        value_approximator = ValueApproximator("value_approximator")
+        value_approximator.weights = np.array([0.1] * 3)
+        for (t, (key, reward)) in enumerate(self.EPISODE):
+            td_target = reward
+            if t + 1 < len(self.EPISODE):
+                td_target += 0.9 * value_approximator.get(self.EPISODE[t + 1][0])
+            value_approximator.learn(key, td_target, step_size=0.1)
+
+        assert np.allclose(weights, value_approximator.weights)
+
+    def test_accumulating_trace(self):
+        weights = self.run(WeightEligibilityTrace(step_size=0.1), 0.9, 0.8, [0.1] * 3)
+
+        w = np.array([0.1] * 3)
+        z = np.zeros(3)
+        for (t, (key, reward)) in enumerate(self.EPISODE):
+            x = np.array(key, dtype=float)
+            z = 0.72 * z + x
+            td_target = reward
+            if t + 1 < len(self.EPISODE):
+                td_target += 0.9 * np.dot(w, self.EPISODE[t + 1][0])
+            w = w + 0.1 * (td_target - np.dot(w, x)) * z
+
+        assert np.allclose(weights, w)
+
+    def test_true_online(self):
+        trace = WeightEligibilityTrace(step_size=0.1, true_online=True)
+        weights = self.run(trace, 0.9, 0.8, [0.1] * 3)
+
+        # true online TD(lambda), RL by Sutton & Barto, 12.5
+        (alpha, discount, decay) = (0.1, 0.9, 0.72)
+        w = np.array([0.1] * 3)
+        z = np.zeros(3)
+        value_old = 0
+        for (t, (key, reward)) in enumerate(self.EPISODE):
+            x = np.array(key, dtype=float)
+            x_next = (
+                np.array(self.EPISODE[t + 1][0], dtype=float)
+                if t + 1 < len(self.EPISODE)
+                else np.zeros(3)
+            )
+            value = np.dot(w, x)
+            value_next = np.dot(w, x_next)
+            error = reward + discount * value_next - value
+            z = decay * z + (1 - alpha * decay * np.dot(z, x)) * x
+            w = w + alpha * (error + value - value_old) * z
+            w = w - alpha * (value - value_old) * x
+            value_old = value_next
+
+        assert np.allclose(weights, w)
+
+    def test_sparse_same_as_dense(self):
+        dense = ValueApproximator("dense", input_parser=TestSparse.dense)
+        sparse = ValueApproximator(
+            "sparse", input_parser=TestSparse.sparse, feature_size=5
+        )
+        dense.weights = np.array([0.1, 0.2, 0.3, 0.4, 0.5])
+        sparse.weights = np.copy(dense.weights)
+
+        for value_approximator in [dense, sparse]:
+            trace = WeightEligibilityTrace(step_size=0.1, true_online=True)
+            for (key, target) in [((0, 1), 1), ((2, 0), -1), ((0, 1), 0.5)]:
+                trace.update(key, discount=0.9, lambda_value=0.5)
+                value_approximator.learn_with_eligibility_trace(trace, target)
+
+        assert np.allclose(sparse.weights, dense.weights)
+
+
 class TestBackup:
     def test_backup_to__weights(self):
         value_approximator = ValueApproximator("value_approximator")
@@ -126,6 +319,18 @@ class TestBackup:
         value_approximator.backup()
         assert np.allclose(value_approximator.weights, value_approximator._weights)
 
+    def test_backup_reuse_snapshot_buffer(self):
+        value_approximator = ValueApproximator("value_approximator")
+        value_approximator.weights = np.array([1.0, 1.0, 1.0])
+        value_approximator.backup()
+        _weights = value_approximator._weights
+
+        value_approximator.learn([1, 0, 0], 2, step_size=0.5)
+        value_approximator.backup()
+
+        assert value_approximator._weights is _weights
+        assert np.allclose(_weights, [1.5, 1, 1])
+
 
 class TestReset:
     def test_reset(self):
@@ -164,3 +369,29 @@ def test_record():
     value_approximator.metrics.record("diff", log=False)
     assert np.allclose(value_approximator.metrics.history["diff"], [0.2 / 1.2])
     assert np.allclose(value_approximator.weights, value_approximator._weights)
+
+
+class TestFileIO:
+    def test_save_and_load(self, tmp_path):
+        value_approximator = ValueApproximator("value_approximator")
+        value_approximator.weights = np.array([1.0, -2.0, 0.5])
+        path = str(tmp_path / "weights.npy")
+        value_approximator.save(path)
+
+        loaded = ValueApproximator("loaded")
+        loaded.load(path)
+        assert np.array_equal(loaded.weights, [1.0, -2.0, 0.5])
+        assert loaded.get([1, 1, 2]) == 0.0
+        assert loaded.version == 1
+
+    def test_load_memory_mapped(self, tmp_path):
+        value_approximator = ValueApproximator("value_approximator")
+        value_approximator.weights = np.array([1.0, -2.0, 0.5])
+        path = str(tmp_path / "weights.npy")
+        value_approximator.save(path)
+
+        loaded = ValueApproximator("loaded")
+        loaded.load(path, mmap_mode="r")
+        assert isinstance(loaded.weights, np.memmap)
+        assert not loaded.weights.flags.writeable
+        assert loaded.get([1, 0, 0]) == 1.0
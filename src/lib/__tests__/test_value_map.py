@@ -0,0 +1,106 @@
+import numpy as np
+
+from copy import deepcopy
+
+from src.lib.value_map import ValueMap, merge_value_maps
+
+KEYS = [(dealer, player) for dealer in range(1, 3) for player in range(1, 4)]
+
+
+def learn_samples(name, keys, samples):
+    value_map = ValueMap(name)
+    for (key, sample) in zip(keys, samples):
+        value_map.learn(key, sample)
+    return value_map
+
+
+def assert_same_data(value_map, expected):
+    assert sorted(value_map.keys()) == sorted(expected.keys())
+    for key in expected.keys():
+        for value_key in ["count", "value", "mse"]:
+            assert np.isclose(
+                value_map.get(key, value_key=value_key),
+                expected.get(key, value_key=value_key),
+            )
+
+
+class TestMerge:
+    def test_same_as_learning_all_samples(self):
+        rng = np.random.default_rng(0)
+        keys = [KEYS[i] for i in rng.integers(0, len(KEYS), size=100)]
+        samples = rng.normal(size=100).tolist()
+
+        value_map = learn_samples("a", keys[:40], samples[:40])
+        value_map.merge(learn_samples("b", keys[40:], samples[40:]))
+
+        assert_same_data(value_map, learn_samples("expected", keys, samples))
+
+    def test_mse_as_sample_variance(self):
+        value_map = learn_samples("a", [(1, 1)] * 2, [1, 3])
+        value_map.merge(learn_samples("b", [(1, 1)] * 2, [5, 7]))
+
+        assert value_map.count((1, 1)) == 4
+        assert value_map.get((1, 1)) == 4
+        assert value_map.get((1, 1), value_key="mse") == np.var([1, 3, 5, 7])
+
+    def test_merge_into_empty_and_from_empty(self):
+        other = learn_samples("other", [(1, 1), (2, 3)], [1, -1])
+
+        value_map = ValueMap("value_map")
+        value_map.merge(other)
+        value_map.merge(ValueMap("empty"))
+
+        assert_same_data(value_map, other)
+
+
+def test_merge_value_maps_tree():
+    rng = np.random.default_rng(1)
+    keys = [KEYS[i] for i in rng.integers(0, len(KEYS), size=300)]
+    samples = rng.normal(size=300).tolist()
+
+    parts = np.array_split(np.arange(300), 7)
+    value_maps = [
+        learn_samples(f"part_{i}", [keys[j] for j in part], [samples[j] for j in part])
+        for (i, part) in enumerate(parts)
+    ]
+    data = [deepcopy(value_map.data) for value_map in value_maps]
+
+    merged = merge_value_maps(value_maps, name="merged")
+
+    assert merged.name == "merged"
+    assert_same_data(merged, learn_samples("expected", keys, samples))
+    # the value_maps are not changed
+    assert [value_map.data for value_map in value_maps] == data
+
+
+def test_get_many_of_numpy_integer_key_ids():
+    value_map = ValueMap("value_map")
+    value_map.set(3, 0.5)
+
+    values = value_map.get_many(np.array([3, 4]))
+    assert np.array_equal(values, [0.5, 0])
+    assert np.array_equal(value_map.get_actions(np.int64(2), ["a", "b"]), [0, 0.5])
+
+
+class TestFileIO:
+    def test_save_and_load_json_and_binary(self, tmp_path):
+        value_map = learn_samples("value_map", [(1, 1), (2, 3), (1, 1)], [1, -1, 0])
+
+        for file_name in ["value_map.json", "value_map.npy"]:
+            path = str(tmp_path / file_name)
+            value_map.save(path)
+
+            loaded = ValueMap("loaded")
+            loaded.load(path)
+            assert_same_data(loaded, value_map)
+            assert type(loaded.count((1, 1))) is int
+            assert loaded.version == 1
+
+    def test_binary_with_integer_keys(self, tmp_path):
+        value_map = learn_samples("value_map", [4, 7], [1, -1])
+        path = str(tmp_path / "value_map.npy")
+        value_map.save(path)
+
+        loaded = ValueMap("loaded")
+        loaded.load(path)
+        assert_same_data(loaded, value_map)
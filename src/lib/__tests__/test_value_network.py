@@ -1,3 +1,5 @@
+import numpy as np
+
 from src.lib.value_network import ValueNetwork
 from src.lib.value_map import ValueMap
 
@@ -26,6 +28,32 @@ class TestGet:
         value = value_network.get(input)
         assert type(value) is float
 
+    def test_get_many_same_as_get(self):
+        value_network = ValueNetwork("value_network")
+        inputs = [[1, 2, 3], [0.5, -1, 0], [0, 0, 1]]
+        values = value_network.get_many(inputs)
+        assert values.shape == (3,)
+        for (input, value) in zip(inputs, values):
+            assert abs(value - value_network.get(input)) < 1e-9
+
+    def test_get_many_layer_matrices_cached_until_updated(self):
+        value_network = ValueNetwork("value_network")
+        inputs = [[1, 2, 3], [0.5, -1, 0]]
+        value_network.get_many(inputs)
+
+        layer_matrices = value_network.layer_matrices()
+        assert value_network.layer_matrices() is layer_matrices
+
+        value_network.learn(inputs[0], 1)
+        assert value_network.layer_matrices() is not layer_matrices
+        for (input, value) in zip(inputs, value_network.get_many(inputs)):
+            assert abs(value - value_network.get(input)) < 1e-9
+
+    def test_get_actions(self):
+        value_network = ValueNetwork("value_network")
+        values = value_network.get_actions((1, 2), ["a", "b"])
+        assert abs(values[1] - value_network.get((1, 2, 1))) < 1e-9
+
 
 class Testlearn:
     def test_learn_sample_to_output_closer(self):
@@ -56,6 +84,19 @@ class TestBackup:
         assert abs(value - _value) > 1e-5
 
 
+def test_get_and_set_parameters():
+    value_network = ValueNetwork("value_network", network_size=[2, 1])
+    value = value_network.get([1, 1])
+    parameters = value_network.get_parameters()
+    assert parameters.shape == (2 * 2 + 2 + 2 + 1,)
+
+    value_network.set_parameters(np.zeros_like(parameters))
+    assert value_network.get([1, 1]) == 0
+
+    value_network.set_parameters(parameters)
+    assert value_network.get([1, 1]) == value
+
+
 class TestReset:
     def test_reset(self):
         value_network = ValueNetwork("value_network")
@@ -101,3 +142,15 @@ def test_compare():
     errors = [value_network.get(key) - value for (key, value) in mock_key_values]
     mse = sum([error**2 for error in errors]) / 2
     assert value_network.compare(value_map) ** 2 - mse < 1e-5
+
+
+def test_save_and_load(tmp_path):
+    value_network = ValueNetwork("value_network", network_size=[4, 2, 1])
+    value_network.get([1, 2, 3])
+    path = str(tmp_path / "parameters.npy")
+    value_network.save(path)
+
+    loaded = ValueNetwork("loaded", network_size=[4, 2, 1])
+    loaded.load(path)
+    assert np.array_equal(loaded.get_parameters(), value_network.get_parameters())
+    assert loaded.get([1, 2, 3]) == value_network.get([1, 2, 3])
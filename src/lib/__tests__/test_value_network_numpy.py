@@ -0,0 +1,191 @@
+import numpy as np
+
+from src.lib.value_network_numpy import ValueNetworkNumpy
+from src.lib.value_map import ValueMap
+
+
+class TestInit:
+    def test_init_default_feature_function(self):
+        value_network = ValueNetworkNumpy("value_network")
+        assert value_network.name == "value_network"
+        assert value_network.input_parser(1) == 1
+        assert value_network.network_size == [4, 4, 1]
+        assert value_network.network is None
+        assert value_network._network is None
+
+
+class TestGet:
+    def test_init_network_by_feature_size(self):
+        value_network = ValueNetworkNumpy("value_network")
+        input = [1, 2, 3]
+        value_network.get(input)
+        assert len(value_network.network.layers) == 3
+        assert value_network.network.layers[0][0].shape == (len(input), 4)
+        assert value_network.network.parameters.size == 3 * 4 + 4 + 4 * 4 + 4 + 4 + 1
+
+    def test_output_value(self):
+        value_network = ValueNetworkNumpy("value_network")
+        value = value_network.get([1, 2, 3])
+        assert type(value) is float
+
+    def test_get_many_same_as_get(self):
+        value_network = ValueNetworkNumpy("value_network")
+        inputs = [[1, 2, 3], [0.5, -1, 0], [0, 0, 1]]
+        values = value_network.get_many(inputs)
+        assert values.shape == (3,)
+        assert np.allclose(values, [value_network.get(input) for input in inputs])
+
+    def test_layers_are_views_of_parameters(self):
+        value_network = ValueNetworkNumpy("value_network", network_size=[2, 1])
+        value_network.get([1, 1])
+        value_network.network.parameters[:] = 0
+        assert value_network.get([1, 1]) == 0
+
+
+class Testlearn:
+    def test_learn_sample_to_output_closer(self):
+        value_network = ValueNetworkNumpy("value_network")
+        sample = ([0.5, 0.7, 2.0], 1)
+        _value = value_network.get(sample[0])
+        for _ in range(5):
+            value_network.learn(sample[0], sample[1])
+        value = value_network.get(sample[0])
+        assert abs(value - sample[1]) < abs(_value - sample[1])
+
+    def test_gradient_same_as_finite_difference(self):
+        value_network = ValueNetworkNumpy("value_network", network_size=[4, 2, 1])
+        x = np.array([[0.5, 0.7, 2.0], [-1, 0.2, 0.3], [0.1, 0.1, -0.4]])
+        y = np.array([1, -1, 0.5])
+        value_network.get(x[0])
+        network = value_network.network
+
+        # fixed weights to keep the activations away from the kink of ReLU,
+        # without seeding the global random state of the other tests
+        rng = np.random.default_rng(0)
+        network.parameters[:] = rng.uniform(-1, 1, network.parameters.size)
+
+        def loss():
+            return np.sum(np.square(y - network(x)[:, 0]))
+
+        gradient = network.gradient(x, y)
+
+        epsilon = 1e-6
+        for i in range(network.parameters.size):
+            network.parameters[i] += epsilon
+            loss_plus = loss()
+            network.parameters[i] -= 2 * epsilon
+            loss_minus = loss()
+            network.parameters[i] += epsilon
+            assert abs((loss_plus - loss_minus) / (2 * epsilon) - gradient[i]) < 1e-4
+
+    def test_batch_learn_summed_and_averaged(self):
+        value_network = ValueNetworkNumpy("value_network", network_size=[2, 1])
+        evaluations = [([0.5, 0.7], 1), ([0.6, 0.6], 2)]
+        value_network.get(evaluations[0][0])
+        _parameters = np.copy(value_network.network.parameters)
+
+        value_network.batch_learn(evaluations, step_size=0.01)
+        summed = np.copy(value_network.network.parameters)
+
+        value_network.network.parameters[:] = _parameters
+        value_network.batch_learn(evaluations, step_size=0.02, average=True)
+
+        assert np.allclose(value_network.network.parameters, summed)
+        assert not np.allclose(summed, _parameters)
+
+
+class TestBackup:
+    def test_backup_to__network(self):
+        value_network = ValueNetworkNumpy("value_network")
+        sample = ([0.5, 0.7, 2.0], 1)
+        _value = value_network.get(sample[0])
+
+        value_network.backup()
+
+        for _ in range(5):
+            value_network.learn(sample[0], sample[1])
+
+        value = value_network.get(sample[0])
+        _value_after = value_network._network([sample[0]])[0, 0]
+
+        assert abs(_value_after - _value) < 1e-5
+        assert abs(value - _value) > 1e-5
+
+    def test_backup_reuse_snapshot_buffer(self):
+        value_network = ValueNetworkNumpy("value_network")
+        sample = ([0.5, 0.7, 2.0], 1)
+        value_network.get(sample[0])
+
+        value_network.backup()
+        _parameters = value_network._parameters
+        value_network.learn(sample[0], sample[1])
+        value_network.backup()
+
+        assert value_network._parameters is _parameters
+        assert np.array_equal(_parameters, value_network.get_parameters())
+
+    def test_set_parameters(self):
+        value_network = ValueNetworkNumpy("value_network")
+        value_network.get([1, 1])
+        value_network.backup()
+
+        value_network.learn([1, 1], 1)
+        value_network.set_parameters(value_network._parameters)
+
+        assert value_network.diff() == 0
+
+
+class TestReset:
+    def test_reset(self):
+        value_network = ValueNetworkNumpy("value_network")
+        value_network.get([1, 1])
+        value_network.backup()
+        value_network.reset()
+        assert value_network.network is None
+        assert value_network._network is None
+
+
+class TestDiff:
+    def test_diff_return_one_if_not_backedup(self):
+        value_network = ValueNetworkNumpy("value_network", network_size=[2, 1])
+        value_network.get([1, 1])
+        assert abs(value_network.diff() - 1) < 1e-5
+
+    def test_diff_return_zero_for_no_change(self):
+        value_network = ValueNetworkNumpy("value_network", network_size=[2, 1])
+        value_network.get([1, 1])
+        value_network.backup()
+        assert abs(value_network.diff() - 0) < 1e-5
+
+
+def test_compare():
+    value_network = ValueNetworkNumpy(
+        "value_network",
+        input_parser=lambda key: list(key),
+    )
+    value_map = ValueMap("value_map")
+    mock_key_values = [((1, 2), 1), ((2, 2), 2)]
+    for (key, value) in mock_key_values:
+        value_map.set(key, value)
+    errors = [value_network.get(key) - value for (key, value) in mock_key_values]
+    mse = sum([error**2 for error in errors]) / 2
+    assert abs(value_network.compare(value_map) ** 2 - mse) < 1e-9
+
+
+class TestFileIO:
+    def test_save_and_load(self, tmp_path):
+        value_network = ValueNetworkNumpy("value_network", network_size=[4, 2, 1])
+        value_network.learn([1, 2, 3], 1)
+        path = str(tmp_path / "parameters.npy")
+        value_network.save(path)
+
+        for mmap_mode in [None, "r"]:
+            loaded = ValueNetworkNumpy("loaded", network_size=[4, 2, 1])
+            loaded.load(path, mmap_mode=mmap_mode)
+            assert loaded.network.input_size == 3
+            assert np.array_equal(
+                loaded.network.parameters, value_network.network.parameters
+            )
+            assert loaded.get([1, 2, 3]) == value_network.get([1, 2, 3])
+
+        assert isinstance(loaded.network.parameters, np.memmap)
@@ -0,0 +1,310 @@
+import numpy as np
+
+from src.lib.value_table import ValueTable
+from src.lib.value_map import ValueMap
+
+KEYS = [
+    (dealer, player, action)
+    for dealer in range(1, 4)
+    for player in range(1, 5)
+    for action in range(2)
+]
+
+
+class TestInit:
+    def test_init_arrays_by_keys(self):
+        value_table = ValueTable("value_table", KEYS)
+        assert value_table.name == "value_table"
+        assert value_table.size == 3 * 4 * 2
+        assert value_table.arrays["value"].shape == (24,)
+        assert value_table.keys() == []
+        assert value_table.metrics.history == {}
+
+
+class TestIndex:
+    def test_index_round_trip(self):
+        value_table = ValueTable("value_table", KEYS)
+        ids = [value_table.index(key) for key in KEYS]
+        assert sorted(ids) == list(range(24))
+        assert [value_table.key(i) for i in ids] == KEYS
+        assert np.array_equal(value_table.indices(np.array(KEYS)), ids)
+
+    def test_numpy_integer_key_ids(self):
+        value_table = ValueTable("value_table", KEYS)
+        i = value_table.index((2, 3, 0))
+        value_table.set((2, 3, 1), 0.5)
+
+        assert value_table.index(np.int64(i)) == i
+        values = value_table.get_actions(np.int64(i), ["a", "b"])
+        assert np.array_equal(values, [0, 0.5])
+        assert np.array_equal(value_table.indices(np.array([i, i + 1])), [i, i + 1])
+
+    def test_indices_of_one_tuple_key(self):
+        value_table = ValueTable("value_table", KEYS)
+        assert np.array_equal(
+            value_table.indices((2, 3, 1)), [value_table.index((2, 3, 1))]
+        )
+        assert np.array_equal(
+            value_table.indices(np.array([2.0, 3.0, 1.0])),
+            [value_table.index((2, 3, 1))],
+        )
+
+    def test_key_out_of_range(self):
+        value_table = ValueTable("value_table", KEYS)
+        for key in [(0, 1, 0), (1, 5, 0), (1, 1, 2)]:
+            try:
+                value_table.index(key)
+                assert False
+            except KeyError:
+                pass
+
+
+class TestGet:
+    def test_get_without_insert(self):
+        value_table = ValueTable("value_table", KEYS)
+        assert value_table.get((1, 1, 0)) == 0
+        assert value_table.count((1, 1, 0)) == 0
+        assert value_table.keys() == []
+
+    def test_get_value_key(self):
+        value_table = ValueTable("value_table", KEYS)
+        value_table.set((2, 3, 1), 0.5)
+        assert value_table.get((2, 3, 1)) == 0.5
+        assert type(value_table.get((2, 3, 1))) is float
+        assert type(value_table.get((2, 3, 1), value_key="count")) is int
+        assert value_table.keys() == [(2, 3, 1)]
+
+    def test_get_many_and_actions(self):
+        value_table = ValueTable("value_table", KEYS)
+        value_table.set((2, 3, 1), 0.5)
+        value_table.set((1, 1, 0), -1)
+
+        values = value_table.get_many([(1, 1, 0), (2, 3, 0), (2, 3, 1)])
+        assert np.array_equal(values, [-1, 0, 0.5])
+        assert np.array_equal(value_table.get_actions((2, 3), ["a", "b"]), [0, 0.5])
+
+
+class TestLearn:
+    def test_same_as_value_map(self):
+        value_table = ValueTable("value_table", KEYS)
+        value_map = ValueMap("value_map")
+
+        samples = [((1, 1, 0), 1), ((1, 1, 0), 0), ((2, 4, 1), -1), ((1, 1, 0), 1)]
+
+        for (key, sample) in samples:
+            value_table.learn(key, sample)
+            value_map.learn(key, sample)
+
+        value_table.learn((3, 2, 1), 1, step_size=lambda count: 0.5 / count)
+        value_map.learn((3, 2, 1), 1, step_size=lambda count: 0.5 / count)
+
+        assert sorted(value_table.keys()) == sorted(value_map.keys())
+        for key in value_map.keys():
+            for value_key in ["count", "value", "mse"]:
+                assert (
+                    abs(
+                        value_table.get(key, value_key=value_key)
+                        - value_map.get(key, value_key=value_key)
+                    )
+                    < 1e-12
+                )
+
+        assert value_table.total_count() == value_map.total_count()
+
+    def test_batch_learn(self):
+        value_table = ValueTable("value_table", KEYS)
+        value_table.batch_learn([((1, 1, 0), 1), ((1, 1, 0), 0)])
+        assert value_table.get((1, 1, 0)) == 0.5
+        assert value_table.count((1, 1, 0)) == 2
+
+
+class TestMerge:
+    def test_same_as_learning_all_samples(self):
+        rng = np.random.default_rng(0)
+        keys = [KEYS[i] for i in rng.integers(0, len(KEYS), size=200)]
+        samples = rng.normal(size=200)
+
+        value_table = ValueTable("value_table", KEYS)
+        for (key, sample) in zip(keys, samples):
+            value_table.learn(key, sample)
+
+        merged = ValueTable("merged", KEYS)
+        for part in np.array_split(np.arange(200), 3):
+            other = ValueTable("other", KEYS)
+            for i in part:
+                other.learn(keys[i], samples[i])
+            merged.merge(other)
+
+        assert merged.keys() == value_table.keys()
+        for value_key in ["count", "value", "mse"]:
+            assert np.allclose(merged.arrays[value_key], value_table.arrays[value_key])
+
+    def test_merge_different_keys(self):
+        value_table = ValueTable("value_table", KEYS)
+        try:
+            value_table.merge(ValueTable("other", KEYS[:8]))
+            assert False
+        except ValueError:
+            pass
+
+
+class TestBackup:
+    def test_backup_and_reset(self):
+        value_table = ValueTable("value_table", KEYS)
+        value_table.set((1, 1, 0), 1)
+        value_table.backup()
+        assert value_table._values[value_table.index((1, 1, 0))] == 1
+
+        value_table.reset()
+        assert value_table.get((1, 1, 0)) == 0
+        assert value_table.keys() == []
+        assert value_table._values.size == 0
+
+
+class TestDiff:
+    def test_diff_return_correct(self):
+        value_table = ValueTable("value_table", KEYS)
+        value_table.set((1, 1, 0), 1)
+        value_table.set((1, 1, 1), 2)
+        value_table.backup()
+        value_table.set((1, 1, 0), 2)
+        assert abs(value_table.diff() - np.sqrt(0.5) / 2) < 1e-12
+        assert value_table.diff() == 0
+
+
+def test_compare():
+    value_table = ValueTable("value_table", KEYS)
+    value_table.set((1, 1, 0), 1)
+    value_table.set((1, 2, 0), 3)
+    value_map = ValueMap("value_map")
+    value_map.set((1, 1, 0), 2)
+    value_map.set((1, 2, 0), 1)
+    assert abs(value_table.compare(value_map) - np.sqrt(2.5)) < 1e-12
+    assert abs(value_map.compare(value_table) - np.sqrt(2.5)) < 1e-12
+
+
+def test_value_map_conversion():
+    value_table = ValueTable("value_table", KEYS)
+    value_table.learn((1, 1, 0), 1)
+    value_table.learn((1, 1, 0), 0)
+    value_table.set((2, 2, 1), 3)
+
+    value_map = value_table.to_value_map()
+    assert value_map.data == {
+        (1, 1, 0): {"count": 2, "value": 0.5, "mse": 0.25},
+        (2, 2, 1): {"count": 0, "value": 3.0, "mse": 0.0},
+    }
+
+    _value_table = ValueTable("value_table", KEYS)
+    _value_table.from_value_map(value_map)
+    assert _value_table.to_value_map().data == value_map.data
+
+
+class TestBatchLearn:
+    def sequential_and_batch(self, evaluations, step_size=None):
+        sequential = ValueTable("sequential", KEYS)
+        batch = ValueTable("batch", KEYS)
+
+        for table in [sequential, batch]:
+            table.learn((1, 1, 0), 0.5)
+            table.set((2, 2, 0), 3)
+
+        for (key, sample) in evaluations:
+            if step_size is None:
+                sequential.learn(key, sample)
+            elif callable(step_size):
+                sequential.learn(key, sample, step_size=step_size)
+            else:
+                sequential.learn(key, sample, step_size=lambda count: step_size)
+
+        batch.batch_learn(evaluations, step_size=step_size)
+
+        return sequential, batch
+
+    def assert_same_tables(self, sequential, batch):
+        assert np.array_equal(sequential.touched, batch.touched)
+        assert np.array_equal(sequential.arrays["count"], batch.arrays["count"])
+        assert np.allclose(sequential.arrays["value"], batch.arrays["value"])
+        assert np.allclose(sequential.arrays["mse"], batch.arrays["mse"])
+
+    def evaluations(self):
+        rng = np.random.default_rng(0)
+        keys = [KEYS[i] for i in rng.integers(0, 6, size=200)]
+        returns = rng.normal(size=200)
+        return [*zip(keys, returns), ((2, 2, 0), 1.0)]
+
+    def test_sample_mean(self):
+        self.assert_same_tables(*self.sequential_and_batch(self.evaluations()))
+
+    def test_constant_step_size(self):
+        self.assert_same_tables(
+            *self.sequential_and_batch(self.evaluations(), step_size=0.1)
+        )
+
+    def test_step_size_function(self):
+        self.assert_same_tables(
+            *self.sequential_and_batch(
+                self.evaluations(), step_size=lambda count: 0.5 / count
+            )
+        )
+
+    def test_empty_evaluations(self):
+        self.assert_same_tables(*self.sequential_and_batch([]))
+
+    def test_batch_learn_arrays(self):
+        value_table = ValueTable("value_table", KEYS)
+        value_table.batch_learn_arrays(np.array([[1, 1, 0], [1, 1, 0]]), [1, 0])
+        assert value_table.get((1, 1, 0)) == 0.5
+        assert value_table.count((1, 1, 0)) == 2
+        assert value_table.get((1, 1, 0), value_key="mse") == 0.25
+
+
+class TestFileIO:
+    def test_save_and_load_json_and_binary(self, tmp_path):
+        value_table = ValueTable("value_table", KEYS)
+        value_table.learn((1, 1, 0), 1)
+        value_table.learn((1, 1, 0), 0)
+        value_table.set((2, 2, 1), 3)
+
+        for file_name in ["value_table.json", "value_table.npy"]:
+            path = str(tmp_path / file_name)
+            value_table.save(path)
+
+            loaded = ValueTable("loaded", KEYS)
+            loaded.load(path)
+            assert loaded.keys() == value_table.keys()
+            for (value_key, array) in value_table.arrays.items():
+                assert np.array_equal(loaded.arrays[value_key], array)
+
+    def test_load_memory_mapped(self, tmp_path):
+        value_table = ValueTable("value_table", KEYS)
+        value_table.learn((3, 4, 1), 0.5)
+        path = str(tmp_path / "value_table.npy")
+        value_table.save(path)
+
+        loaded = ValueTable("loaded", KEYS)
+        loaded.load(path, mmap_mode="r")
+        assert loaded.get((3, 4, 1)) == 0.5
+        assert loaded.keys() == [(3, 4, 1)]
+        assert not loaded.arrays["value"].flags.writeable
+        for array in [*loaded.arrays.values(), loaded.touched]:
+            assert array.flags.c_contiguous
+
+        loaded = ValueTable("loaded", KEYS)
+        loaded.load(path, mmap_mode="c")
+        loaded.learn((3, 4, 1), 1.5)
+        assert loaded.get((3, 4, 1)) == 1
+
+        value_table.load(path)
+        assert value_table.get((3, 4, 1)) == 0.5
+
+    def test_load_different_keys(self, tmp_path):
+        value_table = ValueTable("value_table", KEYS)
+        path = str(tmp_path / "value_table.npy")
+        value_table.save(path)
+
+        try:
+            ValueTable("loaded", KEYS[:8]).load(path)
+            assert False
+        except ValueError:
+            pass
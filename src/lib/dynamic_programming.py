@@ -0,0 +1,129 @@
+import numpy as np
+
+
+def build_model(ALL_STATES, ACTIONS, transitions):
+    """build_model
+
+    Tabulate a known MDP into arrays of
+    - transition probabilities P[s, a, s']
+    - expected immediate rewards R[s, a]
+
+    transitions(state_key, action_index) lists the possible outcomes
+    as (probability, next_state_key, reward), where a next_state_key
+    of None means the episode is terminated
+
+    Arguments:
+      ALL_STATES {list} -- state_keys of all non-terminal states
+      ACTIONS {list} -- the actions, referred by action_index
+      transitions {function} -- the model of the environment
+
+    Returns:
+      P -- transition probabilities in shape (S, A, S)
+      R -- expected immediate rewards in shape (S, A)
+    """
+    state_index = {state_key: i for i, state_key in enumerate(ALL_STATES)}
+
+    P = np.zeros((len(ALL_STATES), len(ACTIONS), len(ALL_STATES)))
+    R = np.zeros((len(ALL_STATES), len(ACTIONS)))
+
+    for s, state_key in enumerate(ALL_STATES):
+        for a in range(len(ACTIONS)):
+            for (probability, next_state_key, reward) in transitions(state_key, a):
+                R[s, a] += probability * reward
+                if next_state_key is not None:
+                    P[s, a, state_index[next_state_key]] += probability
+
+    return P, R
+
+
+def policy_evaluation(P, R, policy, discount=1):
+    """policy_evaluation
+
+    Solve the Bellman expectation equation of a deterministic policy
+    V = R_pi + discount * P_pi V exactly as a linear system
+
+    the policy needs to terminate with probability 1 when discount=1
+
+    reference: RL by David Silver L3
+
+    Arguments:
+      policy {array} -- action_index of each state in shape (S,)
+
+    Returns:
+      action_values -- Q_pi in shape (S, A)
+      state_values -- V_pi in shape (S,)
+    """
+    states = np.arange(len(policy))
+
+    P_pi = P[states, policy]
+    R_pi = R[states, policy]
+
+    state_values = np.linalg.solve(np.eye(len(policy)) - discount * P_pi, R_pi)
+    action_values = R + discount * P @ state_values
+
+    return action_values, state_values
+
+
+def value_iteration(P, R, discount=1, threshold=1e-12, max_iterations=int(1e4)):
+    """value_iteration
+
+    Iterate the Bellman optimality backup
+    V(s) <- max_a R(s, a) + discount * sum_s' P(s, a, s') V(s')
+    synchronously for all states until the values stop changing
+
+    reference: RL by David Silver L3
+
+    Returns:
+      action_values -- Q* in shape (S, A)
+      state_values -- V* in shape (S,)
+    """
+    state_values = np.zeros(R.shape[0])
+
+    for _ in range(max_iterations):
+        action_values = R + discount * P @ state_values
+        updated_state_values = action_values.max(axis=1)
+
+        delta = np.amax(np.abs(updated_state_values - state_values))
+        state_values = updated_state_values
+
+        if delta < threshold:
+            break
+
+    action_values = R + discount * P @ state_values
+    state_values = action_values.max(axis=1)
+
+    return action_values, state_values
+
+
+def policy_iteration(P, R, discount=1, initial_policy=None, max_iterations=100):
+    """policy_iteration
+
+    Alternate exact policy_evaluation with greedy policy improvement
+    until the greedy policy stops changing
+
+    the initial policy needs to terminate when discount=1,
+    by default it is the action with the max immediate reward
+
+    reference: RL by David Silver L3
+
+    Returns:
+      action_values -- Q* in shape (S, A)
+      state_values -- V* in shape (S,)
+    """
+    policy = R.argmax(axis=1) if initial_policy is None else initial_policy
+
+    for _ in range(max_iterations):
+        action_values, state_values = policy_evaluation(P, R, policy, discount)
+        greedy_policy = action_values.argmax(axis=1)
+
+        # only update the states with strict improvement to avoid
+        # switching forever between actions of the same values
+        states = np.arange(len(policy))
+        improved = action_values[states, greedy_policy] > state_values + 1e-12
+
+        if not improved.any():
+            break
+
+        policy = np.where(improved, greedy_policy, policy)
+
+    return action_values, state_values
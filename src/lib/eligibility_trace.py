@@ -1,36 +1,182 @@
+import numpy as np
+
+
 class EligibilityTrace:
-    def __init__(self):
-        self.data = {}
+    """EligibilityTrace
+
+    Eligibility of visited keys, decayed by discount * lambda_value
+    at every update and incremented by 1 for the visited key
+
+    The decay is lazy, all keys share a global scale and only their
+    unscaled eligibility is stored, so each update is O(1)
+
+    Once the scale gets below renormalize_scale, it is folded into the
+    stored values and the keys with eligibility below threshold are dropped
+    """
+
+    def __init__(self, threshold=1e-6, renormalize_scale=1e-3):
+        self.threshold = threshold
+        self.renormalize_scale = renormalize_scale
+
+        self.scale = 1.0
+        self.unscaled = {}
 
     #
     # utility functions
     #
-    def init_if_not_found(self, key):
-        if key not in self.data.keys():
-            self.data[key] = 0
+    def renormalize(self):
+        self.unscaled = {
+            key: value * self.scale
+            for (key, value) in self.unscaled.items()
+            if value * self.scale >= self.threshold
+        }
+        self.scale = 1.0
 
     #
     # getter functions
     #
+    @property
+    def data(self):
+        return {key: value * self.scale for (key, value) in self.unscaled.items()}
+
     def get(self, key):
-        self.init_if_not_found(key)
-        return self.data[key]
+        return self.unscaled.get(key, 0) * self.scale
 
     def keys(self):
-        return self.data.keys()
+        return self.unscaled.keys()
 
     #
     # setter functions
     #
     def decay(self, discount=1, lambda_value=1):
         # decay the frequency weights if not visited
-        for key in self.data.keys():
-            self.data[key] *= discount * lambda_value
+        factor = discount * lambda_value
+
+        if factor == 0:
+            self.reset()
+            return
+
+        self.scale *= factor
+        if self.scale < self.renormalize_scale:
+            self.renormalize()
+
+    def update(self, key, discount=1, lambda_value=1):
+        self.decay(discount, lambda_value)
+        self.unscaled[key] = self.unscaled.get(key, 0) + 1 / self.scale
+
+    def reset(self):
+        self.scale = 1.0
+        self.unscaled = {}
+
+
+class ArrayEligibilityTrace(EligibilityTrace):
+    """ArrayEligibilityTrace
+
+    EligibilityTrace of the keys of a ValueTable,
+    stored by key id in a dense array with a list of live ids,
+    for ValueTable to learn all live ids at once
+    """
+
+    def __init__(self, value_table, threshold=1e-6, renormalize_scale=1e-3):
+        EligibilityTrace.__init__(self, threshold, renormalize_scale)
+
+        self.index = value_table.index
+        self.key = value_table.key
+
+        self.unscaled = np.zeros(value_table.size)
+        self.live_ids = []
+
+    #
+    # utility functions
+    #
+    def renormalize(self):
+        ids = self.ids()
+        values = self.unscaled[ids] * self.scale
+
+        self.unscaled[ids] = 0
+        kept = values >= self.threshold
+        self.unscaled[ids[kept]] = values[kept]
+
+        self.live_ids = ids[kept].tolist()
+        self.scale = 1.0
+
+    #
+    # getter functions
+    #
+    def ids(self):
+        return np.array(self.live_ids, dtype=int)
+
+    def eligibilities(self):
+        return self.unscaled[self.ids()] * self.scale
+
+    @property
+    def data(self):
+        return {
+            self.key(i): self.unscaled[i].item() * self.scale for i in self.live_ids
+        }
+
+    def get(self, key):
+        return self.unscaled[self.index(key)].item() * self.scale
+
+    def keys(self):
+        return [self.key(i) for i in self.live_ids]
 
+    #
+    # setter functions
+    #
     def update(self, key, discount=1, lambda_value=1):
         self.decay(discount, lambda_value)
-        self.init_if_not_found(key)
-        self.data[key] += 1
+
+        i = self.index(key)
+        if self.unscaled[i] == 0:
+            self.live_ids.append(i)
+        self.unscaled[i] += 1 / self.scale
+
+    def reset(self):
+        self.scale = 1.0
+        if len(self.live_ids) > 0:
+            self.unscaled[self.ids()] = 0
+        self.live_ids = []
+
+
+class WeightEligibilityTrace:
+    """WeightEligibilityTrace
+
+    Eligibility trace as a vector z over the weights of a ValueApproximator,
+    z = discount * lambda_value * z + x for the features x of visited keys
+
+    update() only records the visited key and the decay,
+    ValueApproximator.learn_with_eligibility_trace() decays z and
+    updates the weights in one O(d) step
+
+    With true_online, z is the dutch trace for the true online TD(lambda)
+    z = discount * lambda_value * z + (1 - step_size * decay * z.x) x
+    where decay = discount * lambda_value
+
+    reference: RL by Sutton & Barto, 12.5
+    """
+
+    def __init__(self, step_size=0.01, true_online=False):
+        self.step_size = step_size
+        self.true_online = true_online
+        self.reset()
+
+    #
+    # getter functions
+    #
+    def keys(self):
+        return [] if self.key is None else [self.key]
+
+    #
+    # setter functions
+    #
+    def update(self, key, discount=1, lambda_value=1):
+        self.key = key
+        self.decay_factor = discount * lambda_value
 
     def reset(self):
-        self.data = {}
+        self.z = np.array([])
+        # the last weight update, for true online TD(lambda)
+        self.delta_weights = np.array([])
+        self.key = None
+        self.decay_factor = 0
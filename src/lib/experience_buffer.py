@@ -0,0 +1,196 @@
+import numpy as np
+
+
+class ExperienceBuffer:
+    """ExperienceBuffer
+
+    A replay memory of episodes in preallocated columns of steps,
+    state_keys, action_indices and rewards instead of a list of
+    [state_key, action_index, reward] per step
+
+    With the default dtypes a step takes 17 bytes, an int32 (2,)
+    state_key, an int8 action_index and a float64 reward, or 13 bytes
+    with a state_shape of () for state ids of a KeyEncoder
+
+    Steps of an episode are contiguous, so an episode is a view of
+    the columns without copying. Once the capacity of steps is reached,
+    the oldest episodes are dropped as a ring buffer
+
+    Shuffles permute the order of episode ids, the columns are never moved
+
+    state_shape is (len(state_key),) for state_key tuples,
+    or () for the state ids of a KeyEncoder
+    """
+
+    def __init__(
+        self,
+        capacity,
+        state_shape=(2,),
+        state_dtype=np.int32,
+        action_dtype=np.int8,
+        reward_dtype=np.float64,
+    ):
+        self.capacity = capacity
+        self.state_shape = tuple(state_shape)
+
+        self.columns = {
+            "state_keys": np.zeros((capacity, *self.state_shape), dtype=state_dtype),
+            "action_indices": np.zeros(capacity, dtype=action_dtype),
+            "rewards": np.zeros(capacity, dtype=reward_dtype),
+        }
+
+        # episodes as a ring of (start, length) of their steps,
+        # each episode has at least one step
+        self.episode_starts = np.zeros(capacity, dtype=np.int64)
+        self.episode_lengths = np.zeros(capacity, dtype=np.int64)
+        self.first_episode = 0
+        self.size = 0
+
+        self.head = 0
+        self.step_count = 0
+
+        self.order = np.arange(0)
+
+    #
+    # utility functions
+    #
+    def slot(self, i):
+        return (self.first_episode + i) % self.capacity
+
+    def drop_while(self, condition):
+        while self.size > 0 and condition(self.episode_starts[self.first_episode]):
+            self.step_count -= self.episode_lengths[self.first_episode].item()
+            self.first_episode = self.slot(1)
+            self.size -= 1
+
+    #
+    # getter functions
+    #
+    def __len__(self):
+        return self.size
+
+    def episode(self, i):
+        """
+        the columns of the i-th episode as views
+        """
+        j = self.slot(i)
+        start = self.episode_starts[j]
+        stop = start + self.episode_lengths[j]
+
+        return {key: column[start:stop] for (key, column) in self.columns.items()}
+
+    def sequence(self, i):
+        """
+        the i-th episode as a sequence from playout()
+        """
+        episode = self.episode(i)
+        state_keys = episode["state_keys"].tolist()
+        if len(self.state_shape) > 0:
+            state_keys = [tuple(state_key) for state_key in state_keys]
+
+        return [
+            list(time_step)
+            for time_step in zip(
+                state_keys,
+                episode["action_indices"].tolist(),
+                episode["rewards"].tolist(),
+            )
+        ]
+
+    def sequences(self):
+        """
+        all episodes in the shuffled order as sequences from playout()
+        """
+        return [self.sequence(i) for i in self.order.tolist()]
+
+    def episode_batch(self, start=0, stop=None):
+        """
+        episodes order[start:stop] in padded arrays as from playout_batch(),
+        state_keys (N, T, ...), action_indices (N, T), rewards (N, T)
+        and lengths (N,), with action_indices of -1 for padded steps
+        """
+        ids = self.order[start:stop]
+        slots = self.slot(ids)
+
+        starts = self.episode_starts[slots]
+        lengths = self.episode_lengths[slots]
+        (N, T) = (len(ids), int(lengths.max()) if len(ids) > 0 else 0)
+
+        in_episode = np.arange(T) < lengths[:, None]
+        step_indices = (starts[:, None] + np.arange(T))[in_episode]
+
+        episode_batch = {
+            "state_keys": np.zeros((N, T, *self.state_shape), dtype=np.int32),
+            "action_indices": np.full((N, T), -1, dtype=np.int32),
+            "rewards": np.zeros((N, T)),
+            "lengths": lengths,
+        }
+        for (key, column) in self.columns.items():
+            episode_batch[key][in_episode] = column[step_indices]
+
+        return episode_batch
+
+    def episode_batches(self, batch_size):
+        """
+        padded mini batches of batch_size episodes in the shuffled order
+        """
+        for start in range(0, self.size, batch_size):
+            yield self.episode_batch(start, start + batch_size)
+
+    #
+    # setter functions
+    #
+    def add(self, episode):
+        """
+        add a sequence from playout(), dropping the oldest episodes
+        to make room for its steps
+        """
+        length = len(episode)
+        if length == 0:
+            return
+        if length > self.capacity:
+            raise ValueError(
+                f"episode of {length} steps over capacity {self.capacity}"
+            )
+
+        if self.head + length > self.capacity:
+            # not enough room at the end, wrap around to the start
+            # dropping the oldest episodes after the head
+            head = self.head
+            self.drop_while(lambda start: start >= head)
+            self.head = 0
+
+        head = self.head
+        self.drop_while(lambda start: head <= start < head + length)
+
+        (state_keys, action_indices, rewards) = zip(*episode)
+        self.columns["state_keys"][head : head + length] = state_keys
+        self.columns["action_indices"][head : head + length] = action_indices
+        self.columns["rewards"][head : head + length] = rewards
+
+        j = self.slot(self.size)
+        self.episode_starts[j] = head
+        self.episode_lengths[j] = length
+        self.size += 1
+
+        self.head += length
+        self.step_count += length
+        self.order = np.arange(self.size)
+
+    def extend(self, episodes):
+        for episode in episodes:
+            self.add(episode)
+
+    def shuffle(self, rng=None):
+        """
+        permute the order of episodes, without moving their steps
+        """
+        rng = np.random.default_rng() if rng is None else rng
+        self.order = rng.permutation(self.size)
+
+    def reset(self):
+        self.first_episode = 0
+        self.size = 0
+        self.head = 0
+        self.step_count = 0
+        self.order = np.arange(0)
@@ -0,0 +1,59 @@
+import numpy as np
+
+from functools import lru_cache
+
+
+class FeatureCache:
+    """FeatureCache
+
+    A drop-in input_parser evaluating a feature function once
+    over a finite space of keys, e.g. all (dealer, player, action_index),
+    into a contiguous read-only matrix with one row per key id
+
+    Keys out of the space fall back to an LRU memo of the feature function
+    """
+
+    def __init__(self, feature_function, keys, maxsize=1024):
+        self.feature_function = feature_function
+
+        self.ids = {tuple(key): i for i, key in enumerate(keys)}
+        self.matrix = np.array([feature_function(key) for key in self.ids], dtype=float)
+        self.matrix.flags.writeable = False
+
+        self.memo = lru_cache(maxsize=maxsize)(self.evaluate)
+
+    def evaluate(self, key):
+        features = np.array(self.feature_function(key), dtype=float)
+        features.flags.writeable = False
+        return features
+
+    #
+    # getter functions
+    #
+    def id(self, key):
+        return self.ids[tuple(key)]
+
+    def row(self, i):
+        return self.matrix[i]
+
+    def __call__(self, key):
+        key = tuple(key)
+        i = self.ids.get(key)
+        return self.memo(key) if i is None else self.matrix[i]
+
+    def many(self, keys):
+        """
+        feature matrix of a list of keys, in shape (n, feature size)
+        """
+        keys = [tuple(key) for key in keys]
+        ids = [self.ids.get(key) for key in keys]
+
+        if None not in ids:
+            return self.matrix[ids]
+
+        return np.array(
+            [
+                self.memo(key) if i is None else self.matrix[i]
+                for (key, i) in zip(keys, ids)
+            ]
+        )
@@ -0,0 +1,131 @@
+import numpy as np
+
+
+def action_key(state_key, action_index):
+    """
+    the key of a state-action, state_key + action_index for a state id
+    from KeyEncoder, otherwise the tuple (*state_key, action_index)
+    """
+    if isinstance(state_key, (int, np.integer)):
+        return state_key + action_index
+
+    return (*state_key, action_index)
+
+
+def action_keys(state_keys, action_indices):
+    """
+    vectorized action_key() for state_keys in an array of shape (n, k)
+    or state ids in shape (n,), and action_indices in shape (n,)
+    """
+    state_keys = np.asarray(state_keys)
+    action_indices = np.asarray(action_indices)
+    if state_keys.ndim == 1:
+        return state_keys + action_indices
+
+    return np.concatenate([state_keys, action_indices[:, None]], axis=1)
+
+
+class KeyEncoder:
+    """KeyEncoder
+
+    Dense integer ids of the states and state-actions of an environment,
+    for episodes to carry ids instead of tuples of state_key, so that
+    the innermost loops add integers instead of allocating and hashing tuples
+
+    States are laid out in the grid of their bounding box, with
+    the state id pre-multiplied by the number of actions, so that
+    the id of a state-action is state_id + action_index
+
+    The ids are the same as the key ids of a ValueTable of all
+    (*state_key, action_index), which can be indexed by them directly
+    """
+
+    def __init__(self, ACTIONS, ALL_STATES):
+        self.ACTIONS = ACTIONS
+        self.n_actions = len(ACTIONS)
+
+        states = np.array(list(ALL_STATES), dtype=int)
+
+        self.state_offset = states.min(axis=0).tolist()
+        self.state_shape = (states.max(axis=0) - states.min(axis=0) + 1).tolist()
+        self.size = int(np.prod(self.state_shape)) * self.n_actions
+
+        self.state_ids = {
+            tuple(state_key): self.encode_grid(state_key)
+            for state_key in states.tolist()
+        }
+
+    #
+    # utility functions
+    #
+    def encode_grid(self, state_key):
+        i = 0
+        for (k, offset, shape) in zip(state_key, self.state_offset, self.state_shape):
+            i = i * shape + k - offset
+        return i * self.n_actions
+
+    #
+    # getter functions
+    #
+    def encode_state(self, state_key):
+        return self.state_ids[state_key]
+
+    def encode_states(self, state_keys):
+        """
+        vectorized encode_state() for state_keys in an array of shape (n, k)
+        """
+        state_keys = np.asarray(state_keys, dtype=int)
+        grid_ids = np.ravel_multi_index(
+            tuple((state_keys - self.state_offset).T), tuple(self.state_shape)
+        )
+        return grid_ids * self.n_actions
+
+    def encode(self, key):
+        (*state_key, action_index) = key
+        return self.state_ids[tuple(state_key)] + action_index
+
+    def decode_state(self, state_id):
+        position = np.unravel_index(state_id // self.n_actions, self.state_shape)
+        return tuple(
+            int(p + offset) for (p, offset) in zip(position, self.state_offset)
+        )
+
+    def decode(self, i):
+        return (*self.decode_state(i - i % self.n_actions), i % self.n_actions)
+
+    def keys(self):
+        """
+        (*state_key, action_index) of all states in the order of their ids
+        """
+        return [
+            (*state_key, action_index)
+            for state_key in sorted(self.state_ids, key=self.state_ids.get)
+            for action_index in range(self.n_actions)
+        ]
+
+    #
+    # conversion functions
+    #
+    def encode_episode(self, episode):
+        return [
+            [self.encode_state(state_key), action_index, reward]
+            for [state_key, action_index, reward] in episode
+        ]
+
+    def decode_episode(self, episode):
+        return [
+            [self.decode_state(state_id), action_index, reward]
+            for [state_id, action_index, reward] in episode
+        ]
+
+    def state_policy(self, policy):
+        """
+        wrap a policy of state_key -> action_index
+        to be used on the state ids of encoded playouts
+        """
+
+        def _state_policy(state_id):
+            return policy(self.decode_state(state_id))
+
+        _state_policy.key_encoder = self
+        return _state_policy
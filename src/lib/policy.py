@@ -1,3 +1,5 @@
+import numpy as np
+
 from math import floor
 from random import random
 
@@ -24,20 +26,51 @@ def greedy_policy(state_key, ACTIONS, action_value_store):
       greedy_action_index -- the action_index of action with max action_value
       greedy_action_value -- the max action value at state s
     """
-    action_values = [
-        action_value_store.get((*state_key, action_index))
-        for action_index in range(len(ACTIONS))
-    ]
-    greedy_action_value = max(action_values)
-    greedy_action_index = action_values.index(greedy_action_value)
+    action_values = action_value_store.get_actions(state_key, ACTIONS)
+    greedy_action_index = int(action_values.argmax())
+    greedy_action_value = action_values[greedy_action_index].item()
     return greedy_action_index, greedy_action_value
 
 
+class GreedyActionCache:
+    """GreedyActionCache
+
+    A table of greedy_policy actions of visited states,
+    materialized from an action_value_store and cleared
+    once the store is updated (by its version) or replaced
+
+    While the store is not learning, e.g. between offline updates
+    at the end of episodes, acting greedily is a dict lookup
+    """
+
+    def __init__(self, ACTIONS):
+        self.ACTIONS = ACTIONS
+        self.actions = {}
+        self.store = None
+        self.version = None
+
+    def get(self, state_key, action_value_store):
+        if action_value_store is not self.store or (
+            action_value_store.version != self.version
+        ):
+            self.actions = {}
+            self.store = action_value_store
+            self.version = action_value_store.version
+
+        if state_key not in self.actions:
+            self.actions[state_key] = greedy_policy(
+                state_key, self.ACTIONS, action_value_store
+            )[0]
+
+        return self.actions[state_key]
+
+
 def e_greedy_policy(
     state_key,
     ACTIONS,
     action_value_store,
     exploration_rate=0.1,
+    greedy_action_cache=None,
 ):
     """Policy Function: state -> action_index
 
@@ -70,12 +103,75 @@ def e_greedy_policy(
 
     GLIE - Greedy in the Limit with Infinite Exploration
     reference: L5 RL by David Silver
-    """
 
-    greedy_action_index, _ = greedy_policy(state_key, ACTIONS, action_value_store)
+    * Greedy Action Cache
+    With a GreedyActionCache, the greedy action is only derived
+    from the action_value_store when it has been updated
+    """
 
     if random() < exploration_rate:
         random_action_index = floor(random() * len(ACTIONS))
         return random_action_index
-    else:
-        return greedy_action_index
+
+    if greedy_action_cache is not None:
+        return greedy_action_cache.get(state_key, action_value_store)
+
+    greedy_action_index, _ = greedy_policy(state_key, ACTIONS, action_value_store)
+    return greedy_action_index
+
+
+class GreedyTablePolicy:
+    """GreedyTablePolicy
+
+    A snapshot of the e_greedy_policy of an action_value_store
+    as a table of greedy actions by state id of a KeyEncoder,
+    to act on state_keys in arrays of shape (n, k) as in playout_batch()
+
+    The snapshot is a small array that can be pickled to other processes,
+    which act with their own rng set by with_rng()
+    """
+
+    def __init__(self, key_encoder, greedy_actions, exploration_rate=0, rng=None):
+        self.key_encoder = key_encoder
+        self.greedy_actions = np.asarray(greedy_actions, dtype=np.int8)
+        self.exploration_rate = exploration_rate
+        self.rng = np.random.default_rng() if rng is None else rng
+
+    def with_rng(self, rng):
+        return GreedyTablePolicy(
+            self.key_encoder, self.greedy_actions, self.exploration_rate, rng
+        )
+
+    def __call__(self, state_keys):
+        state_ids = self.key_encoder.encode_states(state_keys)
+        action_indices = self.greedy_actions[state_ids // self.key_encoder.n_actions]
+
+        if self.exploration_rate > 0:
+            exploring = self.rng.random(len(action_indices)) < self.exploration_rate
+            action_indices = np.where(
+                exploring,
+                self.rng.integers(
+                    0, self.key_encoder.n_actions, size=len(action_indices)
+                ),
+                action_indices,
+            )
+
+        return action_indices
+
+
+def greedy_table_policy(key_encoder, action_value_store, exploration_rate=0):
+    """
+    GreedyTablePolicy of the greedy actions of action_value_store
+    at all states of key_encoder, with values of all of them in one query
+    """
+    n_actions = key_encoder.n_actions
+
+    state_ids = np.array(sorted(key_encoder.state_ids.values()), dtype=int)
+    action_values = np.reshape(
+        action_value_store.get_many(key_encoder.keys()), (-1, n_actions)
+    )
+
+    greedy_actions = np.zeros(key_encoder.size // n_actions, dtype=np.int8)
+    greedy_actions[state_ids // n_actions] = action_values.argmax(axis=1)
+
+    return GreedyTablePolicy(key_encoder, greedy_actions, exploration_rate)
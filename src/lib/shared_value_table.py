@@ -0,0 +1,142 @@
+import sys
+import numpy as np
+
+from contextlib import ExitStack
+from multiprocessing import get_context, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+from .value_table import ValueTable
+
+
+def attach_shared_memory(name):
+    """
+    attach to the shared memory block of name without owning it,
+    so that the block is not unlinked when this process exits
+    """
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+
+    shared_memory = SharedMemory(name=name)
+    # before 3.13, attaching registers the block to the resource tracker
+    # which unlinks it at the exit of this process
+    resource_tracker.unregister(shared_memory._name, "shared_memory")
+    return shared_memory
+
+
+class SharedValueTable(ValueTable):
+    """SharedValueTable
+
+    A ValueTable with its arrays of count, value, mse, touched
+    and the version in one block of shared memory, for worker processes
+    to learn the same table, e.g. passed as an argument of a Process
+
+    Updates of a key are read-modify-write, by default lock-free
+    (Hogwild), where updates of workers at the same key can be lost.
+    With lock_stripes > 0, key ids are guarded by lock_stripes locks,
+    key id i by the lock i % lock_stripes
+
+    The process creating the table owns the block, call unlink()
+    once all workers are done
+    """
+
+    def __init__(self, name, keys, lock_stripes=0, context=None):
+        ValueTable.__init__(self, name, keys)
+
+        # for workers to be started by, with the locks
+        self.context = get_context("spawn") if context is None else context
+        self.locks = [self.context.Lock() for _ in range(lock_stripes)]
+
+        self.shared_memory = SharedMemory(create=True, size=self.block_size())
+        self.attach_arrays()
+        for array in [*self.arrays.values(), self.shared_version, self.touched]:
+            array.fill(0)
+
+    #
+    # utility functions
+    #
+    def attach_arrays(self):
+        block = np.ndarray(
+            self.block_size(), dtype=np.uint8, buffer=self.shared_memory.buf
+        )
+        (self.arrays, self.shared_version, self.touched) = self.block_arrays(block)
+
+    def __getstate__(self):
+        # attach to the shared block by name instead of copying the arrays
+        state = self.__dict__.copy()
+        for key in ["shared_memory", "arrays", "shared_version", "touched", "context"]:
+            del state[key]
+        state["shared_memory_name"] = self.shared_memory.name
+        return state
+
+    def __setstate__(self, state):
+        shared_memory_name = state.pop("shared_memory_name")
+        self.__dict__.update(state)
+        self.context = None
+        self.shared_memory = attach_shared_memory(shared_memory_name)
+        self.attach_arrays()
+
+    def locked(self, indices):
+        """
+        a context holding the locks of the stripes of indices,
+        acquired in order, nothing to hold if lock-free
+        """
+        stack = ExitStack()
+        if len(self.locks) > 0:
+            stripes = np.unique(np.asarray(indices) % len(self.locks))
+            for stripe in stripes.tolist():
+                stack.enter_context(self.locks[stripe])
+        return stack
+
+    def to_value_table(self):
+        """
+        a ValueTable of a copy of the arrays in private memory
+        """
+        value_table = ValueTable(self.name, [self.key(0), self.key(self.size - 1)])
+        for (value_key, array) in self.arrays.items():
+            np.copyto(value_table.arrays[value_key], array)
+        np.copyto(value_table.touched, self.touched)
+        value_table.version = self.version
+        return value_table
+
+    def close(self):
+        self.shared_memory.close()
+
+    def unlink(self):
+        self.shared_memory.close()
+        self.shared_memory.unlink()
+
+    #
+    # getter functions
+    #
+    @property
+    def version(self):
+        return self.shared_version[0].item()
+
+    @version.setter
+    def version(self, version):
+        # ValueStore.__init__ sets the version before the block exists
+        if hasattr(self, "shared_version"):
+            self.shared_version[0] = version
+
+    #
+    # setter functions
+    #
+    def set(self, key, value):
+        with self.locked([self.index(key)]):
+            ValueTable.set(self, key, value)
+
+    def learn(self, key, sample, step_size=lambda count: 1 / count):
+        with self.locked([self.index(key)]):
+            ValueTable.learn(self, key, sample, step_size=step_size)
+
+    def learn_indices(self, indices, samples, step_size=None):
+        with self.locked(indices):
+            ValueTable.learn_indices(self, indices, samples, step_size=step_size)
+
+    def learn_with_eligibility_trace(self, eligibility_trace, sample):
+        if hasattr(eligibility_trace, "eligibilities"):
+            with self.locked(eligibility_trace.ids()):
+                ValueTable.learn_with_eligibility_trace(self, eligibility_trace, sample)
+            return
+
+        ValueTable.learn_with_eligibility_trace(self, eligibility_trace, sample)
@@ -1,6 +1,6 @@
 import numpy as np
 
-from .value_store import ValueStore
+from .value_store import ValueStore, copy_parameters
 
 
 class ValueApproximator(ValueStore):
@@ -15,12 +15,25 @@ class ValueApproximator(ValueStore):
     as a position in the state space
 
     feature function: input values -> features
+
+    Sparse features:
+    with a feature_size, the feature function returns only
+    the active indices, or a 2-tuple of arrays (active indices, values),
+    and get/learn only read and update the weights of those indices
+
+    the active indices of an input should be unique
     """
 
-    def __init__(self, name, input_parser=lambda x: x):
+    def __init__(self, name, input_parser=lambda x: x, feature_size=None):
         ValueStore.__init__(self, name)
 
         self.input_parser = input_parser
+        # sparse feature functions carry their size, see sparse_feature()
+        self.feature_size = (
+            getattr(input_parser, "feature_size", None)
+            if feature_size is None
+            else feature_size
+        )
 
         self.weights = np.array([])
         self._weights = np.array([])
@@ -33,8 +46,58 @@ class ValueApproximator(ValueStore):
     #
     def init_weights_if_not_yet(self, features):
         if self.weights.size == 0:
+            shape = features.shape if self.feature_size is None else self.feature_size
             # initial weights between [-1,1)
-            self.weights = 2 * np.random.random_sample(features.shape) - 1
+            self.weights = 2 * np.random.random_sample(shape) - 1
+            self.version += 1
+
+    def feature_matrix(self, inputs):
+        """
+        dense features of a list of inputs in shape (n, feature size)
+        """
+        # a FeatureCache serves the feature matrix in one lookup
+        return (
+            self.input_parser.many(inputs)
+            if hasattr(self.input_parser, "many")
+            else np.array([self.input_parser(input) for input in inputs], dtype=float)
+        )
+
+    def sparse_feature_matrix(self, inputs):
+        """
+        sparse features of a list of inputs in coordinates (rows, indices, values)
+        """
+        features = [self.parse_sparse(input) for input in inputs]
+        self.init_weights_if_not_yet(features[0])
+
+        sizes = [len(active_indices) for (active_indices, _) in features]
+        rows = np.repeat(np.arange(len(features)), sizes)
+        indices = np.concatenate([active_indices for (active_indices, _) in features])
+        values = np.concatenate([active_values for (_, active_values) in features])
+
+        return rows, indices, values
+
+    def parse_sparse(self, input):
+        """
+        (active indices, values) of the sparse features of input,
+        from a 2-tuple of arrays of active indices and values,
+        otherwise the active indices of binary features
+        """
+        features = self.input_parser(input)
+
+        if (
+            isinstance(features, tuple)
+            and len(features) == 2
+            and all(np.ndim(part) == 1 for part in features)
+        ):
+            (indices, values) = features
+            if len(indices) != len(values):
+                raise ValueError(
+                    f"{len(indices)} active indices for {len(values)} values"
+                )
+            return (np.asarray(indices, dtype=int), np.asarray(values, dtype=float))
+
+        indices = np.asarray(features, dtype=int)
+        return (indices, np.ones(len(indices)))
 
     #
     # getter functions
@@ -43,11 +106,32 @@ class ValueApproximator(ValueStore):
         """
         can be regarded as the output layer
         """
-        features = np.array(self.input_parser(input))
+        if self.feature_size is not None:
+            features = self.parse_sparse(input)
+            self.init_weights_if_not_yet(features)
+            (indices, values) = features
+            value = np.dot(values, self.weights[indices])
+            return (value, features) if output_features else value
+
+        features = np.asarray(self.input_parser(input))
         self.init_weights_if_not_yet(features)
         value = np.dot(np.transpose(features), self.weights)
         return (value, features) if output_features else value
 
+    def get_many(self, inputs):
+        """
+        values of a list of inputs, from the feature matrix x weights
+        """
+        if self.feature_size is not None:
+            (rows, indices, values) = self.sparse_feature_matrix(inputs)
+            return np.bincount(
+                rows, weights=values * self.weights[indices], minlength=len(inputs)
+            )
+
+        features = self.feature_matrix(inputs)
+        self.init_weights_if_not_yet(features[0])
+        return features @ self.weights
+
     #
     # setter functions
     #
@@ -57,33 +141,140 @@ class ValueApproximator(ValueStore):
         # O(weights) = E[(target - features * weights)**2]
         # Nabla_{w}O(w) = -2 * features
         # we take gradient = -0.5* step_size * error * Nabla_{w}O(w) = features
-        derivative = features
         error = sample_target - value
-        gradient = error * derivative
         learning_rate = (
             step_size() if isinstance(type(step_size), type(lambda: 0)) else step_size
         )
+
+        if self.feature_size is not None:
+            # the gradient is zero except on the active indices
+            (indices, values) = features
+            self.weights[indices] += learning_rate * error * values
+            self.version += 1
+            return
+
+        derivative = features
+        gradient = error * derivative
         self.weights += learning_rate * gradient
+        self.version += 1
 
-    def batch_learn(self, evaluations, step_size=0.01):
-        for (sample_key, sample_return) in evaluations:
-            self.learn(sample_key, sample_return, step_size=step_size)
+    def batch_learn(self, evaluations, step_size=0.01, average=False):
+        """
+        minibatch gradient descent on the squared error of all evaluations
+        with the weights fixed within the batch
+
+        w += step_size * X^T (y - Xw), or divided by the batch size
+        when average=True, as the gradient of the mean squared error
+        """
+        if len(evaluations) == 0:
+            return
+
+        sample_inputs = [sample_key for (sample_key, _) in evaluations]
+        sample_targets = np.array(
+            [sample_return for (_, sample_return) in evaluations], dtype=float
+        )
+        learning_rate = (
+            step_size() if isinstance(type(step_size), type(lambda: 0)) else step_size
+        )
+        if average:
+            learning_rate /= len(evaluations)
+
+        if self.feature_size is not None:
+            (rows, indices, values) = self.sparse_feature_matrix(sample_inputs)
+            sample_values = np.bincount(
+                rows,
+                weights=values * self.weights[indices],
+                minlength=len(sample_inputs),
+            )
+            errors = sample_targets - sample_values
+            self.weights += learning_rate * np.bincount(
+                indices, weights=values * errors[rows], minlength=self.feature_size
+            )
+        else:
+            features = self.feature_matrix(sample_inputs)
+            self.init_weights_if_not_yet(features[0])
+            errors = sample_targets - features @ self.weights
+            self.weights += learning_rate * (features.T @ errors)
+
+        self.version += 1
 
     def learn_with_eligibility_trace(
         self,
         eligibility_trace,
         sample,
+        step_size=0.01,
     ):
+        if hasattr(eligibility_trace, "z"):
+            self.learn_with_weight_eligibility_trace(eligibility_trace, sample)
+            return
+
         for key in eligibility_trace.keys():
             eligibility = eligibility_trace.get(key)
-            self.learn(key, sample, step_size=eligibility * 0.01)
+            self.learn(key, sample, step_size=eligibility * step_size)
+
+    def learn_with_weight_eligibility_trace(self, trace, sample):
+        """
+        backward TD(lambda) with a WeightEligibilityTrace, where sample
+        is the td_target of the last key updated in the trace
+        """
+        features = self.dense_features(trace.key)
+        value = np.dot(features, self.weights)
+        learning_rate = trace.step_size
+
+        if trace.z.size == 0:
+            trace.z = np.zeros_like(self.weights)
+            trace.delta_weights = np.zeros_like(self.weights)
+
+        error = sample - value
+
+        if trace.true_online:
+            trace_features = np.dot(trace.z, features)
+            trace.z *= trace.decay_factor
+            trace.z += (
+                1 - learning_rate * trace.decay_factor * trace_features
+            ) * features
+            # the value of the key before the last update of the weights
+            value_change = np.dot(trace.delta_weights, features)
+            delta_weights = learning_rate * (
+                (error + value_change) * trace.z - value_change * features
+            )
+        else:
+            trace.z *= trace.decay_factor
+            trace.z += features
+            delta_weights = learning_rate * error * trace.z
+
+        self.weights += delta_weights
+        trace.delta_weights = delta_weights
+        self.version += 1
+
+    def dense_features(self, input):
+        """
+        features of input as a dense vector of the size of weights
+        """
+        if self.feature_size is None:
+            (_, features) = self.get(input, output_features=True)
+            return np.asarray(features, dtype=float)
+
+        (indices, values) = self.parse_sparse(input)
+        self.init_weights_if_not_yet((indices, values))
+        features = np.zeros(self.feature_size)
+        features[indices] += values
+        return features
 
     def backup(self):
-        self._weights = np.copy(self.weights)
+        self._weights = copy_parameters(self.weights, self._weights)
+
+    def get_parameters(self):
+        return self.weights
+
+    def set_parameters(self, parameters):
+        self.weights = copy_parameters(parameters, self.weights)
+        self.version += 1
 
     def reset(self):
         self.weights = np.array([])
         self._weights = np.array([])
+        self.version += 1
 
     #
     # metrics functions
@@ -114,9 +305,16 @@ class ValueApproximator(ValueStore):
     # file I/O functions
     #
     def save(self, path):
-        with open(path, "w") as f:
+        """
+        binary .npy checkpoint of the weights
+        """
+        with open(path, "wb") as f:
             np.save(f, self.weights)
 
-    def load(self, path):
-        with open(path, "r") as f:
-            self.weights = np.load(f)
+    def load(self, path, mmap_mode=None):
+        """
+        with mmap_mode, the weights are a view of the file, e.g. "r"
+        for workers evaluating a fixed approximator from the same pages
+        """
+        self.weights = np.load(path, mmap_mode=mmap_mode)
+        self.version += 1
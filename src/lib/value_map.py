@@ -69,6 +69,7 @@ class ValueMap(ValueStore):
         self.init_if_not_found(key)
 
         self.data[key]["value"] = value
+        self.version += 1
 
     def learn(
         self,
@@ -90,11 +91,41 @@ class ValueMap(ValueStore):
         # TODO: effect of using step_size on mse needs to be further confirmed
         # for the case of using eligibility
         d["mse"] += step_size(d["count"]) * mse_error
+        self.version += 1
 
     def batch_learn(self, evaluations, step_size=lambda count: 1 / count):
         for (sample_key, sample_return) in evaluations:
             self.learn(sample_key, sample_return, step_size=step_size)
 
+    def merge(self, other_value_map):
+        """
+        merge the (count, value, mse) of each key of other_value_map,
+        the same as learning its samples here with step_size of 1 / count,
+        by the parallel algorithm of Chan et al.
+
+        mse is the running mean of error * error_after from learn(),
+        i.e. the variance of the samples for a step_size of 1 / count
+        """
+        for (key, b) in other_value_map.data.items():
+            if b["count"] == 0:
+                continue
+
+            self.init_if_not_found(key)
+            a = self.data[key]
+
+            total = a["count"] + b["count"]
+            delta = b["value"] - a["value"]
+
+            a["value"] += delta * b["count"] / total
+            a["mse"] = (
+                a["mse"] * a["count"]
+                + b["mse"] * b["count"]
+                + delta**2 * a["count"] * b["count"] / total
+            ) / total
+            a["count"] = total
+
+        self.version += 1
+
     def learn_with_eligibility_trace(
         self,
         eligibility_trace,
@@ -118,6 +149,7 @@ class ValueMap(ValueStore):
     def reset(self):
         self.data = {}
         self._data = {}
+        self.version += 1
 
     #
     # metrics functions
@@ -227,15 +259,66 @@ class ValueMap(ValueStore):
             hue=hue_key,
         )
 
+    #
+    # conversion functions
+    #
+    def to_records(self):
+        keys = np.array(list(self.data.keys()), dtype=np.int64)
+        records = np.zeros(
+            len(keys),
+            dtype=[
+                ("key", np.int64, keys.shape[1:]),
+                ("count", np.int64),
+                ("value", float),
+                ("mse", float),
+            ],
+        )
+
+        records["key"] = keys
+        for value_key in ["count", "value", "mse"]:
+            records[value_key] = [d[value_key] for d in self.data.values()]
+
+        return records
+
+    def from_records(self, records):
+        keys = records["key"].tolist()
+        if records["key"].ndim > 1:
+            keys = [tuple(key) for key in keys]
+
+        columns = [
+            records[value_key].tolist() for value_key in ["count", "value", "mse"]
+        ]
+        self.data = {
+            key: {"count": count, "value": value, "mse": mse}
+            for (key, count, value, mse) in zip(keys, *columns)
+        }
+        self.version += 1
+
     #
     # file I/O functions
     #
     def save(self, path):
+        """
+        JSON of str(key) by default, or a binary structured array
+        of key, count, value and mse for a .npy path
+        """
+        if path.endswith(".npy"):
+            np.save(path, self.to_records())
+            return
+
         with open(path, "w") as fp:
             string_key_data = {str(key): self.data[key] for key in self.data.keys()}
             json.dump(string_key_data, fp, sort_keys=True, indent=4)
 
     def load(self, path):
+        """
+        JSON, or the binary structured array for a .npy path,
+        copied into the dict of the map
+        """
+        if path.endswith(".npy"):
+            self.from_records(np.load(path))
+            return
+
         with open(path, "r") as fp:
             string_key_data = json.load(fp)
             tuple_key_data = {
@@ -243,3 +326,25 @@ class ValueMap(ValueStore):
                 for key in string_key_data.keys()
             }
             self.data = tuple_key_data
+            self.version += 1
+
+
+def merge_value_maps(value_maps, name=None):
+    """
+    a new ValueMap of all samples learnt by value_maps,
+    merged in pairs as a tree to keep the counts of merges balanced
+    """
+    name = value_maps[0].name if name is None else name
+
+    level = []
+    for value_map in value_maps:
+        merged = ValueMap(name)
+        merged.merge(value_map)
+        level.append(merged)
+
+    while len(level) > 1:
+        for (a, b) in zip(level[0::2], level[1::2]):
+            a.merge(b)
+        level = level[0::2]
+
+    return level[0]
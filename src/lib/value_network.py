@@ -1,9 +1,8 @@
 import numpy as np
 
-from copy import deepcopy
 from micrograd.nn import MLP
 
-from .value_store import ValueStore
+from .value_store import ValueStore, copy_parameters, input_layer_size
 
 
 class ValueNetwork(ValueStore):
@@ -30,7 +29,11 @@ class ValueNetwork(ValueStore):
         self.network_size = network_size
 
         self.network = None
-        self._network = None
+        # flat snapshot of network.parameters() by backup()
+        self._parameters = None
+        # (weights, biases, nonlin) of the layers for get_many() at a version
+        self._layer_matrices = None
+        self._layer_matrices_version = None
 
         self.metrics.register("diff", self.diff)
         self.metrics.register("compare", self.compare)
@@ -43,6 +46,40 @@ class ValueNetwork(ValueStore):
         if self.network is None:
             input_layer_size = len(parsed_input)
             self.network = MLP(input_layer_size, self.network_size)
+            self.version += 1
+
+    def layer_matrices(self):
+        """
+        (weights, biases, nonlin) of all layers as arrays, gathered
+        from the micrograd Values once until the version is updated
+        """
+        if self._layer_matrices_version != self.version:
+            self._layer_matrices = [
+                (
+                    np.array([[w.data for w in n.w] for n in layer.neurons]),
+                    np.array([n.b.data for n in layer.neurons]),
+                    layer.neurons[0].nonlin,
+                )
+                for layer in self.network.layers
+            ]
+            self._layer_matrices_version = self.version
+
+        return self._layer_matrices
+
+    @property
+    def _network(self):
+        """
+        the backup network, rebuilt from the snapshot when inspected
+        """
+        if self._parameters is None:
+            return None
+
+        input_layer_size = len(self.network.layers[0].neurons[0].w)
+        network = MLP(input_layer_size, self.network_size)
+        for (p, data) in zip(network.parameters(), self._parameters.tolist()):
+            p.data = data
+
+        return network
 
     #
     # getter functions
@@ -56,6 +93,22 @@ class ValueNetwork(ValueStore):
         value = self.network(parsed_input)
         return value if output_gradable else value.data
 
+    def get_many(self, inputs):
+        """
+        values of a list of inputs, in one forward pass of
+        the parameters of all layers as matrices
+        """
+        parsed_inputs = [self.input_parser(input) for input in inputs]
+        self.init_network_if_not_yet(parsed_inputs[0])
+
+        x = np.array(parsed_inputs, dtype=float)
+        for (weights, biases, nonlin) in self.layer_matrices():
+            x = x @ weights.T + biases
+            if nonlin:
+                x = np.maximum(x, 0)
+
+        return x[:, 0]
+
     #
     # setter functions
     #
@@ -72,27 +125,43 @@ class ValueNetwork(ValueStore):
 
         for p in self.network.parameters():
             p.data -= learning_rate * p.grad
+        self.version += 1
 
     def batch_learn(self, evaluations, step_size=0.01):
         for (sample_key, sample_return) in evaluations:
             self.learn(sample_key, sample_return, step_size=step_size)
 
     def backup(self):
-        self._network = deepcopy(self.network)
+        if self.network is not None:
+            self._parameters = copy_parameters(
+                self.get_parameters(), self._parameters
+            )
 
     def reset(self):
         self.network = None
-        self._network = None
+        self._parameters = None
+        self.version += 1
+
+    def get_parameters(self):
+        """
+        parameters of the micrograd network gathered in a flat array
+        """
+        return np.array([p.data for p in self.network.parameters()])
+
+    def set_parameters(self, parameters):
+        for (p, data) in zip(self.network.parameters(), list(parameters)):
+            p.data = float(data)
+        self.version += 1
 
     #
     # metrics functions
     #
     def diff(self, backup=True):
-        if self._network is None:
+        if self._parameters is None:
             return 1
 
-        _parameters = np.array([p.data for p in self._network.parameters()])
-        parameters = np.array([p.data for p in self.network.parameters()])
+        _parameters = self._parameters
+        parameters = self.get_parameters()
         mse = (np.square(parameters - _parameters)).mean(axis=0)
         rmse = np.sqrt(mse)
         value_range = np.amax(parameters) - min(np.amin(parameters), 0)
@@ -110,3 +179,19 @@ class ValueNetwork(ValueStore):
             sq_error += error**2
 
         return np.sqrt(sq_error / len(value_map.keys()))
+
+    #
+    # file I/O functions
+    #
+    def save(self, path):
+        """
+        binary .npy checkpoint of the flat parameters
+        """
+        np.save(path, self.get_parameters())
+
+    def load(self, path):
+        parameters = np.load(path)
+        input_size = input_layer_size(len(parameters), self.network_size)
+
+        self.init_network_if_not_yet(np.zeros(input_size))
+        self.set_parameters(parameters)
@@ -1,6 +1,6 @@
 import numpy as np
 
-from .value_store import ValueStore
+from .value_store import ValueStore, copy_parameters, input_layer_size
 from src.nn.mlp_gpu import MLP
 
 
@@ -30,7 +30,8 @@ class ValueNetworkGPU(ValueStore):
         self.gpu = gpu
 
         self.network = None
-        self._network = None
+        # flat snapshot of network.parameters by backup()
+        self._parameters = None
 
         self.metrics.register("diff", self.diff)
         self.metrics.register("compare", self.compare)
@@ -43,6 +44,20 @@ class ValueNetworkGPU(ValueStore):
         if self.network is None:
             input_layer_size = len(parsed_input)
             self.network = MLP(input_layer_size, self.network_size, gpu=self.gpu)
+            self.version += 1
+
+    @property
+    def _network(self):
+        """
+        the backup network, rebuilt from the snapshot when inspected
+        """
+        if self._parameters is None:
+            return None
+
+        network = MLP(self.network.input_size, self.network_size, gpu=self.gpu)
+        network.load_parameters(self._parameters)
+
+        return network
 
     #
     # getter functions
@@ -56,41 +71,56 @@ class ValueNetworkGPU(ValueStore):
         value = self.network([parsed_input])
         return value.cpu().data[0][0]
 
+    def get_many(self, inputs):
+        """
+        for getting the values of a list of inputs in one forward pass
+        """
+        parsed_inputs = [self.input_parser(input) for input in inputs]
+        self.init_network_if_not_yet(parsed_inputs[0])
+        values = self.network(parsed_inputs)
+        return values.cpu().data[:, 0]
+
     #
     # setter functions
     #
 
     def learn(self, sample_input, sample_target, step_size=0.01):
         self.network.learn([sample_input], [[sample_target]], step_size=step_size)
+        self.version += 1
 
     def batch_learn(self, evaluations, step_size=0.01):
         sample_inputs = [sample_key for (sample_key, _) in evaluations]
         sample_targets = [[sample_return] for (_, sample_return) in evaluations]
         self.network.learn(sample_inputs, sample_targets, step_size=step_size)
+        self.version += 1
 
     def backup(self):
         if self.network is not None:
-
-            network = self.network
-
-            _network = MLP(network.input_size, network.network_size)
-            _network.layers = network.clone()
-
-            self._network = _network
+            self._parameters = copy_parameters(
+                self.network.parameters, self._parameters
+            )
 
     def reset(self):
         self.network = None
-        self._network = None
+        self._parameters = None
+        self.version += 1
+
+    def get_parameters(self):
+        return self.network.parameters
+
+    def set_parameters(self, parameters):
+        self.network.load_parameters(parameters)
+        self.version += 1
 
     #
     # metrics functions
     #
     def diff(self, backup=True):
-        if self._network is None:
+        if self._parameters is None:
             return 1
 
-        parameters = np.array(self.network.flatten_weights)
-        _parameters = np.array(self._network.flatten_weights)
+        parameters = self.network.parameters
+        _parameters = self._parameters
 
         mse = (np.square(parameters - _parameters)).mean(axis=0)
         rmse = np.sqrt(mse)
@@ -109,3 +139,19 @@ class ValueNetworkGPU(ValueStore):
             sq_error += error**2
 
         return np.sqrt(sq_error / len(value_map.keys()))
+
+    #
+    # file I/O functions
+    #
+    def save(self, path):
+        """
+        binary .npy checkpoint of the flat parameters
+        """
+        np.save(path, self.get_parameters())
+
+    def load(self, path):
+        parameters = np.load(path)
+        input_size = input_layer_size(len(parameters), self.network_size)
+
+        self.init_network_if_not_yet(np.zeros(input_size))
+        self.set_parameters(parameters)
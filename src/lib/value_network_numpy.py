@@ -0,0 +1,164 @@
+import numpy as np
+
+from .value_store import ValueStore, copy_parameters, input_layer_size
+from src.nn.mlp import MLP
+
+
+class ValueNetworkNumpy(ValueStore):
+    """ValueNetworkNumpy
+
+    A model to store trainable parameters
+    to output values from features
+
+    The same as ValueNetwork, on a numpy MLP
+    learning minibatches in matrices instead of
+    building a graph of scalar values per sample
+
+    feature function: input values -> features
+    """
+
+    def __init__(
+        self,
+        name,
+        input_parser=lambda x: x,
+        network_size=[4, 4, 1],
+    ):
+        ValueStore.__init__(self, name)
+
+        self.input_parser = input_parser
+        self.network_size = network_size
+
+        self.network = None
+        # flat snapshot of network.parameters by backup()
+        self._parameters = None
+
+        self.metrics.register("diff", self.diff)
+        self.metrics.register("compare", self.compare)
+
+    #
+    # utility functions
+    #
+    def init_network_if_not_yet(self, parsed_input):
+        if self.network is None:
+            input_layer_size = len(parsed_input)
+            self.network = MLP(input_layer_size, self.network_size)
+            self.version += 1
+
+    @property
+    def _network(self):
+        """
+        the backup network, as views of the snapshot without copying
+        """
+        if self._parameters is None:
+            return None
+
+        return MLP(self.network.input_size, self.network_size, self._parameters)
+
+    def parse_inputs(self, inputs):
+        parsed_inputs = np.array(
+            [self.input_parser(input) for input in inputs], dtype=float
+        )
+        self.init_network_if_not_yet(parsed_inputs[0])
+        return parsed_inputs
+
+    #
+    # getter functions
+    #
+    def get(self, input):
+        return self.get_many([input])[0].item()
+
+    def get_many(self, inputs):
+        parsed_inputs = self.parse_inputs(inputs)
+        return self.network(parsed_inputs)[:, 0]
+
+    #
+    # setter functions
+    #
+    def learn(self, sample_input, sample_target, step_size=0.01):
+        self.batch_learn([(sample_input, sample_target)], step_size=step_size)
+
+    def batch_learn(self, evaluations, step_size=0.01, average=False):
+        """
+        minibatch gradient descent on the squared error of all evaluations,
+        summed or averaged over the batch
+        """
+        if len(evaluations) == 0:
+            return
+
+        sample_inputs = self.parse_inputs(
+            [sample_key for (sample_key, _) in evaluations]
+        )
+        sample_targets = [sample_return for (_, sample_return) in evaluations]
+
+        learning_rate = (
+            step_size() if isinstance(type(step_size), type(lambda: 0)) else step_size
+        )
+        if average:
+            learning_rate /= len(evaluations)
+
+        self.network.learn(sample_inputs, sample_targets, step_size=learning_rate)
+        self.version += 1
+
+    def backup(self):
+        if self.network is not None:
+            self._parameters = copy_parameters(
+                self.network.parameters, self._parameters
+            )
+
+    def reset(self):
+        self.network = None
+        self._parameters = None
+        self.version += 1
+
+    def get_parameters(self):
+        return self.network.parameters
+
+    def set_parameters(self, parameters):
+        np.copyto(self.network.parameters, parameters)
+        self.version += 1
+
+    #
+    # metrics functions
+    #
+    def diff(self, backup=True):
+        if self._parameters is None:
+            return 1
+
+        parameters = self.network.parameters
+        _parameters = self._parameters
+        mse = (np.square(parameters - _parameters)).mean(axis=0)
+        rmse = np.sqrt(mse)
+        value_range = np.amax(parameters) - min(np.amin(parameters), 0)
+
+        if backup:
+            self.backup()
+
+        return rmse / value_range
+
+    def compare(self, value_map):
+        keys = list(value_map.keys())
+        values = self.get_many(keys)
+        other_values = np.array([value_map.get(key) for key in keys])
+
+        return np.sqrt(np.mean(np.square(values - other_values)))
+
+    #
+    # file I/O functions
+    #
+    def save(self, path):
+        """
+        binary .npy checkpoint of the flat parameters
+        """
+        np.save(path, self.network.parameters)
+
+    def load(self, path, mmap_mode=None):
+        """
+        with mmap_mode, the MLP is built on a view of the parameters
+        in the file, read-only with "r", learning needs "c" or None
+        """
+        parameters = np.load(path, mmap_mode=mmap_mode)
+        input_size = input_layer_size(len(parameters), self.network_size)
+
+        self.network = MLP(input_size, self.network_size, parameters)
+        self._parameters = None
+        self.version += 1
@@ -1,3 +1,6 @@
+import numpy as np
+
+from .key_encoder import action_key
 from .metrics import Metrics
 
 
@@ -12,3 +15,70 @@ class ValueStore:
     def __init__(self, name):
         self.name = name
         self.metrics = Metrics(name)
+        # incremented by every update of the values, for caches of
+        # values or greedy actions to check if they are outdated
+        self.version = 0
+
+    def get_many(self, keys):
+        """
+        values of a list of keys in an array,
+        to be overridden by a single lookup or forward pass
+        """
+        return np.array(
+            [
+                self.get(key if isinstance(key, (int, np.integer)) else tuple(key))
+                for key in keys
+            ],
+            dtype=float,
+        )
+
+    def get_actions(self, state_key, ACTIONS):
+        """
+        values of all actions at state_key, indexed by action_index
+        """
+        return self.get_many(
+            [
+                action_key(state_key, action_index)
+                for action_index in range(len(ACTIONS))
+            ]
+        )
+
+    def batch_learn_arrays(self, sample_keys, sample_returns, **kwargs):
+        """
+        batch_learn from keys in an array of shape (n, k),
+        or key ids in shape (n,), and returns in shape (n,)
+        """
+        sample_keys = np.asarray(sample_keys)
+        keys = sample_keys.tolist()
+        if sample_keys.ndim > 1:
+            keys = [tuple(sample_key) for sample_key in keys]
+
+        evaluations = list(zip(keys, np.asarray(sample_returns).tolist()))
+        self.batch_learn(evaluations, **kwargs)
+
+
+def copy_parameters(parameters, buffer=None):
+    """
+    snapshot flat parameters into the memory of buffer when it has
+    the same shape, otherwise into a new contiguous array
+    """
+    if buffer is not None and buffer.shape == parameters.shape:
+        np.copyto(buffer, parameters)
+        return buffer
+
+    return np.array(parameters, dtype=float)
+
+
+def input_layer_size(parameter_count, network_size):
+    """
+    input size of an MLP of network_size from the count of its parameters,
+    to init the network of a loaded checkpoint
+    """
+    later_layer_count = sum(
+        [
+            in_size * out_size + out_size
+            for (in_size, out_size) in zip(network_size[:-1], network_size[1:])
+        ]
+    )
+
+    return (parameter_count - later_layer_count - network_size[0]) // network_size[0]
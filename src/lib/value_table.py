@@ -0,0 +1,442 @@
+import numpy as np
+
+from math import sqrt
+
+from .value_store import ValueStore
+from .value_map import ValueMap
+
+
+class ValueTable(ValueStore):
+    """ValueTable
+
+    A dense table to learn and store sample means
+    the same as ValueMap, for a finite space of keys
+
+    Keys are integer tuples, e.g. (dealer, player, action_index),
+    laid out in the grid of their bounding box and stored by
+    an integer id in contiguous arrays of count, value and mse
+
+    Unlike ValueMap, reading a key doesn't insert it,
+    only keys learnt or set are listed in keys()
+
+    Integer keys are taken as key ids, e.g. the state-action ids
+    of a KeyEncoder of the same states and actions
+    """
+
+    def __init__(self, name, keys):
+        ValueStore.__init__(self, name)
+
+        keys_array = np.array(list(keys), dtype=int)
+
+        self.key_offset = keys_array.min(axis=0)
+        self.key_shape = keys_array.max(axis=0) - self.key_offset + 1
+        # row-major strides of the grid, as python ints for scalar keys
+        self.key_strides = [
+            int(np.prod(self.key_shape[i + 1 :])) for i in range(len(self.key_shape))
+        ]
+        self._key_offset = self.key_offset.tolist()
+        self._key_shape = self.key_shape.tolist()
+
+        self.size = int(np.prod(self.key_shape))
+
+        self.arrays = {
+            "count": np.zeros(self.size, dtype=np.int64),
+            "value": np.zeros(self.size),
+            "mse": np.zeros(self.size),
+        }
+        self.touched = np.zeros(self.size, dtype=bool)
+        self._values = np.array([])
+
+        self.metrics.register("diff", self.diff)
+        self.metrics.register("compare", self.compare)
+
+    #
+    # utility functions
+    #
+    def index(self, key):
+        if isinstance(key, (int, np.integer)):
+            if key < 0 or key >= self.size:
+                raise KeyError(key)
+            return key
+
+        i = 0
+        for (k, offset, shape, stride) in zip(
+            key, self._key_offset, self._key_shape, self.key_strides
+        ):
+            k -= offset
+            if k < 0 or k >= shape:
+                raise KeyError(key)
+            i += k * stride
+        return i
+
+    def indices(self, keys):
+        """
+        vectorized index() for keys in an array of shape (n, len(key)),
+        or key ids in an integer array of shape (n,), a tuple is one key
+        """
+        if isinstance(keys, tuple):
+            keys = [keys]
+
+        keys_array = np.asarray(keys)
+        if keys_array.ndim == 1 and np.issubdtype(keys_array.dtype, np.integer):
+            return keys_array
+
+        keys_array = keys_array.astype(int).reshape(-1, len(self.key_shape))
+        return np.ravel_multi_index(
+            tuple((keys_array - self.key_offset).T), tuple(self.key_shape)
+        )
+
+    def block_size(self):
+        # count, value, mse of 8 bytes, the version, then touched of 1 byte
+        return 8 * (3 * self.size + 1) + self.size
+
+    def block_arrays(self, block):
+        """
+        count, value, mse, the version and touched as contiguous views
+        of a block of block_size() bytes, e.g. in a file or shared memory
+        """
+        size = self.size
+        arrays = {
+            "count": block[: 8 * size].view(np.int64),
+            "value": block[8 * size : 16 * size].view(float),
+            "mse": block[16 * size : 24 * size].view(float),
+        }
+        version = block[24 * size : 24 * size + 8].view(np.int64)
+        touched = block[24 * size + 8 :].view(bool)
+
+        return arrays, version, touched
+
+    def key(self, i):
+        position = np.unravel_index(i, tuple(self.key_shape))
+        return tuple(int(p + offset) for p, offset in zip(position, self._key_offset))
+
+    #
+    # getter functions
+    #
+    def keys(self):
+        return [self.key(i) for i in np.flatnonzero(self.touched)]
+
+    def get(self, key, value_key="value"):
+        return self.arrays[value_key][self.index(key)].item()
+
+    def get_many(self, keys, value_key="value"):
+        return self.arrays[value_key][self.indices(keys)]
+
+    def get_actions(self, state_key, ACTIONS):
+        if isinstance(state_key, (int, np.integer)):
+            # actions of a state id are contiguous
+            return self.arrays["value"][state_key : state_key + len(ACTIONS)]
+
+        return ValueStore.get_actions(self, state_key, ACTIONS)
+
+    def count(self, key):
+        return self.get(key, value_key="count")
+
+    def total_count(self):
+        return int(self.arrays["count"].sum())
+
+    #
+    # setter functions
+    #
+    def set(self, key, value):
+        i = self.index(key)
+
+        self.arrays["value"][i] = value
+        self.touched[i] = True
+        self.version += 1
+
+    def learn(
+        self,
+        key,
+        sample,
+        step_size=lambda count: 1 / count,
+    ):
+        i = self.index(key)
+
+        count = self.arrays["count"][i] + 1
+        value = self.arrays["value"][i]
+        mse = self.arrays["mse"][i]
+
+        error = sample - value
+        value += step_size(count) * error
+
+        error_after = sample - value
+        mse += step_size(count) * (error * error_after - mse)
+
+        self.arrays["count"][i] = count
+        self.arrays["value"][i] = value
+        self.arrays["mse"][i] = mse
+        self.touched[i] = True
+        self.version += 1
+
+    def batch_learn(self, evaluations, step_size=None):
+        if len(evaluations) == 0:
+            return
+
+        sample_keys = [sample_key for (sample_key, _) in evaluations]
+        sample_returns = [sample_return for (_, sample_return) in evaluations]
+        self.batch_learn_arrays(sample_keys, sample_returns, step_size=step_size)
+
+    def batch_learn_arrays(self, sample_keys, sample_returns, step_size=None):
+        self.learn_indices(self.indices(sample_keys), sample_returns, step_size)
+
+    def learn_indices(self, indices, samples, step_size=None):
+        """
+        vectorized learn() of samples by key ids, in the same result
+        as learning them one by one in order
+
+        - step_size=None, the sample mean (1 / count) in closed form,
+          merging the mean and mse of the samples of each id
+          with the parallel algorithm by Chan et al.
+        - otherwise, a number or a function of count arrays,
+          learning the n-th samples of all ids together at the n-th pass
+        """
+        indices = np.asarray(indices, dtype=int)
+        samples = np.asarray(samples, dtype=float)
+
+        if step_size is None:
+            self.merge_indices(*self.aggregate_indices(indices, samples))
+            return
+
+        order = np.argsort(indices, kind="stable")
+        sorted_indices = indices[order]
+        starts = np.flatnonzero(np.diff(sorted_indices, prepend=-1))
+        ranks = np.arange(len(indices)) - np.repeat(
+            starts, np.diff(np.append(starts, len(indices)))
+        )
+
+        rank_order = order[np.argsort(ranks, kind="stable")]
+        rank_counts = np.bincount(ranks)
+
+        for selected in np.split(rank_order, np.cumsum(rank_counts)[:-1]):
+            i = indices[selected]
+            sample = samples[selected]
+
+            count = self.arrays["count"][i] + 1
+            value = self.arrays["value"][i]
+            rate = step_size(count) if callable(step_size) else step_size
+
+            error = sample - value
+            value = value + rate * error
+            error_after = sample - value
+
+            self.arrays["mse"][i] += rate * (
+                error * error_after - self.arrays["mse"][i]
+            )
+            self.arrays["value"][i] = value
+            self.arrays["count"][i] = count
+
+        self.touched[indices] = True
+        self.version += 1
+
+    def aggregate_indices(self, indices, samples):
+        """
+        count, mean and mse of the samples of each id
+        """
+        count = np.bincount(indices, minlength=self.size)
+        seen = count > 0
+
+        mean = np.zeros(self.size)
+        mean[seen] = np.bincount(indices, weights=samples, minlength=self.size)[seen]
+        mean[seen] /= count[seen]
+
+        mse = np.zeros(self.size)
+        sq_error = np.square(samples - mean[indices])
+        mse[seen] = np.bincount(indices, weights=sq_error, minlength=self.size)[seen]
+        mse[seen] /= count[seen]
+
+        return count, mean, mse
+
+    def merge_indices(self, count, mean, mse):
+        """
+        merge (count, mean, mse) of each id into the table, where mse
+        is the running mean of error * error_after from learn(),
+        i.e. the variance of samples for a step_size of 1 / count
+        """
+        seen = count > 0
+
+        count_a = self.arrays["count"][seen]
+        mean_a = self.arrays["value"][seen]
+        mse_a = self.arrays["mse"][seen]
+        count_b = count[seen]
+        mean_b = mean[seen]
+        mse_b = mse[seen]
+
+        total = count_a + count_b
+        delta = mean_b - mean_a
+
+        self.arrays["value"][seen] = mean_a + delta * count_b / total
+        self.arrays["mse"][seen] = (
+            mse_a * count_a + mse_b * count_b + delta**2 * count_a * count_b / total
+        ) / total
+        self.arrays["count"][seen] = total
+        self.touched[seen] = True
+        self.version += 1
+
+    def merge(self, other_value_table):
+        """
+        merge the (count, value, mse) of each key id of a ValueTable
+        of the same keys, see ValueMap.merge
+        """
+        if not (
+            np.array_equal(other_value_table.key_shape, self.key_shape)
+            and np.array_equal(other_value_table.key_offset, self.key_offset)
+        ):
+            raise ValueError("not able to merge value_table of different keys")
+
+        self.merge_indices(
+            other_value_table.arrays["count"],
+            other_value_table.arrays["value"],
+            other_value_table.arrays["mse"],
+        )
+
+    def learn_with_eligibility_trace(
+        self,
+        eligibility_trace,
+        sample,
+    ):
+        if hasattr(eligibility_trace, "eligibilities"):
+            # ArrayEligibilityTrace, learn all live ids at once
+            i = eligibility_trace.ids()
+            if len(i) == 0:
+                return
+
+            rate = eligibility_trace.eligibilities() / (self.arrays["count"][i] + 1)
+
+            error = sample - self.arrays["value"][i]
+            value = self.arrays["value"][i] + rate * error
+            error_after = sample - value
+
+            mse = self.arrays["mse"][i]
+            self.arrays["mse"][i] = mse + rate * (error * error_after - mse)
+            self.arrays["value"][i] = value
+            self.arrays["count"][i] += 1
+            self.touched[i] = True
+            self.version += 1
+            return
+
+        for key in eligibility_trace.keys():
+            eligibility = eligibility_trace.get(key)
+            # see ValueMap.learn_with_eligibility_trace
+            self.learn(
+                key,
+                sample,
+                step_size=lambda count: eligibility / count,
+            )
+
+    def backup(self):
+        self._values = np.copy(self.arrays["value"])
+
+    def reset(self):
+        for array in self.arrays.values():
+            array.fill(0)
+        self.touched.fill(False)
+        self._values = np.array([])
+        self.version += 1
+
+    #
+    # metrics functions
+    #
+    def diff(self, backup=True):
+        if self._values.size == 0:
+            self._values = np.zeros(self.size)
+
+        values = self.arrays["value"][self.touched]
+        _values = self._values[self.touched]
+        value_range = np.amax(values) - min(np.amin(values), 0)
+
+        rmse = np.sqrt(np.mean(np.square(values - _values)))
+
+        if backup:
+            self.backup()
+
+        return rmse / value_range
+
+    def compare(self, other_value_store):
+        sq_error = 0
+        keys = self.keys()
+        for key in keys:
+            error = self.get(key) - other_value_store.get(key)
+            sq_error += error**2
+
+        return sqrt(sq_error / len(keys))
+
+    #
+    # conversion functions
+    #
+    def to_value_map(self):
+        value_map = ValueMap(self.name)
+
+        for i in np.flatnonzero(self.touched):
+            value_map.data[self.key(i)] = {
+                value_key: array[i].item() for (value_key, array) in self.arrays.items()
+            }
+
+        return value_map
+
+    def from_value_map(self, value_map):
+        self.reset()
+
+        for key in value_map.keys():
+            i = self.index(key)
+            for (value_key, array) in self.arrays.items():
+                array[i] = value_map.get(key, value_key=value_key)
+            self.touched[i] = True
+        self.version += 1
+
+    #
+    # plot functions
+    #
+    def plot_2d_value(self, *args, **kwargs):
+        return self.to_value_map().plot_2d_value(*args, **kwargs)
+
+    def plot_partial_key(self, *args, **kwargs):
+        return self.to_value_map().plot_partial_key(*args, **kwargs)
+
+    #
+    # file I/O functions
+    #
+    def save(self, path):
+        """
+        JSON as ValueMap by default, or for a .npy path the bytes of
+        the block of block_arrays(), each array contiguous in the file
+        """
+        if not path.endswith(".npy"):
+            self.to_value_map().save(path)
+            return
+
+        block = np.zeros(self.block_size(), dtype=np.uint8)
+        (arrays, version, touched) = self.block_arrays(block)
+        for (value_key, array) in self.arrays.items():
+            np.copyto(arrays[value_key], array)
+        version[0] = self.version
+        np.copyto(touched, self.touched)
+
+        np.save(path, block)
+
+    def load(self, path, mmap_mode=None):
+        """
+        with mmap_mode for a .npy path, the arrays are contiguous views
+        of the file, read-only with "r", copied on write with "c"
+        """
+        if not path.endswith(".npy"):
+            value_map = ValueMap(self.name)
+            value_map.load(path)
+            self.from_value_map(value_map)
+            return
+
+        block = np.load(path, mmap_mode=mmap_mode)
+        if len(block) != self.block_size():
+            raise ValueError(
+                f"not able to load {len(block)} bytes to {self.block_size()}"
+            )
+
+        (arrays, _, touched) = self.block_arrays(block)
+        if mmap_mode is None:
+            for (value_key, array) in self.arrays.items():
+                np.copyto(array, arrays[value_key])
+            np.copyto(self.touched, touched)
+        else:
+            self.arrays = arrays
+            self.touched = touched
+        self.version += 1
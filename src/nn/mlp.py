@@ -0,0 +1,108 @@
+import numpy as np
+
+
+class MLP:
+    """MLP
+
+    A multi-layer perceptron in numpy with hand-written
+    forward and backward passes over minibatch matrices
+
+    ReLU on hidden layers and a linear output layer,
+    initialised as micrograd.nn.MLP, with weights in [-1, 1)
+    and biases at 0
+
+    All parameters live in one flat buffer, layers are views of it
+    """
+
+    def __init__(self, input_size, network_size, parameters=None):
+        self.input_size = input_size
+        self.network_size = network_size
+
+        self.shapes = list(zip([input_size, *network_size[:-1]], network_size))
+        size = sum(
+            [in_size * out_size + out_size for (in_size, out_size) in self.shapes]
+        )
+
+        if parameters is None:
+            parameters = np.zeros(size)
+            offset = 0
+            for (in_size, out_size) in self.shapes:
+                parameters[offset : offset + in_size * out_size] = (
+                    2 * np.random.random_sample(in_size * out_size) - 1
+                )
+                offset += in_size * out_size + out_size
+
+        self.parameters = parameters
+        self.layers = self.views(self.parameters)
+
+    #
+    # utility functions
+    #
+    def views(self, buffer):
+        """
+        (weights, biases) of each layer as views of a flat buffer,
+        weights in shape (in_size, out_size)
+        """
+        layers = []
+        offset = 0
+        for (in_size, out_size) in self.shapes:
+            weights = buffer[offset : offset + in_size * out_size]
+            offset += in_size * out_size
+            biases = buffer[offset : offset + out_size]
+            offset += out_size
+            layers.append((weights.reshape(in_size, out_size), biases))
+        return layers
+
+    def copy(self):
+        return MLP(self.input_size, self.network_size, np.copy(self.parameters))
+
+    #
+    # getter functions
+    #
+    def forward(self, x):
+        """
+        activations of all layers for x in shape (n, input_size)
+        """
+        activations = [np.asarray(x, dtype=float)]
+
+        for i, (weights, biases) in enumerate(self.layers):
+            output = activations[-1] @ weights + biases
+            if i != len(self.layers) - 1:
+                output = np.maximum(output, 0)
+            activations.append(output)
+
+        return activations
+
+    def __call__(self, x):
+        return self.forward(x)[-1]
+
+    def gradient(self, x, y):
+        """
+        gradient of the summed squared error sum((y - output)**2)
+        as a flat buffer in the layout of parameters
+        """
+        activations = self.forward(x)
+        y = np.asarray(y, dtype=float).reshape(activations[-1].shape)
+
+        gradient = np.zeros_like(self.parameters)
+        gradient_layers = self.views(gradient)
+
+        delta = 2 * (activations[-1] - y)
+        for i in reversed(range(len(self.layers))):
+            (weights, _) = self.layers[i]
+            (weights_gradient, biases_gradient) = gradient_layers[i]
+
+            weights_gradient[...] = activations[i].T @ delta
+            biases_gradient[...] = delta.sum(axis=0)
+
+            if i > 0:
+                # ReLU passes the gradient where the activation is positive
+                delta = (delta @ weights.T) * (activations[i] > 0)
+
+        return gradient
+
+    #
+    # setter functions
+    #
+    def learn(self, x, y, step_size=0.01):
+        self.parameters -= step_size * self.gradient(x, y)
@@ -1,3 +1,5 @@
+import numpy as np
+
 from tinygrad.tensor import Tensor
 from tinygrad.utils import layer_init_uniform
 
@@ -45,12 +47,37 @@ class MLP:
     def flatten_weights(self):
         return [p for layer in self.weights for unit in layer for p in unit]
 
+    @property
+    def parameters(self):
+        """
+        all weights in one contiguous array
+        """
+        return np.concatenate([layer.ravel() for layer in self.weights])
+
     def clone(self):
         return [Tensor(layer.cpu().data) for layer in self.layers]
 
     #
     # setter functions
     #
+    def load_parameters(self, parameters):
+        """
+        set all weights from one contiguous array of parameters
+        """
+        layers = []
+        offset = 0
+        for layer in self.weights:
+            layers.append(
+                Tensor(
+                    np.reshape(
+                        parameters[offset : offset + layer.size], layer.shape
+                    ).astype(np.float32),
+                    gpu=self.gpu,
+                )
+            )
+            offset += layer.size
+        self.layers = layers
+
     def reset_grad(self):
         for layer in self.layers:
             layer.grad = None
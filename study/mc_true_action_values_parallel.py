@@ -0,0 +1,79 @@
+# TASK:
+# - learn player_true_action_values in parallel runs of MC evaluation
+#   merged into one reference table
+#
+# PROCESS:
+# - the e_greedy_policy (EXPLORATION_RATE 0.5) of the optimal action values
+#   from solve_player_optimal as a GreedyTablePolicy snapshot
+# - RUNS(16) independent MC evaluations of EPISODES(1e6) in a Pool,
+#   each learnt in a ValueTable with its own rng stream, returned as ValueMap
+# - merge_value_maps of all runs, the same as learning all episodes in one
+# - save as ../output/player_true_action_values.json
+#
+# RESULTS:
+# - ~1.5 samples per episode, ~2.4e7 samples in total
+#
+# INTERPRETATION:
+# - merge keeps count, value and mse (sample variance) exact,
+#   so runs can be added later or on other machines
+#
+# RUN:
+# %%
+import sys
+
+sys.path.append("../")
+
+import numpy as np
+
+from multiprocessing import Pool
+
+from src.agent.model_free_agent import ModelFreeAgent
+from src.easy_21.game import playout_batch, PLAYER_INFO, PLAYER_KEY_ENCODER
+from src.easy_21.model import solve_player_optimal
+from src.lib.policy import greedy_table_policy
+from src.lib.value_map import merge_value_maps
+
+#
+# hyperparameters and agent config
+#
+
+RUNS = 16
+EPISODES = int(1e6)
+BATCH = int(1e5)
+EXPLORATION_RATE = 0.5
+
+(OPTIMAL_ACTION_VALUE_STORE, _) = solve_player_optimal()
+POLICY = greedy_table_policy(
+    PLAYER_KEY_ENCODER, OPTIMAL_ACTION_VALUE_STORE, EXPLORATION_RATE
+)
+
+
+def monte_carlo_evaluation_run(seed_sequence):
+    rng = np.random.default_rng(seed_sequence)
+    player = ModelFreeAgent("player", PLAYER_INFO, "table")
+
+    for _ in range(EPISODES // BATCH):
+        (player_batch, _) = playout_batch(
+            BATCH, player_policy=POLICY.with_rng(rng), rng=rng
+        )
+        player.monte_carlo_learning_offline_batch(player_batch)
+
+    return player.action_value_store.to_value_map()
+
+
+#
+# process
+#
+
+if __name__ == "__main__":
+    with Pool() as pool:
+        value_maps = pool.map(
+            monte_carlo_evaluation_run, np.random.SeedSequence().spawn(RUNS)
+        )
+
+    true_action_value_store = merge_value_maps(
+        value_maps, name="player_true_action_values"
+    )
+    print(f"samples: {true_action_value_store.total_count()}")
+
+    true_action_value_store.save("../output/player_true_action_values.json")
@@ -0,0 +1,81 @@
+# TASK:
+# - forward_td_lambda(lambda_value) ~ (variance, convergence)
+#   as td_lambda_forward_lambda_value, in one run for all lambda_value
+#
+# PROCESS:
+# - one action value store per lambda_value in [0.0, 1.0]
+# - sample BATCH*EPISODES once, with the e_greedy_policy of the stores
+#   in turns, so that every lambda_value controls its share of episodes
+# - learn all stores from the same episodes
+#   using forward_td_lambda_learning_offline_multi
+# - check target_state_value_store accuracy of each store
+#
+# RESULTS:
+# - the sweep costs about as much as a single lambda_value run
+#   of td_lambda_forward_lambda_value
+# - with the same episodes, the accuracy history of different lambda_value
+#   is much less noisy to compare than with separate samples
+#
+# INTERPRETATION:
+# - sharing the episodes removes the sampling variance between lambda_value
+#   from the comparison, only the difference of the learnt targets remains
+# - the episodes are off-policy for part of the stores, which is fine
+#   for a comparison of evaluation but not strictly on-policy control
+#
+# RUN:
+# %%
+import sys
+
+sys.path.append("../")
+
+from numpy import arange
+from tqdm import tqdm
+
+from src.agent.model_free_agent import ModelFreeAgent
+
+from src.easy_21.game import playout, PLAYER_INFO
+from src.easy_21.model import solve_player_optimal
+
+
+#
+# hyperparameters and agent config
+#
+
+BATCH = 10
+EPISODES = int(1e3)
+
+PLAYER = ModelFreeAgent("player", PLAYER_INFO)
+(_, PLAYER.optimal_state_value_store) = solve_player_optimal()
+
+lambda_value_range = arange(0, 1.1, 0.2)
+
+STORES = PLAYER.init_action_value_stores("map", len(lambda_value_range))
+
+#
+# process
+#
+
+for _ in tqdm(range(BATCH)):
+    episodes = []
+    for i in range(EPISODES):
+        PLAYER.action_value_store = STORES[i % len(STORES)]
+        (player_episode, _) = playout(player_policy=PLAYER.e_greedy_policy)
+        episodes.append(player_episode)
+
+    PLAYER.forward_td_lambda_learning_offline_multi(
+        episodes, STORES, lambda_value_range
+    )
+
+    for store in STORES:
+        PLAYER.action_value_store = store
+        PLAYER.target_state_value_store.metrics.record(
+            "accuracy", PLAYER.target_state_value_store_accuracy_to_optimal()
+        )
+    PLAYER.target_state_value_store.metrics.stack("accuracy")
+
+
+PLAYER.target_state_value_store.metrics.plot_history_stack(
+    "accuracy",
+    labels=[f"batch {b}" for b in range(BATCH)],
+    x=lambda_value_range,
+)
@@ -24,9 +24,9 @@ import sys
 sys.path.append("../")
 
 from tqdm import trange
-from random import shuffle
 
 from src.agent.model_free_agent import ModelFreeAgent
+from src.lib.experience_buffer import ExperienceBuffer
 
 from src.easy_21.game import playout, PLAYER_INFO
 from src.easy_21.feature_function import numeric_feature
@@ -58,12 +58,13 @@ PLAYER.target_state_value_store.metrics.register(
 # process
 #
 
-experiences = [
-    playout(player_policy=PLAYER.e_greedy_policy)[0] for _ in trange(EPISODES)
-]
+# about 2 steps per episode
+experiences = ExperienceBuffer(4 * EPISODES)
+for _ in trange(EPISODES):
+    experiences.add(playout(player_policy=PLAYER.e_greedy_policy)[0])
 
 for _ in trange(EPOCH):
-    shuffle(experiences)
+    experiences.shuffle()
 
     PLAYER.forward_td_lambda_learning_offline_batch(
         experiences,